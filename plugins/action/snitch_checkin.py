@@ -0,0 +1,22 @@
+# Copyright: (c) 2025, mikemorency
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible_collections.mikemorency.deadmanssnitch.plugins.plugin_utils.action_base import (
+    ControllerActionBase,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.modules import snitch_checkin
+
+
+class ActionModule(ControllerActionBase):
+    MODULE = snitch_checkin
+
+    def get_client(self, module):
+        # The API client needs an API key, which is only required to look up names
+        if not module.params.get("names"):
+            return None
+        return super().get_client(module)
@@ -0,0 +1,16 @@
+# Copyright: (c) 2025, mikemorency
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible_collections.mikemorency.deadmanssnitch.plugins.plugin_utils.action_base import (
+    ControllerActionBase,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.modules import snitch_info
+
+
+class ActionModule(ControllerActionBase):
+    MODULE = snitch_info
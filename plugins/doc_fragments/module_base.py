@@ -13,6 +13,145 @@ options:
       description:
           - The API key to use for authenticating with Dead Man's Snitch.
           - If this is unset, the DMS_API_KEY environment variable will be used instead.
+          - This is required unless the module is run with the C(ansible.netcommon.httpapi) connection
+            and the R(deadmanssnitch httpapi plugin,ansible_collections.mikemorency.deadmanssnitch.deadmanssnitch_httpapi).
+            In that case, API calls are sent through the persistent connection.
       type: str
-      required: true
+      required: false
+    pool_size:
+      description:
+          - The maximum number of connections to keep open to the Dead Man's Snitch API.
+          - Connections are kept alive and reused for every API call made during the module run.
+      type: int
+      required: false
+      default: 10
+    timeout:
+      description:
+          - The number of seconds to wait for the API to respond to a request before giving up.
+      type: float
+      required: false
+      default: 30
+    cache_ttl:
+      description:
+          - The number of seconds that the list of snitches in the account can be cached on disk.
+          - When set, modules that need to look up snitches by name share a single cached copy of the
+            account instead of fetching every snitch from the API on each run.
+          - Snitches created, updated, or deleted by these modules are written through to the cache.
+          - If this is unset, the DMS_CACHE_TTL environment variable will be used instead.
+          - Set to 0 to disable caching.
+      type: int
+      required: false
+      default: 0
+    cache_path:
+      description:
+          - The directory in which to store the snitch cache and the O(rate_limit) state.
+          - The cache file name is derived from a hash of O(api_key), so different accounts do not share a cache.
+          - If this is unset, the DMS_CACHE_PATH environment variable will be used instead.
+          - If neither are set, C(~/.ansible/tmp/deadmanssnitch_cache) is used.
+      type: path
+      required: false
+    max_retries:
+      description:
+          - The maximum number of times a failed API request will be retried.
+          - Requests are retried when the connection fails, or when the API responds with a 429, 500, 502, 503, or 504 status.
+          - Only idempotent requests (GET, PUT, DELETE) are retried, unless O(retry_all_methods=true).
+            Rate limited requests (429) are always retried, because the API did not act on them.
+          - Set to 0 to disable retries.
+      type: int
+      required: false
+      default: 3
+    retry_backoff:
+      description:
+          - The base number of seconds to wait before retrying a request.
+          - The wait is doubled for each retry, and a random amount of jitter is applied.
+          - If the API responds with a C(Retry-After) header, that wait is used instead.
+          - No single wait is longer than 60 seconds, even if C(Retry-After) asks for a longer one.
+      type: float
+      required: false
+      default: 1.0
+    retry_all_methods:
+      description:
+          - Retry failed POST and PATCH requests too.
+          - This may cause a change to be applied twice if the API acted on the first request but the response was lost.
+      type: bool
+      required: false
+      default: false
+    deadline:
+      description:
+          - The maximum number of seconds to spend on API requests during the module run, including time spent waiting to retry.
+          - If this is unset, there is no limit.
+      type: float
+      required: false
+    rate_limit:
+      description:
+          - The maximum number of API requests to send per second.
+          - The limit is shared by every module run on the same host that uses the same O(api_key), so
+            parallel forks together stay under the limit.
+          - If this is unset, the DMS_RATE_LIMIT environment variable will be used instead.
+          - Set to 0 to disable rate limiting.
+      type: float
+      required: false
+      default: 0
+    rate_limit_burst:
+      description:
+          - The number of requests that may be sent at once before O(rate_limit) applies.
+          - If this is unset, it defaults to O(rate_limit), with a minimum of 1.
+      type: int
+      required: false
+    api_stats:
+      description:
+          - Include RV(api_stats) in the result, with the method, endpoint, status, response size, time taken, number of retries,
+            and cache use of every API request the module made.
+          - If this is unset, the DMS_API_STATS environment variable will be used instead.
+      type: bool
+      required: false
+      default: false
+    api_trace_file:
+      description:
+          - Append a JSON line for every API request the module makes to this file.
+          - Each line has the same fields as the requests in RV(api_stats), plus the module name, process ID, and a timestamp.
+            Setting this for every task in a play, for example with the DMS_API_TRACE_FILE environment variable, shows which
+            tasks spent the most time on API requests.
+          - If this is unset, the DMS_API_TRACE_FILE environment variable will be used instead.
+      type: path
+      required: false
+    profile:
+      description:
+          - Profile the module run and write the results to O(profile_dir).
+          - If V(cpu), the run is profiled with C(cProfile). The profile is saved in C(pstats) format, so it can be
+            loaded with the python C(pstats) module or tools such as C(snakeviz).
+          - If V(memory), memory allocations are traced with C(tracemalloc).
+          - If V(all), both are used. Tracing memory slows the run down, which also shows up in the C(cProfile) timings.
+          - A text summary with the top O(profile_top) functions and lines is written next to the profile.
+          - If this is unset, the DMS_PROFILE environment variable will be used instead. If neither is set, the run is not profiled.
+          - The profile is written on the host that runs the module.
+      type: str
+      required: false
+      choices: ['cpu', 'memory', 'all']
+    profile_dir:
+      description:
+          - The directory the profiles are written to.
+          - If this is unset, the DMS_PROFILE_DIR environment variable will be used instead. If neither is set,
+            C(~/.ansible/tmp/deadmanssnitch_profiles) is used.
+      type: path
+      required: false
+    profile_top:
+      description:
+          - The number of functions and lines to include in the profile summary.
+      type: int
+      required: false
+      default: 25
+    transport:
+      description:
+          - The library used to send requests to the API.
+          - If V(requests), the python C(requests) library is used. Connections are pooled and kept alive, which makes
+            modules that send many requests faster.
+          - If V(urllib), the HTTP support built into Ansible is used, so no extra python libraries are needed. A new
+            connection is opened for every request.
+          - If V(auto), V(requests) is used if it is installed, and V(urllib) otherwise.
+          - If this is unset, the DMS_TRANSPORT environment variable will be used instead.
+      type: str
+      required: false
+      default: auto
+      choices: ['auto', 'requests', 'urllib']
 """
@@ -0,0 +1,17 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+    DOCUMENTATION = r"""
+options:
+    snapshot_path:
+      description:
+          - The path to a snapshot created by M(mikemorency.deadmanssnitch.snitch_snapshot).
+          - If this is set, snitches are read from the snapshot instead of the API, and no API calls are made.
+            The results reflect the account at the time the snapshot was taken.
+          - Snapshots are read only, so modules that change snitches fail unless they are run in check mode.
+      type: path
+      required: false
+"""
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2025, mikemorency
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+name: deadmanssnitch
+short_description: HttpApi plugin for the Dead Man's Snitch API
+description:
+    - Sends requests from the modules in this collection to the Dead Man's Snitch API through the
+      persistent C(ansible.netcommon.httpapi) connection.
+    - The connection stays open for the whole play, so connections and authentication are reused by
+      every task that runs on the same host.
+    - The snitches in the account are remembered after they are listed the first time. Later tasks
+      that look up a snitch by name reuse that list instead of fetching the account again. Snitches
+      that are created, updated, or deleted through the connection are updated in the list too.
+    - Requires the C(ansible.netcommon) collection.
+author:
+    - Mike Morency (@mikemorency)
+version_added: 1.1.0
+options:
+    dms_api_key:
+        description:
+            - The API key to use for authenticating with Dead Man's Snitch.
+            - If this is unset, the connection password (C(ansible_httpapi_password)) is used instead.
+        type: str
+        env:
+            - name: DMS_API_KEY
+        vars:
+            - name: ansible_dms_api_key
+"""
+
+EXAMPLES = r"""
+# inventory
+# [deadmanssnitch]
+# dms ansible_host=api.deadmanssnitch.com
+#
+# [deadmanssnitch:vars]
+# ansible_connection=ansible.netcommon.httpapi
+# ansible_network_os=mikemorency.deadmanssnitch.deadmanssnitch
+# ansible_httpapi_use_ssl=true
+# ansible_httpapi_validate_certs=true
+
+- name: Manage snitches through the persistent connection
+  hosts: deadmanssnitch
+  gather_facts: false
+  tasks:
+    - name: Create snitch
+      mikemorency.deadmanssnitch.snitch:
+        name: my-snitch
+        interval: hourly
+
+    - name: Tag snitch, reusing the snitch list fetched by the previous task
+      mikemorency.deadmanssnitch.tags:
+        name: my-snitch
+        tags: [production]
+"""
+
+import base64
+import copy
+import json
+
+from ansible.module_utils.common.text.converters import to_bytes, to_text
+from ansible.plugins.httpapi import HttpApiBase
+
+
+class HttpApi(HttpApiBase):
+    def __init__(self, connection):
+        super().__init__(connection)
+        self._snitches = None
+
+    def login(self, username, password):
+        api_key = self.get_option("dms_api_key") or password
+        token = base64.b64encode(to_bytes(f"{api_key}:")).decode("ascii")
+        self.connection._auth = {"Authorization": f"Basic {token}"}
+
+    def handle_httperror(self, exc):
+        # The API key never changes, so there is no point logging in again. Return the error as the
+        # response and let the module decide how to report it.
+        return exc
+
+    def send_request(self, data, method="GET", path="/", headers=None):
+        if method == "GET" and path == "/v1/snitches" and self._snitches is not None:
+            return 200, "OK", copy.deepcopy(self._snitches)
+
+        response, response_buffer = self.connection.send(
+            path, data, method=method, headers=headers or dict()
+        )
+        status_code = getattr(response, "code", None) or response.getcode()
+        reason = getattr(response, "reason", None) or getattr(response, "msg", "")
+
+        body = to_text(response_buffer.getvalue())
+        try:
+            body = json.loads(body) if body else None
+        except ValueError:
+            pass
+
+        if status_code < 400:
+            self._update_snitch_index(method, path, body)
+        return status_code, to_text(reason), body
+
+    def _update_snitch_index(self, method, path, body):
+        """
+        Keeps the in-memory copy of the account in line with changes sent through this connection.
+        Changes that cannot be applied to the copy reset it, so the next list is fetched from the API.
+        """
+        parts = path.split("?")[0].strip("/").split("/")
+        if parts[:2] != ["v1", "snitches"]:
+            return
+
+        if method == "GET":
+            if path == "/v1/snitches":
+                self._snitches = body
+            return
+
+        if self._snitches is None:
+            return
+
+        if method == "POST" and len(parts) == 2 and isinstance(body, dict):
+            self._snitches.append(body)
+        elif method == "PATCH" and len(parts) == 3 and isinstance(body, dict):
+            self._snitches = [body if s.get("token") == parts[2] else s for s in self._snitches]
+        elif method == "DELETE" and len(parts) == 3:
+            self._snitches = [s for s in self._snitches if s.get("token") != parts[2]]
+        else:
+            self._snitches = None
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2025, mikemorency
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+name: snitches
+short_description: Dead Man's Snitch inventory source
+description:
+    - Creates an inventory host for each snitch in a Dead Man's Snitch account.
+    - Hosts are grouped by their tags, status, and interval. For example, a snitch tagged C(prod) that is
+      failing will be in the C(tag_prod) and C(status_failed) groups.
+    - The snitches are fetched with a single API call. Enable O(cache) to reuse the fetched snitches
+      across runs instead of fetching them every time the inventory is loaded.
+    - The inventory file must end with C(snitches.yml), C(snitches.yaml), C(deadmanssnitch.yml), or C(deadmanssnitch.yaml).
+author:
+    - Mike Morency (@mikemorency)
+
+extends_documentation_fragment:
+    - ansible.builtin.constructed
+    - ansible.builtin.inventory_cache
+
+options:
+    plugin:
+        description:
+            - The name of this plugin. This should always be set to V(mikemorency.deadmanssnitch.snitches).
+        required: true
+        type: str
+        choices: ['mikemorency.deadmanssnitch.snitches']
+    api_key:
+        description:
+            - The API key to use for authenticating with Dead Man's Snitch.
+        required: true
+        type: str
+        env:
+            - name: DMS_API_KEY
+    tags:
+        description:
+            - Only include snitches with these tags.
+        required: false
+        type: list
+        elements: str
+        default: []
+    hostname:
+        description:
+            - The snitch attribute to use as the inventory hostname.
+            - Snitch names are not guaranteed to be unique. If two snitches have the same name, only the
+              first one will be added to the inventory.
+        required: false
+        type: str
+        default: name
+        choices: ['name', 'token']
+    group_by:
+        description:
+            - The snitch attributes used to create groups.
+        required: false
+        type: list
+        elements: str
+        default: ['tags', 'status', 'interval']
+        choices: ['tags', 'status', 'interval', 'alert_type']
+    timeout:
+        description:
+            - The number of seconds to wait for the API to respond before giving up.
+        required: false
+        type: float
+        default: 30
+"""
+
+EXAMPLES = r"""
+# snitches.yml
+plugin: mikemorency.deadmanssnitch.snitches
+
+# snitches.yml with caching, so the account is only fetched once an hour
+plugin: mikemorency.deadmanssnitch.snitches
+cache: true
+cache_plugin: ansible.builtin.jsonfile
+cache_connection: ~/.ansible/inventory_cache
+cache_timeout: 3600
+
+# Only include production snitches, and add a custom group
+plugin: mikemorency.deadmanssnitch.snitches
+tags:
+  - prod
+groups:
+  needs_attention: snitch_status in ['failed', 'errored', 'missing']
+
+# Target every failed production snitch in a playbook
+# - hosts: tag_prod:&status_failed
+#   connection: local
+#   gather_facts: false
+"""
+
+from ansible.plugins.inventory import BaseInventoryPlugin, Constructable, Cacheable
+
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.client import (
+    Client,
+)
+
+
+class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
+    NAME = "mikemorency.deadmanssnitch.snitches"
+
+    def verify_file(self, path):
+        if not super().verify_file(path):
+            return False
+        return path.endswith(
+            ("snitches.yml", "snitches.yaml", "deadmanssnitch.yml", "deadmanssnitch.yaml")
+        )
+
+    def _fetch_snitches(self):
+        client = Client(self.get_option("api_key"), timeout=self.get_option("timeout"))
+        try:
+            return client.list_snitches(tags=self.get_option("tags")) or []
+        finally:
+            client.close()
+
+    def _add_groups(self, host, snitch):
+        for attr in self.get_option("group_by"):
+            values = snitch.get(attr)
+            if values is None:
+                continue
+            if not isinstance(values, list):
+                values = [values]
+            prefix = "tag" if attr == "tags" else attr
+            for value in values:
+                group = self.inventory.add_group(self._sanitize_group_name(f"{prefix}_{value}"))
+                self.inventory.add_child(group, host)
+
+    def _populate(self, snitches):
+        strict = self.get_option("strict")
+        for snitch in snitches:
+            host = snitch.get(self.get_option("hostname"))
+            if not host or host in self.inventory.hosts:
+                continue
+
+            self.inventory.add_host(host)
+            host_vars = {f"snitch_{k}": v for k, v in snitch.items()}
+            for key, value in host_vars.items():
+                self.inventory.set_variable(host, key, value)
+            self._add_groups(host, snitch)
+
+            self._set_composite_vars(self.get_option("compose"), host_vars, host, strict=strict)
+            self._add_host_to_composed_groups(self.get_option("groups"), host_vars, host, strict=strict)
+            self._add_host_to_keyed_groups(self.get_option("keyed_groups"), host_vars, host, strict=strict)
+
+    def parse(self, inventory, loader, path, cache=True):
+        super().parse(inventory, loader, path, cache=cache)
+        self._read_config_data(path)
+
+        cache_key = self.get_cache_key(path)
+        user_cache_setting = self.get_option("cache")
+        attempt_to_read_cache = user_cache_setting and cache
+        cache_needs_update = user_cache_setting and not cache
+
+        snitches = None
+        if attempt_to_read_cache:
+            try:
+                snitches = self._cache[cache_key]
+            except KeyError:
+                cache_needs_update = True
+
+        if snitches is None:
+            snitches = self._fetch_snitches()
+
+        if cache_needs_update:
+            self._cache[cache_key] = snitches
+
+        self._populate(snitches)
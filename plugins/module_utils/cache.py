@@ -0,0 +1,153 @@
+# Copyright: (c) 2025, mikemorency
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import fcntl
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+DEFAULT_CACHE_PATH = "~/.ansible/tmp/deadmanssnitch_cache"
+
+
+def api_key_digest(api_key: str):
+    """
+    Returns a stable identifier for an API key that is safe to use in file names
+    """
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:32]
+
+
+class FileLock:
+    """
+    Context manager around an flock on a file. The lock is shared between processes on the same
+    host, so it can be used to coordinate Ansible forks.
+    """
+    def __init__(self, path: str, exclusive: bool = True):
+        self.path = path
+        self.exclusive = exclusive
+        self._fd = None
+
+    @property
+    def fd(self):
+        """The file descriptor of the locked file, while the lock is held"""
+        return self._fd
+
+    def __enter__(self):
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(self._fd, fcntl.LOCK_EX if self.exclusive else fcntl.LOCK_SH)
+        return self
+
+    def __exit__(self, *args):
+        try:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+
+class SnitchCache:
+    """
+    An on-disk copy of the snitches in an account, shared by every module invocation on the host.
+
+    The cache is keyed by a hash of the API key and is only used while it is younger than the TTL.
+    All reads and writes are done while holding a file lock, so concurrent forks either wait for
+    one fork to refresh the cache or see the refreshed copy.
+    """
+    def __init__(self, api_key: str, ttl: int, path: str = None):
+        self.ttl = ttl
+        self.directory = os.path.expanduser(path or DEFAULT_CACHE_PATH)
+        digest = api_key_digest(api_key)
+        self.data_file = os.path.join(self.directory, f"snitches-{digest}.json")
+        self.lock_file = os.path.join(self.directory, f"snitches-{digest}.lock")
+
+    def _ensure_directory(self):
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+
+    def _lock(self, exclusive: bool = True):
+        self._ensure_directory()
+        return FileLock(self.lock_file, exclusive=exclusive)
+
+    def _read(self):
+        try:
+            with open(self.data_file, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(data, dict) or time.time() - data.get("fetched_at", 0) > self.ttl:
+            return None
+        return data
+
+    def _write(self, data):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".snitches-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.data_file)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def get(self):
+        """Returns the cached snitches, or None if the cache is missing or expired"""
+        with self._lock(exclusive=False):
+            data = self._read()
+        return data["snitches"] if data else None
+
+    def get_or_fetch(self, fetch):
+        """
+        Returns the cached snitches. If the cache is missing or expired, fetch is called to get the
+        snitches from the API and the cache is refreshed.
+        """
+        with self._lock():
+            data = self._read()
+            if data:
+                return data["snitches"]
+
+            snitches = fetch()
+            self._write({"fetched_at": time.time(), "snitches": snitches or []})
+            return snitches
+
+    def invalidate(self):
+        """Removes the cached snitches"""
+        with self._lock():
+            if os.path.exists(self.data_file):
+                os.remove(self.data_file)
+
+    def _modify(self, func):
+        with self._lock():
+            data = self._read()
+            if not data:
+                return
+            data["snitches"] = func(data["snitches"])
+            self._write(data)
+
+    def upsert(self, snitch: dict):
+        """Adds a snitch to the cache, or replaces the cached snitch with the same token"""
+        if not isinstance(snitch, dict) or "token" not in snitch:
+            return self.invalidate()
+
+        def _upsert(snitches):
+            snitches = [s for s in snitches if s.get("token") != snitch["token"]]
+            snitches.append(snitch)
+            return snitches
+
+        self._modify(_upsert)
+
+    def remove(self, token: str):
+        """Removes a snitch from the cache"""
+        self._modify(lambda snitches: [s for s in snitches if s.get("token") != token])
+
+    def update_tags(self, token: str, tags: list):
+        """Replaces the tags on a cached snitch"""
+        def _update(snitches):
+            for snitch in snitches:
+                if snitch.get("token") == token:
+                    snitch["tags"] = list(tags)
+            return snitches
+
+        self._modify(_update)
@@ -0,0 +1,84 @@
+# Copyright: (c) 2025, mikemorency
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import time
+from urllib.parse import quote, urlencode
+
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.client import (
+    Client,
+    RequestError,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.concurrency import (
+    run_concurrently,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.retry import (
+    RetryPolicy,
+)
+
+CHECK_IN_URL = "https://nosnch.in"
+
+
+class CheckInClient(Client):
+    """
+    Checks in snitches. A check-in is authorized by the snitch token, so no API key is needed.
+
+    The client uses the same transport as the API client, so connections to the check-in host are
+    pooled and kept alive between check-ins, and failed check-ins are retried with the backoff of
+    the retry policy. Check-ins are sent as GET requests, which the retry policy treats as
+    idempotent. A check-in that is sent twice only moves the last check-in time of the snitch.
+    """
+    def __init__(self, pool_size: int = 10, timeout: float = 30, retry_policy: RetryPolicy = None,
+                 recorder=None, transport: str = "auto"):
+        super().__init__(api_key=None, pool_size=pool_size, timeout=timeout, retry_policy=retry_policy,
+                         recorder=recorder, transport=transport)
+        self._url_base = CHECK_IN_URL
+        self._auth = None
+
+    def _check_in_url(self, token: str, message: str = None, exit_code: int = None):
+        url = f"{self._url_base}/{quote(token, safe='')}"
+        params = dict()
+        if message is not None:
+            params["m"] = message
+        if exit_code is not None:
+            params["s"] = exit_code
+        return f"{url}?{urlencode(params)}" if params else url
+
+    def check_in(self, token: str, message: str = None, exit_code: int = None):
+        """
+        Checks in a snitch. A non-zero exit_code reports the job as failed.
+        Returns the status code of the response.
+        """
+        request_kwargs = {
+            "url": self._check_in_url(token, message=message, exit_code=exit_code),
+            "method": "GET",
+            "headers": self._create_headers(),
+            "auth": self._auth,
+        }
+        # Every token has its own URL, so all check-ins are recorded under one endpoint
+        with self._instrument("GET", "check_in") as call:
+            response = self._send_with_retries(request_kwargs, call=call)
+            call["status"] = response.status_code
+            if self.recorder:
+                call["bytes"] = len(response.content)
+            try:
+                response.raise_for_status()
+            except Exception as e:
+                raise RequestError(e)
+        return response.status_code
+
+    def check_in_many(self, check_ins, workers: int = 4):
+        """
+        Checks in many snitches concurrently. check_ins are dicts with a token, and optionally a
+        message and exit_code. A failed check-in does not stop the others.
+        Returns a TaskResult for each check-in, in the same order. The result is a dict with the
+        status_code of the response and the number of seconds the check-in took, including retries.
+        """
+        def send(check_in):
+            started = time.monotonic()
+            status_code = self.check_in(
+                check_in["token"], message=check_in.get("message"), exit_code=check_in.get("exit_code")
+            )
+            return dict(status_code=status_code, elapsed=time.monotonic() - started)
+
+        return run_concurrently(send, check_ins, workers=workers)
@@ -2,12 +2,28 @@
 # GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-try:
-    import requests
-    from requests.auth import HTTPBasicAuth
-except ImportError:
-    # handled in module base
-    pass
+import contextlib
+import json
+import time
+
+from ansible.module_utils.connection import Connection
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.instrumentation import (
+    endpoint_template,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.streaming import (
+    iter_json_array,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.retry import (
+    DeadlineExceededError,
+    RetryPolicy,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.transport import (
+    STREAM_CHUNK_SIZE,
+    HTTPStatusError,
+    RequestInfo,
+    ResponseInfo,
+    create_transport,
+)
 
 
 class RequestError(Exception):
@@ -19,10 +35,22 @@ class RequestError(Exception):
 
 
 class Client:
-    def __init__(self, api_key):
+    def __init__(self, api_key, pool_size: int = 10, timeout: float = 30, cache=None,
+                 retry_policy: RetryPolicy = None, rate_limiter=None, recorder=None, transport: str = "auto"):
         self.api_key = api_key
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.cache = cache
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.recorder = recorder
         self._url_base = "https://api.deadmanssnitch.com/v1"
-        self._auth = HTTPBasicAuth(self.api_key, "")
+        self._auth = (self.api_key, "")
+        self.transport = create_transport(transport, pool_size=pool_size)
+
+    def close(self):
+        """Close any pooled connections"""
+        self.transport.close()
 
     def _create_headers(self, include_content_type: bool = False):
         headers = dict()
@@ -36,6 +64,71 @@ class Client:
             url += "?" + "&".join([f"{k}={v}" for k, v in params.items()])
         return url
 
+    @staticmethod
+    def _clean_data(data):
+        if isinstance(data, dict):
+            return {k: v for k, v in data.items() if v is not None}
+        return data
+
+    def _request_timeout(self):
+        remaining = self.retry_policy.remaining()
+        if remaining is None:
+            return self.timeout
+        return min(self.timeout, remaining)
+
+    def _acquire_rate_limit_token(self):
+        if not self.rate_limiter:
+            return
+        if not self.rate_limiter.acquire(timeout=self.retry_policy.remaining()):
+            raise DeadlineExceededError(
+                "The deadline for API requests was exceeded while waiting for the rate limit"
+            )
+
+    @contextlib.contextmanager
+    def _instrument(self, method: str, uri: str):
+        """
+        Records an API call with the recorder, if there is one. The caller fills in the status, size
+        and retries of the call in the yielded dict.
+        """
+        call = dict(method=method, endpoint=endpoint_template(uri), status=None, bytes=None, retries=0)
+        if not self.recorder:
+            yield call
+            return
+
+        started = time.monotonic()
+        try:
+            yield call
+        except Exception as e:
+            call["error"] = type(e).__name__
+            raise
+        finally:
+            self.recorder.record(latency=time.monotonic() - started, **call)
+
+    def _send_with_retries(self, request_kwargs, call=None):
+        method = request_kwargs["method"]
+        attempt = 0
+        call = call if call is not None else dict()
+        while True:
+            call["retries"] = attempt
+            self.retry_policy.check_deadline()
+            self._acquire_rate_limit_token()
+            request_kwargs["timeout"] = self._request_timeout()
+            try:
+                response = self.transport.request(**request_kwargs)
+            except self.transport.retryable_errors as e:
+                if not (self.retry_policy.should_retry(method, attempt, error=e) and self.retry_policy.wait(attempt)):
+                    raise
+            else:
+                status_code = response.status_code
+                if not (
+                    self.retry_policy.should_retry(method, attempt, status_code=status_code)
+                    and self.retry_policy.wait(attempt, status_code=status_code, headers=response.headers)
+                ):
+                    return response
+                # Release the connection, or streamed responses keep it out of the pool
+                response.close()
+            attempt += 1
+
     def _make_request(self, method: str, uri: str, data: dict = None, params: dict = None, include_content_type: bool = False):
         url = self._format_url(uri=uri, params=params)
         headers = self._create_headers(include_content_type=include_content_type)
@@ -45,32 +138,91 @@ class Client:
             "method": method,
             "headers": headers,
             "auth": self._auth,
+            "timeout": self.timeout,
         }
 
+        data = self._clean_data(data)
         if data:
-            if isinstance(data, dict):
-                _d = data.copy()
-                for k, v in _d.items():
-                    if v is None:
-                        del data[k]
             request_kwargs["json"] = data
 
-        response = requests.request(**request_kwargs)
-        try:
-            response.raise_for_status()
-        except Exception as e:
-            raise RequestError(e)
+        with self._instrument(method, uri) as call:
+            response = self._send_with_retries(request_kwargs, call=call)
+            call["status"] = response.status_code
+            if self.recorder:
+                call["bytes"] = len(response.content)
+            try:
+                response.raise_for_status()
+            except Exception as e:
+                raise RequestError(e)
         try:
             return response.json()
-        except requests.exceptions.JSONDecodeError:
+        except ValueError:
             return
 
     def list_snitches(self, tags: list = None):
-        """List all snitches"""
-        params = {}
-        if tags:
-            params["tags"] = ",".join(tags)
-        return self._make_request("GET", "snitches", params=params)
+        """List all snitches, following every page of the response"""
+        if self.cache and not tags:
+            return self._list_cached_snitches()
+        return self._fetch_snitches(tags=tags)
+
+    def _fetch_snitches(self, tags: list = None):
+        return list(self._stream_snitches(tags=tags))
+
+    def _list_cached_snitches(self):
+        fetched = []
+
+        def fetch():
+            fetched.append(True)
+            return self._fetch_snitches()
+
+        started = time.monotonic()
+        snitches = self.cache.get_or_fetch(fetch)
+        if self.recorder and not fetched:
+            self.recorder.record(
+                "GET", endpoint_template("snitches"), latency=time.monotonic() - started, cache_hit=True
+            )
+        return snitches
+
+    def iter_snitches(self, tags: list = None):
+        """
+        Yield snitches one at a time while the response is being read.
+        Callers can stop iterating once they find what they need, and the rest of the response is
+        not downloaded. Paginated responses are followed using the Link header.
+        """
+        if self.cache and not tags:
+            yield from self.list_snitches()
+            return
+        yield from self._stream_snitches(tags=tags)
+
+    def _stream_snitches(self, tags: list = None):
+        params = {"tags": ",".join(tags)} if tags else None
+        url = self._format_url("snitches", params=params)
+        while url:
+            with self._instrument("GET", url) as call:
+                response = self._send_with_retries({
+                    "url": url,
+                    "method": "GET",
+                    "headers": self._create_headers(),
+                    "auth": self._auth,
+                    "stream": True,
+                }, call=call)
+                call["status"] = response.status_code
+                call["bytes"] = 0
+                try:
+                    try:
+                        response.raise_for_status()
+                    except Exception as e:
+                        raise RequestError(e)
+                    yield from iter_json_array(self._count_bytes(response, call))
+                    url = response.links.get("next", {}).get("url")
+                finally:
+                    response.close()
+
+    @staticmethod
+    def _count_bytes(response, call):
+        for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+            call["bytes"] += len(chunk)
+            yield chunk
 
     def get_snitch(self, snitch_id: str):
         """Get a snitch by ID"""
@@ -87,39 +239,115 @@ class Client:
             "notes": notes,
             "tags": tags,
         }
-        return self._make_request("POST", "snitches", data=data, include_content_type=True)
+        snitch = self._make_request("POST", "snitches", data=data, include_content_type=True)
+        if self.cache:
+            self.cache.upsert(snitch)
+        return snitch
 
     def update_snitch(self, snitch_id: str, name: str = None, interval: str = None,
                       alert_type: str = None, alert_email: list = None, notes: str = None, tags: list = None):
         """Update a snitch"""
         data = {}
         for attr in ["name", "interval", "alert_type", "alert_email", "notes", "tags"]:
-            if locals()[attr]:
+            if locals()[attr] is not None:
                 data[attr] = locals()[attr]
-        return self._make_request("PATCH", f"snitches/{snitch_id}", data=data, include_content_type=True)
+        snitch = self._make_request("PATCH", f"snitches/{snitch_id}", data=data, include_content_type=True)
+        if self.cache:
+            self.cache.upsert(snitch)
+        return snitch
+
+    def _write_through_tags(self, snitch_id: str, response):
+        if not self.cache:
+            return
+        if isinstance(response, list):
+            self.cache.update_tags(snitch_id, response)
+        else:
+            self.cache.invalidate()
 
     def remove_snitch_tag(self, snitch_id: str, tag: str):
         """Remove tag from a snitch"""
-        return self._make_request("DELETE", f"snitches/{snitch_id}/tags/{tag}", include_content_type=True)
+        response = self._make_request("DELETE", f"snitches/{snitch_id}/tags/{tag}", include_content_type=True)
+        self._write_through_tags(snitch_id, response)
+        return response
 
     def append_snitch_tags(self, snitch_id: str, tags: list):
         """Append tags to a snitch"""
         data = tags
-        return self._make_request("POST", f"snitches/{snitch_id}/tags", data=data, include_content_type=True)
+        response = self._make_request("POST", f"snitches/{snitch_id}/tags", data=data, include_content_type=True)
+        self._write_through_tags(snitch_id, response)
+        return response
 
     def replace_snitch_tags(self, snitch_id: str, tags: list):
         """Replace tags on a snitch"""
         data = {"tags": tags}
-        return self._make_request("PATCH", f"snitches/{snitch_id}", data=data, include_content_type=True)
+        snitch = self._make_request("PATCH", f"snitches/{snitch_id}", data=data, include_content_type=True)
+        if self.cache:
+            self.cache.upsert(snitch)
+        return snitch
 
     def delete_snitch(self, snitch_id: str):
         """Delete a snitch"""
-        return self._make_request("DELETE", f"snitches/{snitch_id}")
+        response = self._make_request("DELETE", f"snitches/{snitch_id}")
+        if self.cache:
+            self.cache.remove(snitch_id)
+        return response
 
     def pause_snitch(self, snitch_id: str):
         """Pause a snitch"""
-        return self._make_request("POST", f"snitches/{snitch_id}/pause")
+        response = self._make_request("POST", f"snitches/{snitch_id}/pause")
+        if self.cache:
+            self.cache.invalidate()
+        return response
 
     def unpause_snitch(self, snitch_id: str):
         """Unpause a snitch"""
-        return self._make_request("POST", f"snitches/{snitch_id}/unpause")
+        response = self._make_request("POST", f"snitches/{snitch_id}/unpause")
+        if self.cache:
+            self.cache.invalidate()
+        return response
+
+
+class ConnectionClient(Client):
+    """
+    A client that sends requests through the mikemorency.deadmanssnitch.deadmanssnitch httpapi plugin.
+    The plugin runs in the persistent connection process, so authentication, open connections and
+    the in-memory snitch index are shared by every task that uses the same connection.
+    """
+    def __init__(self, socket_path: str, cache=None, recorder=None):
+        super().__init__(api_key=None, cache=cache, recorder=recorder)
+        self._url_base = "/v1"
+        self._connection = Connection(socket_path)
+
+    def close(self):
+        return
+
+    def iter_snitches(self, tags: list = None):
+        """
+        The connection plugin returns whole responses, so this yields from the full list
+        """
+        yield from self.list_snitches(tags=tags) or []
+
+    def _fetch_snitches(self, tags: list = None):
+        # The connection plugin does not return the response headers, so the Link header can not be followed
+        params = {"tags": ",".join(tags)} if tags else None
+        return self._make_request("GET", "snitches", params=params)
+
+    def _make_request(self, method: str, uri: str, data: dict = None, params: dict = None, include_content_type: bool = False):
+        path = self._format_url(uri=uri, params=params)
+        headers = self._create_headers(include_content_type=include_content_type)
+        data = self._clean_data(data)
+        body = json.dumps(data) if data else None
+
+        with self._instrument(method, path) as call:
+            status_code, reason, response = self._connection.send_request(
+                body, method=method, path=path, headers=headers
+            )
+            call["status"] = status_code
+            if self.recorder:
+                call["bytes"] = len(json.dumps(response)) if response is not None else 0
+        if status_code >= 400:
+            raise RequestError(HTTPStatusError(
+                request=RequestInfo(url=path, method=method, headers=headers, body=body),
+                response=ResponseInfo(status_code=status_code, reason=reason, body=response),
+            ))
+        return response
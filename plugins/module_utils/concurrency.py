@@ -0,0 +1,40 @@
+# Copyright: (c) 2025, mikemorency
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+
+class TaskResult:
+    """
+    The outcome of running a function against one item. Exactly one of result or error is set.
+    """
+    def __init__(self, item, result=None, error=None):
+        self.item = item
+        self.result = result
+        self.error = error
+
+    @property
+    def failed(self):
+        return self.error is not None
+
+
+def run_concurrently(func, items, workers: int = 4):
+    """
+    Calls func on every item using a bounded pool of threads.
+    Exceptions raised by func are captured instead of being raised, so one failing item does
+    not stop the others. Returns a list of TaskResult in the same order as items.
+    """
+    items = list(items)
+
+    def _run(item):
+        try:
+            return TaskResult(item, result=func(item))
+        except Exception as e:
+            return TaskResult(item, error=e)
+
+    if workers <= 1 or len(items) <= 1:
+        return [_run(item) for item in items]
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(items))) as executor:
+        return list(executor.map(_run, items))
@@ -0,0 +1,53 @@
+# Copyright: (c) 2025, mikemorency
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+SNITCH_FIELDS = ("name", "interval", "alert_type", "alert_email", "notes", "tags")
+# Fields where the API does not care about order or duplicates
+UNORDERED_FIELDS = frozenset(["alert_email", "tags"])
+# Fields where the API treats null and an empty string the same way
+OPTIONAL_TEXT_FIELDS = frozenset(["notes"])
+
+
+def canonicalize(field: str, value):
+    """
+    Returns a copy of value that can be compared with the == operator, so two values the API
+    would treat the same way are equal.
+    """
+    if field in UNORDERED_FIELDS:
+        return sorted(set(value or []))
+    if field in OPTIONAL_TEXT_FIELDS:
+        return value or ""
+    return value
+
+
+def changed_fields(desired: dict, live: dict, fields=SNITCH_FIELDS):
+    """
+    Compares the desired state of a snitch to the live snitch.
+    Returns a dict of the fields that need to change, with their desired values. Fields that are
+    None in desired are not managed and are never returned.
+    """
+    live = live or dict()
+    changes = dict()
+    for field in fields:
+        want = desired.get(field)
+        if want is None:
+            continue
+        if canonicalize(field, want) != canonicalize(field, live.get(field)):
+            changes[field] = want
+    return changes
+
+
+def build_diff(live: dict, desired: dict, fields=SNITCH_FIELDS):
+    """
+    Returns a before/after diff for Ansible's --diff mode. Pass None as live for a snitch that will
+    be created, or None as desired for a snitch that will be deleted.
+    """
+    if live is None:
+        return dict(before=dict(), after={k: v for k, v in desired.items() if k in fields and v is not None})
+    if desired is None:
+        return dict(before={k: live.get(k) for k in fields}, after=dict())
+
+    changes = changed_fields(desired, live, fields=fields)
+    before = {k: live.get(k) for k in changes}
+    return dict(before=before, after=dict(before, **changes))
@@ -0,0 +1,141 @@
+# Copyright: (c) 2025, mikemorency
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import hashlib
+import json
+import os
+
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.cache import (
+    api_key_digest,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.diff import (
+    SNITCH_FIELDS,
+    canonicalize,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.snapshot import (
+    write_atomically,
+)
+
+DRIFT_STATE_FORMAT = 1
+
+
+def managed_fields(snitch: dict):
+    """Returns the fields of a snitch that are managed by Ansible, in a form that can be compared"""
+    return {field: canonicalize(field, snitch.get(field)) for field in SNITCH_FIELDS}
+
+
+def content_hash(data: dict):
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def desired_hash(params: dict):
+    """Returns a hash of the desired state of a snitch. Fields that are not managed are left out."""
+    return content_hash({field: canonicalize(field, params[field])
+                         for field in SNITCH_FIELDS if params.get(field) is not None})
+
+
+def account_fingerprint(api_key: str):
+    """Identifies the account a state file belongs to, without storing the API key"""
+    return api_key_digest(api_key)[:16]
+
+
+class DriftState:
+    """
+    The state of the managed snitches after the last run, stored in a JSON file.
+
+    For each managed snitch, the file has the updated_at timestamp returned by the API after the
+    last run, a hash of the desired state it was reconciled to, and its managed fields. The highest
+    updated_at in the account is kept as a watermark. A snitch that still has the same updated_at
+    and desired state has not changed on either side since the last run, so it does not need to be
+    compared again. A snitch with a new updated_at was changed outside of Ansible, and the stored
+    fields show what changed.
+
+    A state file that belongs to another account, or that can not be read, is ignored, so the next
+    run compares every snitch.
+    """
+    def __init__(self, path: str, account: str):
+        self.path = os.path.expanduser(path)
+        self.account = account
+        self.watermark = None
+        self.snitches = dict()
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("format") != DRIFT_STATE_FORMAT or data.get("account") != self.account:
+            return
+        self.watermark = data.get("watermark")
+        self.snitches = data.get("snitches") or dict()
+
+    def save(self):
+        data = dict(format=DRIFT_STATE_FORMAT, account=self.account, watermark=self.watermark, snitches=self.snitches)
+        write_atomically(self.path, "w", lambda f: json.dump(data, f, separators=(",", ":")))
+
+    def is_unchanged(self, live: dict, params: dict):
+        """
+        Returns True if the live snitch and its desired state are the same as after the last run
+        """
+        entry = self.snitches.get(live["token"])
+        updated_at = live.get("updated_at")
+        if not entry or not updated_at or not self.watermark:
+            return False
+        return (
+            updated_at <= self.watermark
+            and entry["updated_at"] == updated_at
+            and entry["desired_hash"] == desired_hash(params)
+        )
+
+    def report(self, live_by_token: dict):
+        """
+        Returns the managed snitches that were changed or deleted outside of Ansible since the last run
+        """
+        drift = []
+        for token, entry in self.snitches.items():
+            live = live_by_token.get(token)
+            if live is None:
+                drift.append(dict(id=token, name=entry["name"], change="deleted", fields=dict()))
+                continue
+            if live.get("updated_at") == entry["updated_at"]:
+                continue
+            current = managed_fields(live)
+            if content_hash(current) == entry["hash"]:
+                continue
+            fields = {
+                field: dict(before=entry["fields"].get(field), after=current[field])
+                for field in SNITCH_FIELDS if entry["fields"].get(field) != current[field]
+            }
+            if fields:
+                drift.append(dict(
+                    id=token,
+                    name=live.get("name"),
+                    change="modified",
+                    updated_at=live.get("updated_at"),
+                    fields=fields,
+                ))
+        return drift
+
+    def record(self, snitch: dict, params: dict):
+        """Stores the state of a snitch after it was reconciled"""
+        fields = managed_fields(snitch)
+        self.snitches[snitch["token"]] = dict(
+            name=snitch.get("name"),
+            updated_at=snitch.get("updated_at"),
+            hash=content_hash(fields),
+            desired_hash=desired_hash(params),
+            fields=fields,
+        )
+
+    def forget(self, token: str):
+        self.snitches.pop(token, None)
+
+    def advance(self, snitches):
+        """Moves the watermark to the newest updated_at in snitches"""
+        for snitch in snitches:
+            updated_at = snitch.get("updated_at")
+            if updated_at and (self.watermark is None or updated_at > self.watermark):
+                self.watermark = updated_at
@@ -0,0 +1,105 @@
+# Copyright: (c) 2025, mikemorency
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import json
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+def endpoint_template(uri: str):
+    """
+    Returns the API endpoint for a request URI or URL with the IDs replaced by placeholders, so
+    requests to the same endpoint can be grouped together. For example, snitches/abc123/tags/prod
+    becomes /snitches/{token}/tags/{tag}.
+    """
+    path = urlsplit(uri).path.strip("/")
+    parts = path.split("/")
+    if parts and parts[0] == "v1":
+        parts = parts[1:]
+
+    template = []
+    for index, part in enumerate(parts):
+        if index == 1 and parts[0] == "snitches":
+            template.append("{token}")
+        elif index == 3 and parts[2] == "tags":
+            template.append("{tag}")
+        else:
+            template.append(part)
+    return "/" + "/".join(template)
+
+
+class RequestRecorder:
+    """
+    Records every API call made by a client. The calls are summarized in the module result, and can
+    also be appended to a JSON lines trace file, so the calls made by every task in a play can be
+    collected in one place. Each line in the trace file is written with a single append, so forks
+    can share the same file.
+    """
+    def __init__(self, trace_file: str = None, context: dict = None):
+        self.trace_file = os.path.expanduser(trace_file) if trace_file else None
+        self.context = context or dict()
+        self._lock = threading.Lock()
+        self.requests = []
+
+    def reset(self):
+        with self._lock:
+            self.requests = []
+
+    def record(self, method: str, endpoint: str, status: int = None, bytes: int = None, latency: float = 0.0,
+               retries: int = 0, cache_hit: bool = False, error: str = None):
+        entry = dict(
+            method=method,
+            endpoint=endpoint,
+            status=status,
+            bytes=bytes,
+            latency=round(latency, 6),
+            retries=retries,
+            cache_hit=cache_hit,
+        )
+        if error:
+            entry["error"] = error
+
+        with self._lock:
+            self.requests.append(entry)
+        if self.trace_file:
+            self._write_trace(entry)
+
+    def _write_trace(self, entry):
+        line = json.dumps(dict(self.context, timestamp=time.time(), pid=os.getpid(), **entry)) + "\n"
+        fd = os.open(self.trace_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        try:
+            os.write(fd, line.encode("utf-8"))
+        finally:
+            os.close(fd)
+
+    def summary(self):
+        """
+        Returns the totals for all recorded calls, the totals for each endpoint, and the calls themselves
+        """
+        with self._lock:
+            requests = list(self.requests)
+
+        endpoints = dict()
+        for entry in requests:
+            key = f"{entry['method']} {entry['endpoint']}"
+            totals = endpoints.setdefault(key, dict(calls=0, seconds=0.0, bytes=0, errors=0, cache_hits=0))
+            totals["calls"] += 1
+            totals["seconds"] += entry["latency"]
+            totals["bytes"] += entry["bytes"] or 0
+            totals["errors"] += 1 if entry.get("error") else 0
+            totals["cache_hits"] += 1 if entry["cache_hit"] else 0
+        for totals in endpoints.values():
+            totals["seconds"] = round(totals["seconds"], 6)
+
+        return dict(
+            calls=len(requests),
+            cache_hits=sum(1 for e in requests if e["cache_hit"]),
+            retries=sum(e["retries"] for e in requests),
+            seconds=round(sum(e["latency"] for e in requests), 6),
+            bytes=sum(e["bytes"] or 0 for e in requests),
+            endpoints=endpoints,
+            requests=requests,
+        )
@@ -4,37 +4,197 @@
 
 from ansible.module_utils.basic import env_fallback
 from ansible.module_utils.basic import missing_required_lib
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.cache import (
+    SnitchCache
+)
 from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.client import (
     Client,
+    ConnectionClient,
     RequestError
 )
-import traceback
-
-try:
-    import requests  # pylint: disable=unused-import
-    HAS_REQUESTS = True
-    REQUESTS_IMPORT_ERROR = None
-except ImportError:
-    HAS_REQUESTS = False
-    REQUESTS_IMPORT_ERROR = traceback.format_exc()
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.instrumentation import (
+    RequestRecorder
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.profiling import (
+    PROFILE_CHOICES,
+    Profiler
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.rate_limit import (
+    TokenBucket
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.retry import (
+    RetryPolicy
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.snapshot import (
+    SnapshotClient,
+    SnapshotError,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.transport import (
+    TRANSPORT_CHOICES,
+    requests_available,
+)
+import contextlib
 
 
 class ModuleBase:
-    def __init__(self, module):
+    # Modules that never change snitches can read from a snapshot outside of check mode
+    READ_ONLY = False
+
+    def __init__(self, module, params=None, client=None):
         self.module = module
-        self.params = module.params
-        self.client = Client(module.params["api_key"])
-        if not HAS_REQUESTS:
-            self.handle_missing_lib("requests", REQUESTS_IMPORT_ERROR)
+        self.params = module.params if params is None else params
+        if client is None and module.params.get("snapshot_path"):
+            client = self._create_snapshot_client()
+        if client is None and self._socket_path:
+            client = ConnectionClient(
+                self._socket_path, cache=self._create_cache(), recorder=self._create_recorder()
+            )
+        if client is None:
+            if module.params.get("transport") == "requests" and not requests_available():
+                self.handle_missing_lib("requests")
+            if not module.params.get("api_key"):
+                self.module.fail_json(
+                    msg="api_key is required unless the mikemorency.deadmanssnitch.deadmanssnitch httpapi connection is used"
+                )
+            client = Client(
+                module.params["api_key"],
+                pool_size=module.params.get("pool_size", 10),
+                timeout=module.params.get("timeout", 30),
+                cache=self._create_cache(),
+                retry_policy=RetryPolicy(
+                    max_retries=module.params.get("max_retries", 3),
+                    backoff=module.params.get("retry_backoff", 1.0),
+                    retry_all_methods=module.params.get("retry_all_methods", False),
+                    deadline=module.params.get("deadline"),
+                ),
+                rate_limiter=self._create_rate_limiter(),
+                recorder=self._create_recorder(),
+                transport=module.params.get("transport") or "auto",
+            )
+        self.client = client
+
+    @property
+    def _socket_path(self):
+        """
+        The socket of the persistent httpapi connection, if the module was run with one
+        """
+        socket_path = getattr(self.module, "_socket_path", None)
+        return socket_path if isinstance(socket_path, str) else None
+
+    def _create_snapshot_client(self):
+        if not self.READ_ONLY and not self.module.check_mode:
+            self.module.fail_json(msg="snapshot_path can only be used in check mode, because snapshots are read only")
+        try:
+            return SnapshotClient(self.module.params["snapshot_path"])
+        except SnapshotError as e:
+            self.module.fail_json(msg=str(e))
+
+    @staticmethod
+    def snapshot_argument_spec():
+        return {
+            "snapshot_path": dict(type="path", required=False),
+        }
+
+    def _create_cache(self):
+        params = self.module.params
+        if not params.get("cache_ttl") or not params.get("api_key"):
+            return None
+        return SnitchCache(
+            params["api_key"],
+            ttl=params["cache_ttl"],
+            path=params.get("cache_path"),
+        )
+
+    def _create_rate_limiter(self):
+        params = self.module.params
+        if not params.get("rate_limit"):
+            return None
+        return TokenBucket(
+            params["api_key"],
+            rate=params["rate_limit"],
+            burst=params.get("rate_limit_burst"),
+            path=params.get("cache_path"),
+        )
+
+    def _create_recorder(self):
+        params = self.module.params
+        if not params.get("api_stats") and not params.get("api_trace_file"):
+            return None
+        return RequestRecorder(
+            trace_file=params.get("api_trace_file"),
+            context=dict(module=getattr(self.module, "_name", None)),
+        )
+
+    @staticmethod
+    def profiled(module):
+        """
+        Returns a context manager that profiles the code it wraps when the profile option is set.
+        Modules wrap their main path with it, so a run can be profiled without changing the code.
+        """
+        params = module.params
+        if not params.get("profile"):
+            return contextlib.nullcontext()
+        return Profiler(
+            params["profile"],
+            directory=params.get("profile_dir"),
+            top=params.get("profile_top") or 25,
+            name=getattr(module, "_name", None),
+        )
 
     @staticmethod
     def base_argument_spec():
         return {
             "api_key": dict(
-                type="str", required=True, fallback=(env_fallback, ["DMS_API_KEY"]), no_log=True
+                type="str", required=False, fallback=(env_fallback, ["DMS_API_KEY"]), no_log=True
+            ),
+            "pool_size": dict(type="int", required=False, default=10),
+            "timeout": dict(type="float", required=False, default=30),
+            "cache_ttl": dict(
+                type="int", required=False, default=0, fallback=(env_fallback, ["DMS_CACHE_TTL"])
+            ),
+            "cache_path": dict(
+                type="path", required=False, fallback=(env_fallback, ["DMS_CACHE_PATH"])
+            ),
+            "max_retries": dict(type="int", required=False, default=3),
+            "retry_backoff": dict(type="float", required=False, default=1.0),
+            "retry_all_methods": dict(type="bool", required=False, default=False),
+            "deadline": dict(type="float", required=False),
+            "rate_limit": dict(
+                type="float", required=False, default=0, fallback=(env_fallback, ["DMS_RATE_LIMIT"])
+            ),
+            "rate_limit_burst": dict(type="int", required=False),
+            "api_stats": dict(
+                type="bool", required=False, default=False, fallback=(env_fallback, ["DMS_API_STATS"])
+            ),
+            "api_trace_file": dict(
+                type="path", required=False, fallback=(env_fallback, ["DMS_API_TRACE_FILE"])
+            ),
+            "profile": dict(
+                type="str", required=False, choices=PROFILE_CHOICES, fallback=(env_fallback, ["DMS_PROFILE"])
+            ),
+            "profile_dir": dict(
+                type="path", required=False, fallback=(env_fallback, ["DMS_PROFILE_DIR"])
+            ),
+            "profile_top": dict(type="int", required=False, default=25),
+            "transport": dict(
+                type="str", required=False, default="auto", choices=TRANSPORT_CHOICES,
+                fallback=(env_fallback, ["DMS_TRANSPORT"])
             ),
         }
 
+    def client_stats(self):
+        """
+        Information about the API calls made by the client, to include in the module result
+        """
+        stats = {"api_retries": self.client.retry_policy.stats}
+        recorder = getattr(self.client, "recorder", None)
+        if self.module.params.get("api_stats") and recorder:
+            stats["api_stats"] = recorder.summary()
+        return stats
+
+    def exit_json(self, **result):
+        self.module.exit_json(**result, **self.client_stats())
+
     def handle_missing_lib(self, library, exception=None):
         self.module.fail_json(
             msg=missing_required_lib(library),
@@ -46,9 +206,20 @@ class ModuleBase:
             self.handle_http_error(error.exception)
         else:
             self.module.fail_json(
-                msg=f"Error: {error}"
+                msg=f"Error: {error}",
+                **self.client_stats()
             )
 
+    @staticmethod
+    def format_error(error):
+        """
+        Returns a short description of an error, for modules that report errors per item instead of failing
+        """
+        if isinstance(error, RequestError) and getattr(error.exception, "response", None) is not None:
+            response = error.exception.response
+            return f"HTTP error: {response.status_code} {response.reason}"
+        return str(error)
+
     def handle_http_error(self, error):
         self.module.fail_json(
             msg=f"HTTP error: {error.response.status_code} {error.response.reason}",
@@ -58,6 +229,7 @@ class ModuleBase:
             request_body=error.request.body,
             code=error.response.status_code,
             response=error.response.json(),
+            **self.client_stats()
         )
 
     def fail_unable_to_find_snitch(self):
@@ -0,0 +1,99 @@
+# Copyright: (c) 2025, mikemorency
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import io
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROFILE_DIR = "~/.ansible/tmp/deadmanssnitch_profiles"
+PROFILE_CHOICES = ["cpu", "memory", "all"]
+
+
+class Profiler:
+    """
+    Profiles a module run with cProfile, tracemalloc, or both.
+
+    When the run ends, the cProfile data is written to <name>-<timestamp>-<pid>.pstats, and a text
+    summary with the top functions by cumulative time and the top lines by allocated memory is
+    written next to it with a .txt extension. The profiler is a context manager, and it writes the
+    files even when the run ends with SystemExit, which is how AnsibleModule.exit_json stops a module.
+    """
+    def __init__(self, mode: str, directory: str = None, top: int = 25, name: str = None):
+        self.mode = mode
+        self.directory = os.path.expanduser(directory or DEFAULT_PROFILE_DIR)
+        self.top = top
+        self.name = name or "module"
+        self._cpu = None
+        self._started = None
+        self.files = []
+
+    @property
+    def cpu(self):
+        return self.mode in ("cpu", "all")
+
+    @property
+    def memory(self):
+        return self.mode in ("memory", "all")
+
+    def start(self):
+        import cProfile
+        import tracemalloc
+
+        self._started = time.perf_counter()
+        if self.memory:
+            tracemalloc.start()
+        if self.cpu:
+            self._cpu = cProfile.Profile()
+            self._cpu.enable()
+
+    def stop(self):
+        import tracemalloc
+
+        elapsed = time.perf_counter() - self._started
+        snapshot, peak = None, None
+        if self.cpu:
+            self._cpu.disable()
+        if self.memory:
+            snapshot = tracemalloc.take_snapshot()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+        try:
+            self._write(elapsed, snapshot, peak)
+        except OSError as e:
+            # The module result has already been sent, so failing here would only hide it
+            logger.warning("Unable to write the profile to %s: %s", self.directory, e)
+
+    def _write(self, elapsed, snapshot, peak):
+        import pstats
+
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        base = os.path.join(self.directory, f"{self.name}-{time.strftime('%Y%m%d%H%M%S')}-{os.getpid()}")
+
+        summary = io.StringIO()
+        summary.write(f"{self.name}: {elapsed:.3f} seconds\n")
+        if self.cpu:
+            self._cpu.dump_stats(f"{base}.pstats")
+            self.files.append(f"{base}.pstats")
+            summary.write(f"\nTop {self.top} functions by cumulative time:\n")
+            pstats.Stats(self._cpu, stream=summary).sort_stats("cumulative").print_stats(self.top)
+        if snapshot is not None:
+            summary.write(f"\nPeak traced memory: {peak} bytes\n")
+            summary.write(f"Top {self.top} lines by allocated memory:\n")
+            for stat in snapshot.statistics("lineno")[:self.top]:
+                summary.write(f"{stat}\n")
+
+        with open(f"{base}.txt", "w") as f:
+            f.write(summary.getvalue())
+        self.files.append(f"{base}.txt")
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
@@ -0,0 +1,78 @@
+# Copyright: (c) 2025, mikemorency
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import json
+import os
+import threading
+import time
+
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.cache import (
+    DEFAULT_CACHE_PATH,
+    FileLock,
+    api_key_digest,
+)
+
+
+class TokenBucket:
+    """
+    A token bucket rate limiter whose state is kept in a file, so every process on the host that
+    uses the same API key draws from the same bucket.
+
+    The bucket holds up to burst tokens and refills at rate tokens per second. Each request takes
+    one token, and waits for the bucket to refill if it is empty.
+    """
+    def __init__(self, api_key: str, rate: float, burst: int = None, path: str = None):
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self.directory = os.path.expanduser(path or DEFAULT_CACHE_PATH)
+        self.state_file = os.path.join(self.directory, f"ratelimit-{api_key_digest(api_key)}.json")
+        self.wait_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def _read_tokens(self, fd, now):
+        try:
+            state = json.loads(os.pread(fd, 1024, 0).decode("utf-8"))
+            tokens = float(state["tokens"]) + (now - float(state["updated"])) * self.rate
+        except (ValueError, KeyError, TypeError):
+            return float(self.burst)
+        return min(float(self.burst), tokens)
+
+    @staticmethod
+    def _write_tokens(fd, tokens, now):
+        data = json.dumps({"tokens": tokens, "updated": now}).encode("utf-8")
+        os.ftruncate(fd, 0)
+        os.pwrite(fd, data, 0)
+
+    def _try_take(self):
+        """
+        Takes a token if one is available. Returns 0 if a token was taken, or the number of seconds
+        until one will be available.
+        """
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+
+        with FileLock(self.state_file) as lock:
+            now = time.time()
+            tokens = self._read_tokens(lock.fd, now)
+            if tokens >= 1:
+                self._write_tokens(lock.fd, tokens - 1, now)
+                return 0
+            return (1 - tokens) / self.rate
+
+    def acquire(self, timeout: float = None):
+        """
+        Blocks until a token is available. Returns False if no token became available before the
+        timeout.
+        """
+        waited = 0.0
+        while True:
+            wait = self._try_take()
+            if not wait:
+                with self._lock:
+                    self.wait_seconds += waited
+                return True
+            if timeout is not None and waited + wait > timeout:
+                return False
+            time.sleep(wait)
+            waited += wait
@@ -0,0 +1,129 @@
+# Copyright: (c) 2025, mikemorency
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.concurrency import (
+    run_concurrently,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.snitch import (
+    SnitchModule,
+)
+
+
+class Change:
+    """
+    The action needed to bring one snitch to its desired state
+    """
+    def __init__(self, item: SnitchModule, action: str):
+        self.item = item
+        self.action = action
+        self.error = None
+        self.diff = None
+        # True if the snitch was known to be in its desired state, so it was not compared
+        self.skipped = False
+
+    @property
+    def name(self):
+        return self.item.params["name"] or (self.item.live_snitch or dict()).get("name")
+
+    @property
+    def id(self):
+        return (self.item.live_snitch or dict()).get("token")
+
+    @property
+    def api_calls(self):
+        return 0 if self.action == "none" else 1
+
+    def apply(self):
+        if self.action in ("create", "update"):
+            self.item.state_present()
+        elif self.action == "delete":
+            self.item.state_absent()
+
+    def result(self):
+        result = dict(
+            name=self.name,
+            id=self.id,
+            state=self.item.params["state"],
+            action=self.action,
+            changed=self.action != "none" and self.error is None,
+            failed=self.error is not None,
+        )
+        if self.diff is not None:
+            result["diff"] = self.diff
+        if self.error is not None:
+            result["msg"] = self.error
+        return result
+
+
+class Reconciler:
+    """
+    Plans and applies the changes between desired snitches and the live snitches in the account.
+
+    The live snitches are listed once and indexed by token and name, so planning does not make any
+    API calls. The changes are then applied concurrently, and a failed change does not stop the others.
+    """
+    def __init__(self, module, client):
+        self.module = module
+        self.client = client
+        self.snitches_by_name = dict()
+        self.snitches_by_token = dict()
+
+    def load_live_snitches(self, snitches=None):
+        if snitches is None:
+            snitches = self.client.list_snitches() or []
+        for snitch in snitches:
+            self.snitches_by_token[snitch["token"]] = snitch
+            self.snitches_by_name.setdefault(snitch["name"], snitch)
+
+    def plan(self, params: dict):
+        """
+        Resolves the live snitch for the desired params and decides which API call, if any, is needed
+        """
+        item = SnitchModule(self.module, params=params, client=self.client)
+        if params["id"]:
+            item.live_snitch = self.snitches_by_token.get(params["id"])
+            if not item.live_snitch and params["state"] == "present":
+                self.module.fail_json(msg=f"Unable to find snitch with ID {params['id']}")
+        elif params["name"]:
+            item.live_snitch = self.snitches_by_name.get(params["name"])
+
+        if params["state"] == "absent":
+            return Change(item, "delete" if item.live_snitch else "none")
+
+        item.validate_params_for_present()
+        if not item.live_snitch:
+            return Change(item, "create")
+        return Change(item, "update" if item.are_changes_needed() else "none")
+
+    def unchanged(self, params: dict, live_snitch: dict):
+        """Returns a change with no action for a snitch that is known to be in its desired state"""
+        item = SnitchModule(self.module, params=params, client=self.client)
+        item.live_snitch = live_snitch
+        change = Change(item, "none")
+        change.skipped = True
+        return change
+
+    def plan_delete(self, snitch: dict):
+        """Plans the deletion of a live snitch that is not wanted anymore"""
+        params = {key: None for key in SnitchModule.argument_spec()}
+        params.update(name=snitch["name"], state="absent")
+        item = SnitchModule(self.module, params=params, client=self.client)
+        item.live_snitch = snitch
+        return Change(item, "delete")
+
+    def apply(self, changes: list, workers: int = 4):
+        """
+        Applies the changes concurrently, and records the diff of each change if the module is run in
+        diff mode. Errors are recorded on the failed changes instead of being raised.
+        """
+        to_apply = [change for change in changes if change.action != "none"]
+        if self.module._diff:
+            for change in to_apply:
+                change.diff = change.item.get_diff()
+
+        if not to_apply or self.module.check_mode:
+            return
+        for task in run_concurrently(Change.apply, to_apply, workers=workers):
+            if task.failed:
+                task.item.error = task.item.item.format_error(task.error)
@@ -0,0 +1,119 @@
+# Copyright: (c) 2025, mikemorency
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import random
+import threading
+import time
+
+# Status codes that mean the request may succeed if it is sent again
+RETRY_STATUS_CODES = frozenset([429, 500, 502, 503, 504])
+# Status codes that may come with a Retry-After header
+RETRY_AFTER_STATUS_CODES = frozenset([429, 503])
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+
+
+class DeadlineExceededError(Exception):
+    """
+    Raised when the time allowed for all of the API calls in a module run has been used up
+    """
+    pass
+
+
+def parse_retry_after(value):
+    """
+    Returns the number of seconds to wait from a Retry-After header value, which may be a number of
+    seconds or an HTTP date. Returns None if the value cannot be parsed.
+    """
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    from email.utils import parsedate_to_datetime
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if retry_at is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class RetryPolicy:
+    """
+    Decides if a failed request should be sent again and how long to wait first.
+
+    Waits use exponential backoff with full jitter, unless the API sent a Retry-After header.
+    Every wait, including a Retry-After wait, is capped at max_backoff.
+    Only idempotent methods are retried by default. Rate limited (429) requests are always
+    retried, because the API rejects them before doing any work.
+    An optional deadline limits the total time spent on all requests, including waits.
+    The number of retries and the time spent waiting are recorded so they can be reported.
+    """
+    def __init__(self, max_retries: int = 3, backoff: float = 1.0, max_backoff: float = 60.0,
+                 retry_all_methods: bool = False, deadline: float = None):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.retry_all_methods = retry_all_methods
+        self.deadline = deadline
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Clears the recorded retries and restarts the deadline"""
+        with self._lock:
+            self.retries = 0
+            self.wait_seconds = 0.0
+        self._deadline_at = time.monotonic() + self.deadline if self.deadline else None
+
+    @property
+    def stats(self):
+        return dict(retries=self.retries, wait_seconds=round(self.wait_seconds, 3))
+
+    def remaining(self):
+        """Returns the number of seconds left before the deadline, or None if there is no deadline"""
+        if self._deadline_at is None:
+            return None
+        return max(0.0, self._deadline_at - time.monotonic())
+
+    def check_deadline(self):
+        if self.remaining() == 0:
+            raise DeadlineExceededError(
+                f"The deadline of {self.deadline} seconds for API requests was exceeded"
+            )
+
+    def should_retry(self, method: str, attempt: int, status_code=None, error=None):
+        if attempt >= self.max_retries:
+            return False
+        if status_code is not None and status_code not in RETRY_STATUS_CODES:
+            return False
+        if status_code == 429:
+            return True
+        return self.retry_all_methods or method.upper() in IDEMPOTENT_METHODS
+
+    def get_wait(self, attempt: int, status_code=None, headers=None):
+        if status_code in RETRY_AFTER_STATUS_CODES and headers:
+            retry_after = parse_retry_after(headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(self.max_backoff, retry_after)
+        return random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+
+    def wait(self, attempt: int, status_code=None, headers=None):
+        """
+        Sleeps before the next attempt. Returns False without sleeping if the wait would go past
+        the deadline.
+        """
+        wait = self.get_wait(attempt, status_code=status_code, headers=headers)
+        remaining = self.remaining()
+        if remaining is not None and wait >= remaining:
+            return False
+
+        time.sleep(wait)
+        with self._lock:
+            self.retries += 1
+            self.wait_seconds += wait
+        return True
@@ -0,0 +1,53 @@
+# Copyright: (c) 2025, mikemorency
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import re
+
+STATUS_CHOICES = ["pending", "healthy", "failed", "errored", "missing", "paused"]
+SELECTOR_OPTIONS = ["match_tags", "name_regex", "status"]
+
+
+def selector_argument_spec():
+    return dict(
+        match_tags=dict(type="list", elements="str", required=False),
+        name_regex=dict(type="str", required=False),
+        status=dict(type="list", elements="str", required=False, choices=STATUS_CHOICES),
+    )
+
+
+class SnitchSelector:
+    """
+    Matches snitches against a set of criteria. A snitch is selected if it has every tag in
+    match_tags, its name matches name_regex, and its status is one of the statuses.
+    Criteria that are not set match every snitch.
+    """
+    def __init__(self, match_tags=None, name_regex=None, status=None):
+        self.match_tags = set(match_tags or [])
+        self.name_regex = re.compile(name_regex) if name_regex else None
+        self.status = set(status or [])
+
+    @classmethod
+    def from_params(cls, params: dict):
+        return cls(
+            match_tags=params.get("match_tags"),
+            name_regex=params.get("name_regex"),
+            status=params.get("status"),
+        )
+
+    @staticmethod
+    def is_requested(params: dict):
+        """Returns True if any of the selector options are set"""
+        return any(params.get(option) is not None for option in SELECTOR_OPTIONS)
+
+    def matches(self, snitch: dict):
+        if self.match_tags and not self.match_tags.issubset(snitch.get("tags") or []):
+            return False
+        if self.name_regex and not self.name_regex.search(snitch.get("name") or ""):
+            return False
+        if self.status and snitch.get("status") not in self.status:
+            return False
+        return True
+
+    def select(self, snitches):
+        return [snitch for snitch in snitches if self.matches(snitch)]
@@ -0,0 +1,96 @@
+# Copyright: (c) 2025, mikemorency
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import heapq
+import itertools
+
+SORT_ORDERS = ["asc", "desc"]
+
+
+def shaping_argument_spec():
+    return dict(
+        fields=dict(type="list", elements="str", required=False),
+        sort_by=dict(type="str", required=False),
+        sort_order=dict(type="str", required=False, default="asc", choices=SORT_ORDERS),
+        limit=dict(type="int", required=False),
+        offset=dict(type="int", required=False, default=0),
+        count_only=dict(type="bool", required=False, default=False),
+    )
+
+
+class ResultShaper:
+    """
+    Reduces a stream of snitches to the part that should be returned.
+
+    The snitches are consumed one at a time, so only the snitches that are returned are kept in
+    memory. Without sort_by, iteration stops as soon as offset + limit snitches have been seen, which
+    also stops reading the API response. With sort_by and a limit, a heap keeps only the first
+    offset + limit snitches in the sort order. Snitches without a value in the sort field are always
+    last. fields are applied after sorting, so snitches can be sorted by a field that is not returned.
+    """
+    def __init__(self, fields=None, sort_by: str = None, sort_order: str = "asc", limit: int = None,
+                 offset: int = 0, count_only: bool = False):
+        self.fields = fields
+        self.sort_by = sort_by
+        self.descending = sort_order == "desc"
+        self.limit = limit
+        self.offset = offset or 0
+        self.count_only = count_only
+
+    @classmethod
+    def from_params(cls, params: dict):
+        return cls(
+            fields=params.get("fields"),
+            sort_by=params.get("sort_by"),
+            sort_order=params.get("sort_order") or "asc",
+            limit=params.get("limit"),
+            offset=params.get("offset"),
+            count_only=params.get("count_only") or False,
+        )
+
+    @property
+    def requested(self):
+        return bool(self.fields is not None or self.sort_by or self.limit is not None or self.offset
+                    or self.count_only)
+
+    def validate(self):
+        """Returns an error message if the options are invalid, or None"""
+        if self.limit is not None and self.limit < 0:
+            return "limit must be zero or greater"
+        if self.offset < 0:
+            return "offset must be zero or greater"
+        return None
+
+    def project(self, snitch: dict):
+        if snitch is None or self.fields is None:
+            return snitch
+        return {field: snitch.get(field) for field in self.fields}
+
+    def _sort_key(self, snitch: dict):
+        value = snitch.get(self.sort_by)
+        if self.descending:
+            return (value is not None, value if value is not None else "")
+        return (value is None, value if value is not None else "")
+
+    def _select(self, snitches):
+        stop = None if self.limit is None else self.offset + self.limit
+        if not self.sort_by:
+            return itertools.islice(snitches, self.offset, stop)
+
+        if stop is None:
+            ordered = sorted(snitches, key=self._sort_key, reverse=self.descending)
+        elif self.descending:
+            ordered = heapq.nlargest(stop, snitches, key=self._sort_key)
+        else:
+            ordered = heapq.nsmallest(stop, snitches, key=self._sort_key)
+        return ordered[self.offset:]
+
+    def shape(self, snitches):
+        """Returns the projected snitches in the requested page"""
+        return [self.project(snitch) for snitch in self._select(iter(snitches))]
+
+    @staticmethod
+    def count(snitches):
+        """Counts the snitches without keeping any of them"""
+        return sum(1 for _snitch in snitches)
@@ -0,0 +1,190 @@
+# Copyright: (c) 2025, mikemorency
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import hashlib
+import itertools
+import json
+import os
+import time
+
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.client import (
+    HTTPStatusError,
+    RequestError,
+    RequestInfo,
+    ResponseInfo,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.retry import (
+    RetryPolicy,
+)
+
+SNAPSHOT_FORMAT = 1
+INDEX_SUFFIX = ".index"
+
+
+def index_path(path: str):
+    return f"{path}{INDEX_SUFFIX}"
+
+
+class SnapshotError(Exception):
+    """
+    Raised when a snapshot can not be read, or when a change is attempted through a snapshot
+    """
+    pass
+
+
+def write_atomically(path: str, mode: str, write):
+    """
+    Writes a file next to path and moves it into place, so readers never see a partial file.
+    If write returns False, the file is discarded and path is left as it was.
+    Returns True if path was replaced.
+    """
+    import tempfile
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".snapshot-")
+    try:
+        with os.fdopen(fd, mode) as f:
+            keep = write(f) is not False
+        if keep:
+            os.replace(tmp_path, path)
+        else:
+            os.remove(tmp_path)
+        return keep
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_snapshot(path: str, snitches, compresslevel: int = 6):
+    """
+    Writes snitches to a gzip compressed JSON lines file, one snitch per line, and writes an index
+    of the line for each token and name to a JSON file next to it. The snitches are written as they
+    are read, so a streamed list is never held in memory.
+    The index has a digest of the snitches. If it is the same as the digest of the existing snapshot,
+    neither file is replaced.
+    Returns the index of the snapshot, and True if the files were replaced.
+    """
+    import gzip
+
+    path = os.path.expanduser(path)
+    previous = None
+    if os.path.exists(path):
+        try:
+            previous = read_index(path)
+        except SnapshotError:
+            pass
+
+    index = dict(format=SNAPSHOT_FORMAT, created_at=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                 count=0, digest=None, tokens=dict(), names=dict())
+
+    def write_data(f):
+        digest = hashlib.sha256()
+        with gzip.GzipFile(fileobj=f, mode="wb", compresslevel=compresslevel, mtime=0) as data:
+            for line, snitch in enumerate(snitches):
+                encoded = json.dumps(snitch, separators=(",", ":")).encode("utf-8") + b"\n"
+                data.write(encoded)
+                digest.update(encoded)
+                index["tokens"][snitch["token"]] = line
+                index["names"].setdefault(snitch["name"], line)
+                index["count"] = line + 1
+        index["digest"] = digest.hexdigest()
+        return previous is None or previous.get("digest") != index["digest"]
+
+    if not write_atomically(path, "wb", write_data):
+        return previous, False
+    write_atomically(index_path(path), "w", lambda f: json.dump(index, f, separators=(",", ":")))
+    return index, True
+
+
+def read_index(path: str):
+    path = os.path.expanduser(path)
+    try:
+        with open(index_path(path)) as f:
+            index = json.load(f)
+    except (OSError, ValueError) as e:
+        raise SnapshotError(f"Unable to read the snapshot index {index_path(path)}: {e}")
+    if index.get("format") != SNAPSHOT_FORMAT:
+        raise SnapshotError(f"Unsupported snapshot format {index.get('format')} in {index_path(path)}")
+    return index
+
+
+class SnapshotClient:
+    """
+    A read only client that answers lookups from a snapshot instead of the API.
+
+    The index is read when the client is created. get_snitch uses it to skip snitches that are not
+    in the snapshot without opening the data file, and to stop reading the data file at the line of
+    the snitch it wants. Calls that would change a snitch raise SnapshotError.
+    """
+    def __init__(self, path: str):
+        self.path = os.path.expanduser(path)
+        self.index = read_index(self.path)
+        self.cache = None
+        self.recorder = None
+        self.retry_policy = RetryPolicy(max_retries=0)
+
+    def close(self):
+        return
+
+    @property
+    def created_at(self):
+        return self.index["created_at"]
+
+    def _iter_lines(self):
+        import gzip
+
+        try:
+            with gzip.open(self.path, "rb") as data:
+                for line in data:
+                    yield json.loads(line)
+        except (OSError, EOFError, ValueError) as e:
+            raise SnapshotError(f"Unable to read the snapshot {self.path}: {e}")
+
+    def iter_snitches(self, tags: list = None):
+        """Yields the snitches in the snapshot. If tags are given, only snitches with every tag are yielded."""
+        wanted = set(tags or [])
+        for snitch in self._iter_lines():
+            if not wanted or wanted.issubset(snitch.get("tags") or []):
+                yield snitch
+
+    def list_snitches(self, tags: list = None):
+        return list(self.iter_snitches(tags=tags))
+
+    def get_snitch(self, snitch_id: str):
+        """
+        Returns a snitch by ID. Snitches that are not in the snapshot raise the same error as the API.
+        The data and index files are replaced one after the other, so if the snitch at the indexed line
+        is not the one that was asked for, the data file is scanned instead.
+        """
+        line = self.index["tokens"].get(snitch_id)
+        if line is not None:
+            lines = self._iter_lines()
+            try:
+                snitch = next(itertools.islice(lines, line, None), None)
+            finally:
+                lines.close()
+            if snitch is not None and snitch.get("token") == snitch_id:
+                return snitch
+            for snitch in self.iter_snitches():
+                if snitch.get("token") == snitch_id:
+                    return snitch
+
+        url = f"{self.path}#snitches/{snitch_id}"
+        raise RequestError(HTTPStatusError(
+            request=RequestInfo(url=url, method="GET"),
+            response=ResponseInfo(status_code=404, reason="Not Found", body=dict(error="Not found in snapshot")),
+        ))
+
+    def _read_only(self, *args, **kwargs):
+        raise SnapshotError(f"Snitches can not be changed, because they are read from the snapshot {self.path}")
+
+    create_snitch = _read_only
+    update_snitch = _read_only
+    delete_snitch = _read_only
+    append_snitch_tags = _read_only
+    replace_snitch_tags = _read_only
+    remove_snitch_tag = _read_only
+    pause_snitch = _read_only
+    unpause_snitch = _read_only
@@ -0,0 +1,126 @@
+# Copyright: (c) 2025, mikemorency
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import logging
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.diff import (
+    build_diff,
+    changed_fields,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.module_base import (
+    ModuleBase,
+)
+
+logger = logging.getLogger(__name__)
+
+INTERVAL_CHOICES = [
+    "1_minute",
+    "2_minute",
+    "3_minute",
+    "5_minute",
+    "10_minute",
+    "15_minute",
+    "30_minute",
+    "hourly",
+    "2_hour",
+    "3_hour",
+    "4_hour",
+    "6_hour",
+    "8_hour",
+    "12_hour",
+    "daily",
+    "weekly",
+    "monthly",
+]
+
+
+class SnitchModule(ModuleBase):
+    def __init__(self, module, params=None, client=None):
+        super().__init__(module, params=params, client=client)
+        self.live_snitch = None
+
+    @staticmethod
+    def argument_spec():
+        return dict(
+            name=dict(type="str", required=False),
+            id=dict(type="str", required=False),
+            interval=dict(type="str", required=False, choices=INTERVAL_CHOICES),
+            alert_type=dict(type="str", required=False, choices=["basic", "smart"]),
+            alert_email=dict(type="list", elements="str", required=False),
+            notes=dict(type="str", required=False),
+            tags=dict(type="list", elements="str", required=False),
+            state=dict(
+                type="str",
+                choices=["present", "absent"],
+                default="present",
+                required=False,
+            ),
+        )
+
+    def validate_params_for_present(self):
+        if not self.live_snitch:
+            for param in ["name", "interval"]:
+                if not self.params[param]:
+                    self.module.fail_json(
+                        msg=f"{param} is required when creating a new snitch"
+                    )
+
+    def get_changes(self):
+        """
+        Returns the fields that need to be sent to the API to bring the live snitch to the desired state
+        """
+        return changed_fields(self.params, self.live_snitch)
+
+    def are_changes_needed(self):
+        if not self.live_snitch:
+            return True
+
+        return bool(self.get_changes())
+
+    def get_diff(self):
+        """
+        Returns the before and after state of the snitch for --diff mode
+        """
+        if self.params["state"] == "absent":
+            if not self.live_snitch:
+                return dict(before=dict(), after=dict())
+            return build_diff(self.live_snitch, None)
+        return build_diff(self.live_snitch, self.params)
+
+    def lookup_live_snitch(self):
+        if self.params["id"]:
+            self.live_snitch = self.client.get_snitch(snitch_id=self.params["id"])
+        elif self.params["name"]:
+            for snitch in self.client.iter_snitches():
+                if snitch["name"] == self.params["name"]:
+                    self.live_snitch = snitch
+                    break
+
+        return self.live_snitch
+
+    def state_present(self):
+        if self.live_snitch:
+            logger.info("Snitch already exists, it will be updated.")
+            snitch = self.client.update_snitch(
+                snitch_id=self.live_snitch["token"],
+                **self.get_changes()
+            )
+            self.live_snitch = snitch
+        else:
+            snitch = self.client.create_snitch(
+                name=self.params["name"],
+                interval=self.params["interval"],
+                alert_type=self.params["alert_type"],
+                alert_email=self.params["alert_email"],
+                notes=self.params["notes"],
+                tags=self.params["tags"],
+            )
+            self.live_snitch = snitch
+        return
+
+    def state_absent(self):
+        if not self.live_snitch:
+            return
+
+        self.client.delete_snitch(snitch_id=self.live_snitch["token"])
+        return
@@ -0,0 +1,160 @@
+# Copyright: (c) 2025, mikemorency
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import re
+
+INDEXED_FIELDS = ["tags", "status", "interval", "alert_type"]
+QUERY_OPERATORS = ["AND", "OR", "NOT"]
+
+_TOKEN_RE = re.compile(r'\s*(?:(\()|(\))|"((?:[^"\\]|\\.)*)"|([^\s()"]+))')
+
+
+class TagQueryError(ValueError):
+    """
+    Raised when a tag query can not be parsed
+    """
+    pass
+
+
+def _tokenize(query: str):
+    tokens = []
+    position = 0
+    query = query.rstrip()
+    while position < len(query):
+        match = _TOKEN_RE.match(query, position)
+        if not match:
+            raise TagQueryError(f"Unexpected character at position {position}: {query[position:]!r}")
+        position = match.end()
+        open_paren, close_paren, quoted, word = match.groups()
+        if open_paren or close_paren:
+            tokens.append((match.group(0).strip(), None))
+        elif quoted is not None:
+            tokens.append(("TAG", re.sub(r"\\(.)", r"\1", quoted)))
+        elif word in QUERY_OPERATORS:
+            tokens.append((word, None))
+        else:
+            tokens.append(("TAG", word))
+    return tokens
+
+
+def parse_tag_query(query: str):
+    """
+    Parses a boolean tag query into a tree of tuples, like ("and", ("tag", "prod"), ("not", ("tag", "db"))).
+
+    Tags are combined with AND, OR, and NOT, and grouped with parentheses. NOT binds tighter than AND,
+    and AND binds tighter than OR. The operators must be upper case. Tags that contain spaces,
+    parentheses, or that are the same as an operator can be quoted, for example "NOT" or "team a".
+    """
+    tokens = _tokenize(query)
+    position = 0
+
+    def peek():
+        return tokens[position][0] if position < len(tokens) else None
+
+    def take(kind):
+        nonlocal position
+        if peek() != kind:
+            found = peek() or "the end of the query"
+            raise TagQueryError(f"Expected {kind} but found {found} in tag query {query!r}")
+        token = tokens[position]
+        position += 1
+        return token
+
+    def parse_or():
+        node = parse_and()
+        while peek() == "OR":
+            take("OR")
+            node = ("or", node, parse_and())
+        return node
+
+    def parse_and():
+        node = parse_not()
+        while peek() == "AND":
+            take("AND")
+            node = ("and", node, parse_not())
+        return node
+
+    def parse_not():
+        if peek() == "NOT":
+            take("NOT")
+            return ("not", parse_not())
+        if peek() == "(":
+            take("(")
+            node = parse_or()
+            take(")")
+            return node
+        return ("tag", take("TAG")[1])
+
+    if not tokens:
+        raise TagQueryError("The tag query is empty")
+    tree = parse_or()
+    if position != len(tokens):
+        raise TagQueryError(f"Unexpected {tokens[position][0]} in tag query {query!r}")
+    return tree
+
+
+class SnitchIndex:
+    """
+    An in-memory inverted index over a list of snitches. Each indexed field maps its values to the
+    positions of the snitches that have them, so tag queries and field filters are answered with set
+    operations instead of scanning every snitch. A field is indexed the first time it is queried.
+    Results are returned in the same order as the snitches were given.
+    """
+    def __init__(self, snitches):
+        self.snitches = list(snitches)
+        self.everything = frozenset(range(len(self.snitches)))
+        self._indexes = dict()
+
+    def index(self, field: str):
+        """Returns the index for a field, as a dict of value to a set of snitch positions"""
+        if field not in self._indexes:
+            index = dict()
+            for position, snitch in enumerate(self.snitches):
+                values = snitch.get(field)
+                if field == "tags":
+                    for tag in values or []:
+                        index.setdefault(tag, set()).add(position)
+                else:
+                    index.setdefault(values, set()).add(position)
+            self._indexes[field] = index
+        return self._indexes[field]
+
+    def lookup(self, field: str, values):
+        """Returns the positions of the snitches that have any of the values in a field"""
+        index = self.index(field)
+        positions = set()
+        for value in values:
+            positions |= index.get(value, set())
+        return positions
+
+    def evaluate(self, tree):
+        """Returns the positions of the snitches that match a parsed tag query"""
+        kind = tree[0]
+        if kind == "tag":
+            return self.index("tags").get(tree[1], set())
+        if kind == "not":
+            return self.everything - self.evaluate(tree[1])
+        left = self.evaluate(tree[1])
+        if kind == "and":
+            return left & self.evaluate(tree[2]) if left else set()
+        return left | self.evaluate(tree[2])
+
+    def query(self, tag_query: str = None, status=None, interval=None, alert_type=None, name_pattern: str = None):
+        """
+        Returns the snitches that match every criteria that is set. status, interval, and alert_type
+        are lists of accepted values. name_pattern is a regular expression that is searched for in
+        the snitch names, and it is only checked against the snitches that match the other criteria.
+        """
+        positions = self.everything
+        if tag_query:
+            positions = positions & self.evaluate(parse_tag_query(tag_query))
+        for field, values in (("status", status), ("interval", interval), ("alert_type", alert_type)):
+            if values is not None:
+                positions = positions & self.lookup(field, values)
+
+        matches = [self.snitches[position] for position in sorted(positions)]
+        if name_pattern:
+            pattern = re.compile(name_pattern)
+            matches = [snitch for snitch in matches if pattern.search(snitch.get("name") or "")]
+        return matches
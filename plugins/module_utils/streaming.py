@@ -0,0 +1,51 @@
+# Copyright: (c) 2025, mikemorency
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import codecs
+import json
+
+_WHITESPACE = " \t\r\n"
+
+
+def iter_json_array(chunks):
+    """
+    Yields the items of a JSON array as they are read from an iterable of byte chunks, so the
+    whole document never has to be held in memory. The caller can stop iterating at any time.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    started = False
+
+    for chunk in chunks:
+        buffer += text_decoder.decode(chunk)
+        pos = 0
+        while True:
+            while pos < len(buffer) and (buffer[pos] in _WHITESPACE or (started and buffer[pos] == ",")):
+                pos += 1
+            if pos >= len(buffer):
+                break
+
+            if not started:
+                if buffer[pos] != "[":
+                    raise ValueError(f"Expected a JSON array but found {buffer[pos]!r}")
+                started = True
+                pos += 1
+                continue
+
+            if buffer[pos] == "]":
+                return
+
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except ValueError:
+                # the item is not complete yet, so wait for the next chunk
+                break
+            yield item
+            pos = end
+
+        buffer = buffer[pos:]
+
+    # the closing bracket returns from the loop above, so the array was never closed
+    raise ValueError("The JSON array ended unexpectedly")
@@ -0,0 +1,102 @@
+# Copyright: (c) 2025, mikemorency
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.concurrency import (
+    run_concurrently,
+)
+
+TAG_STATES = ["present", "absent", "absolute"]
+TAG_STRATEGIES = ["auto", "per_tag", "replace"]
+
+
+def _unique(tags):
+    return list(dict.fromkeys(tags))
+
+
+def desired_tags(live_tags: list, tags: list, state: str):
+    """
+    Returns the tags a snitch should have after applying tags with the given state.
+    The order of the live tags is kept, and new tags are added in the order they were given.
+    """
+    live_tags = _unique(live_tags or [])
+    if state == "present":
+        return _unique(live_tags + list(tags))
+    if state == "absent":
+        tags = set(tags)
+        return [t for t in live_tags if t not in tags]
+    return _unique(tags)
+
+
+class TagPlan:
+    """
+    The API calls needed to move a snitch from its live tags to the desired tags.
+
+    The per_tag strategy adds all missing tags with one call and removes each extra tag with its own
+    call, so it only touches the tags that change. The replace strategy sets every tag with one call,
+    which overwrites any tags that were added to the snitch since it was read.
+    The auto strategy uses per_tag unless replace needs fewer calls.
+    """
+    def __init__(self, snitch_id: str, live_tags: list, new_tags: list):
+        self.snitch_id = snitch_id
+        self.old_tags = _unique(live_tags or [])
+        self.new_tags = new_tags
+        old_set, new_set = set(self.old_tags), set(new_tags)
+        self.to_add = [t for t in new_tags if t not in old_set]
+        self.to_remove = [t for t in self.old_tags if t not in new_set]
+
+    @property
+    def changed(self):
+        return bool(self.to_add or self.to_remove)
+
+    @property
+    def per_tag_calls(self):
+        return (1 if self.to_add else 0) + len(self.to_remove)
+
+    @property
+    def replace_calls(self):
+        return 1 if self.changed else 0
+
+    def resolve_strategy(self, strategy: str):
+        if strategy == "auto":
+            return "replace" if self.replace_calls < self.per_tag_calls else "per_tag"
+        return strategy
+
+    def api_calls(self, strategy: str):
+        """Returns the number of API calls needed to apply the plan with the strategy"""
+        if self.resolve_strategy(strategy) == "replace":
+            return self.replace_calls
+        return self.per_tag_calls
+
+    def apply(self, client, strategy: str = "auto", workers: int = 4):
+        """
+        Sends the API calls for the plan. The per tag calls are sent concurrently.
+        Returns the number of API calls that were made. If any call fails, the first error is raised
+        after the other calls have finished, and the snitch cache of the client is invalidated.
+        """
+        if not self.changed:
+            return 0
+
+        if self.resolve_strategy(strategy) == "replace":
+            client.replace_snitch_tags(snitch_id=self.snitch_id, tags=self.new_tags)
+            return 1
+
+        calls = []
+        if self.to_add:
+            calls.append(lambda: client.append_snitch_tags(snitch_id=self.snitch_id, tags=self.to_add))
+        for tag in self.to_remove:
+            calls.append(lambda tag=tag: client.remove_snitch_tag(snitch_id=self.snitch_id, tag=tag))
+
+        results = run_concurrently(lambda call: call(), calls, workers=workers)
+        errors = [task.error for task in results if task.failed]
+        if errors:
+            if client.cache:
+                # Some of the changes were made, so the tags of the snitch are not known
+                client.cache.invalidate()
+            raise errors[0]
+
+        if len(calls) > 1 and client.cache:
+            # The responses can arrive in any order, so the last one written to the cache may not
+            # include every change
+            client.cache.update_tags(self.snitch_id, self.new_tags)
+        return len(calls)
@@ -0,0 +1,227 @@
+# Copyright: (c) 2025, mikemorency
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import importlib.util
+import json
+import re
+import threading
+
+TRANSPORT_CHOICES = ["auto", "requests", "urllib"]
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class RequestInfo:
+    """
+    Describes a request that was sent to the API, in the same shape as a requests.PreparedRequest
+    """
+    def __init__(self, url, method, headers=None, body=None):
+        self.url = url
+        self.method = method
+        self.headers = headers or dict()
+        self.body = body
+
+
+class ResponseInfo:
+    """
+    Describes a response from the API, in the same shape as a requests.Response
+    """
+    def __init__(self, status_code, reason, body=None):
+        self.status_code = status_code
+        self.reason = reason
+        self.body = body
+
+    def json(self):
+        return self.body
+
+
+class HTTPStatusError(Exception):
+    """
+    Raised when the API responds with an error status and the request was not sent with requests
+    """
+    def __init__(self, request: RequestInfo, response: ResponseInfo):
+        super().__init__(f"{response.status_code} {response.reason} for url: {request.url}")
+        self.request = request
+        self.response = response
+
+
+class ConnectionFailedError(Exception):
+    """
+    Raised by the urllib transport when a request could not be sent or the response was not received
+    """
+    pass
+
+
+def requests_available():
+    """Returns True if the requests library is installed, without importing it"""
+    return importlib.util.find_spec("requests") is not None
+
+
+def resolve_transport(name: str):
+    if name == "auto":
+        return "requests" if requests_available() else "urllib"
+    return name
+
+
+def create_transport(name: str = "auto", pool_size: int = 10):
+    if resolve_transport(name) == "requests":
+        return RequestsTransport(pool_size=pool_size)
+    return UrllibTransport()
+
+
+class RequestsTransport:
+    """
+    Sends requests with a requests Session. Connections are pooled and kept alive between requests.
+    requests is imported when the first request is sent.
+    """
+    name = "requests"
+
+    def __init__(self, pool_size: int = 10):
+        self.pool_size = pool_size
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def retryable_errors(self):
+        import requests
+        return (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+
+    @property
+    def session(self):
+        """
+        The shared HTTP session. It is created on first use and reused by every request, so
+        connections are kept alive between API calls. Requests made from multiple threads share the
+        same connection pool.
+        """
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+
+    def _create_session(self):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, pool_block=True)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers["Connection"] = "keep-alive"
+        return session
+
+    def request(self, **kwargs):
+        return self.session.request(**kwargs)
+
+    def close(self):
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+def parse_link_header(value: str):
+    """Returns the links in a Link header, keyed by their rel, in the same shape as requests.Response.links"""
+    links = dict()
+    for url, params in re.findall(r"<([^>]*)>\s*((?:;[^,]*)*)", value or ""):
+        rel = re.search(r'rel="?([^";]+)"?', params)
+        if rel:
+            links[rel.group(1)] = {"url": url, "rel": rel.group(1)}
+    return links
+
+
+class UrllibResponse(ResponseInfo):
+    """
+    A response from the urllib transport, with the parts of the requests.Response interface that the
+    client uses
+    """
+    def __init__(self, request: RequestInfo, raw, status_code, reason, headers, stream=False):
+        super().__init__(status_code, reason)
+        self.request = request
+        self.headers = headers
+        self._raw = raw
+        self._content = None
+        if not stream:
+            self._content = self._read()
+
+    def _read(self):
+        try:
+            return self._raw.read() if self._raw is not None else b""
+        finally:
+            self.close()
+
+    @property
+    def content(self):
+        if self._content is None:
+            self._content = self._read()
+        return self._content
+
+    @property
+    def links(self):
+        return parse_link_header(self.headers.get("Link"))
+
+    def iter_content(self, chunk_size: int = STREAM_CHUNK_SIZE):
+        if self._content is not None:
+            yield self._content
+            return
+        while True:
+            chunk = self._raw.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+    def json(self):
+        if self.body is None:
+            self.body = json.loads(self.content.decode("utf-8"))
+        return self.body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise HTTPStatusError(request=self.request, response=self)
+
+    def close(self):
+        if self._raw is not None:
+            self._raw.close()
+
+
+class UrllibTransport:
+    """
+    Sends requests with ansible.module_utils.urls, so no third party libraries are needed.
+    A new connection is opened for every request. The urls module is imported when the first
+    request is sent.
+    """
+    name = "urllib"
+    retryable_errors = (ConnectionFailedError,)
+
+    def request(self, url, method, headers=None, auth=None, timeout=30, json=None, stream=False):
+        from urllib.error import HTTPError, URLError
+        from ansible.module_utils.urls import Request
+
+        headers = dict(headers or {})
+        body = None
+        if json is not None:
+            body = _json_dumps(json)
+            headers.setdefault("Content-Type", "application/json")
+
+        request = Request(
+            headers=headers,
+            url_username=auth[0] if auth else None,
+            url_password=auth[1] if auth else None,
+            force_basic_auth=bool(auth),
+            timeout=timeout,
+        )
+        info = RequestInfo(url=url, method=method, headers=headers, body=body)
+        try:
+            raw = request.open(method, url, data=body)
+            return UrllibResponse(info, raw, raw.status, raw.reason, raw.headers, stream=stream)
+        except HTTPError as e:
+            return UrllibResponse(info, e, e.code, e.reason, e.headers, stream=False)
+        except (URLError, OSError) as e:
+            raise ConnectionFailedError(f"Unable to send {method} request to {url}: {e}") from e
+
+    def close(self):
+        return
+
+
+def _json_dumps(data):
+    return json.dumps(data)
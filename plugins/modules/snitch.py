@@ -17,6 +17,7 @@ description: Create, update, or delete a Dead Man's Snitch
 
 extends_documentation_fragment:
     - mikemorency.deadmanssnitch.module_base
+    - mikemorency.deadmanssnitch.snapshot
 
 options:
     name:
@@ -120,6 +121,38 @@ snitch:
         'id': "123456",
         'name': "my-snitch",
     }
+
+api_retries:
+    description:
+        - The number of API requests that were retried, and the total number of seconds spent waiting before retrying.
+    type: dict
+    returned: always
+    sample: {
+        'retries': 1,
+        'wait_seconds': 0.512,
+    }
+
+api_stats:
+    description:
+        - The API requests made by the module, when O(api_stats=true).
+        - RV(api_stats.endpoints) has the totals for each endpoint, and RV(api_stats.requests) has every request in the order they finished.
+    type: dict
+    returned: when O(api_stats=true)
+    sample: {
+        'calls': 2,
+        'cache_hits': 0,
+        'retries': 0,
+        'seconds': 0.412,
+        'bytes': 1830,
+        'endpoints': {
+            'GET /snitches': {'calls': 1, 'seconds': 0.301, 'bytes': 1412, 'errors': 0, 'cache_hits': 0},
+            'PATCH /snitches/{token}': {'calls': 1, 'seconds': 0.111, 'bytes': 418, 'errors': 0, 'cache_hits': 0},
+        },
+        'requests': [
+            {'method': 'GET', 'endpoint': '/snitches', 'status': 200, 'bytes': 1412, 'latency': 0.301, 'retries': 0, 'cache_hit': false},
+            {'method': 'PATCH', 'endpoint': '/snitches/{token}', 'status': 200, 'bytes': 418, 'latency': 0.111, 'retries': 0, 'cache_hit': false},
+        ],
+    }
 """
 
 from ansible.module_utils.basic import AnsibleModule
@@ -127,162 +160,62 @@ import logging
 from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.module_base import (
     ModuleBase,
 )
-
-logger = logging.getLogger(__name__)
-
-
-class SnitchModule(ModuleBase):
-    def __init__(self, module):
-        super().__init__(module)
-        self.live_snitch = None
-
-    def validate_params_for_present(self):
-        if not self.live_snitch:
-            for param in ["name", "interval"]:
-                if not self.params[param]:
-                    self.module.fail_json(
-                        msg=f"{param} is required when creating a new snitch"
-                    )
-
-    def are_changes_needed(self):
-        if not self.live_snitch:
-            return True
-
-        if any(
-            [
-                self.params["name"] is not None
-                and self.params["name"] != self.live_snitch["name"],
-                self.params["interval"] is not None
-                and self.params["interval"] != self.live_snitch["interval"],
-                self.params["alert_type"] is not None
-                and self.params["alert_type"] != self.live_snitch["alert_type"],
-                self.params["alert_email"] is not None
-                and self.params["alert_email"] != self.live_snitch["alert_email"],
-                self.params["notes"] is not None
-                and self.params["notes"] != self.live_snitch["notes"],
-                self.params["tags"] is not None
-                and self.params["tags"] != self.live_snitch["tags"],
-            ]
-        ):
-            return True
-
-        return False
-
-    def lookup_live_snitch(self):
-        if self.params["id"]:
-            self.live_snitch = self.client.get_snitch(snitch_id=self.params["id"])
-        elif self.params["name"]:
-            for snitch in self.client.list_snitches():
-                if snitch["name"] == self.params["name"]:
-                    self.live_snitch = snitch
-                    break
-
-        return self.live_snitch
-
-    def state_present(self):
-        if self.live_snitch:
-            logger.info("Snitch already exists, it will be updated.")
-            snitch = self.client.update_snitch(
-                snitch_id=self.live_snitch["token"],
-                name=self.params["name"],
-                interval=self.params["interval"],
-                alert_type=self.params["alert_type"],
-                alert_email=self.params["alert_email"],
-                notes=self.params["notes"],
-                tags=self.params["tags"],
-            )
-            self.live_snitch = snitch
-        else:
-            snitch = self.client.create_snitch(
-                name=self.params["name"],
-                interval=self.params["interval"],
-                alert_type=self.params["alert_type"],
-                alert_email=self.params["alert_email"],
-                notes=self.params["notes"],
-                tags=self.params["tags"],
-            )
-            self.live_snitch = snitch
-        return
-
-    def state_absent(self):
-        if not self.live_snitch:
-            return
-
-        self.client.delete_snitch(snitch_id=self.live_snitch["token"])
-        return
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.snitch import (
+    SnitchModule,
+)
 
 
-def main():
+def module_spec():
     # define available arguments/parameters a user can pass to the module
     module_args = {
         **ModuleBase.base_argument_spec(),
-        **dict(
-            name=dict(type="str", required=False),
-            id=dict(type="str", required=False),
-            interval=dict(
-                type="str",
-                required=False,
-                choices=[
-                    "1_minute",
-                    "2_minute",
-                    "3_minute",
-                    "5_minute",
-                    "10_minute",
-                    "15_minute",
-                    "30_minute",
-                    "hourly",
-                    "2_hour",
-                    "3_hour",
-                    "4_hour",
-                    "6_hour",
-                    "8_hour",
-                    "12_hour",
-                    "daily",
-                    "weekly",
-                    "monthly",
-                ],
-            ),
-            alert_type=dict(type="str", required=False, choices=["basic", "smart"]),
-            alert_email=dict(type="list", elements="str", required=False),
-            notes=dict(type="str", required=False),
-            tags=dict(type="list", elements="str", required=False),
-            state=dict(
-                type="str",
-                choices=["present", "absent"],
-                default="present",
-                required=False,
-            ),
-        ),
+        **ModuleBase.snapshot_argument_spec(),
+        **SnitchModule.argument_spec(),
     }
 
-    module = AnsibleModule(
+    return dict(
         argument_spec=module_args,
         supports_check_mode=True,
         required_one_of=[
             ["name", "id"],
         ],
     )
+
+
+def run_module(module, client=None):
     result = dict(changed=False, snitch=dict(name=module.params["name"]))
 
-    snitch_module = SnitchModule(module)
+    snitch_module = SnitchModule(module, client=client)
     try:
         snitch_module.lookup_live_snitch()
         if module.params["state"] == "present":
             snitch_module.validate_params_for_present()
             changes_needed = snitch_module.are_changes_needed()
             result["changed"] = changes_needed
-            if changes_needed:
+            if module._diff:
+                result["diff"] = snitch_module.get_diff()
+            if changes_needed and not module.check_mode:
                 snitch_module.state_present()
-            result['snitch']['id'] = snitch_module.live_snitch['token']
+            if snitch_module.live_snitch:
+                result['snitch']['id'] = snitch_module.live_snitch['token']
         elif module.params["state"] == "absent":
             if snitch_module.live_snitch:
                 result["changed"] = True
-                snitch_module.state_absent()
+                if module._diff:
+                    result["diff"] = snitch_module.get_diff()
+                if not module.check_mode:
+                    snitch_module.state_absent()
 
     except Exception as e:
         snitch_module.handle_exception(e)
 
-    module.exit_json(**result)
+    snitch_module.exit_json(**result)
+
+
+def main():
+    module = AnsibleModule(**module_spec())
+    with ModuleBase.profiled(module):
+        run_module(module)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,323 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2025, mikemorency
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: snitch_action
+short_description: Pause, unpause, or delete many snitches in one task
+description:
+    - Pauses, unpauses, or deletes every snitch that matches a selector, for example during a maintenance window.
+    - The account is listed once, the snitches are selected locally, and the API calls are sent concurrently.
+    - The module is idempotent. Snitches that are already paused are not paused again, and only paused snitches are
+      unpaused.
+
+extends_documentation_fragment:
+    - mikemorency.deadmanssnitch.module_base
+
+options:
+    action:
+        description:
+            - The action to take on each selected snitch.
+        required: true
+        type: str
+        choices: ['pause', 'unpause', 'delete']
+    ids:
+        description:
+            - Select the snitches with these IDs.
+            - IDs that are not in the account are reported in RV(snitches) with the outcome V(not_found). This fails the
+              module unless O(action=delete), because a deleted snitch is already absent.
+        required: false
+        type: list
+        elements: str
+    match_tags:
+        description:
+            - Select every snitch that has all of these tags.
+            - The selector options O(ids), O(match_tags), O(name_regex), and O(status) can be combined. A snitch is
+              only selected if it matches all of the options that are set. At least one must be set.
+        required: false
+        type: list
+        elements: str
+    name_regex:
+        description:
+            - Select every snitch with a name that matches this regular expression.
+            - The expression may match any part of the name. Use C(^) and C($) to match the whole name.
+        required: false
+        type: str
+    status:
+        description:
+            - Select every snitch with one of these statuses.
+        required: false
+        type: list
+        elements: str
+        choices: ['pending', 'healthy', 'failed', 'errored', 'missing', 'paused']
+    workers:
+        description:
+            - The maximum number of API calls to make at the same time.
+            - The number of pooled connections is set by O(pool_size), so this should not be larger than O(pool_size).
+        required: false
+        default: 4
+        type: int
+"""
+
+EXAMPLES = r"""
+- name: Pause the database backup snitches during maintenance
+  mikemorency.deadmanssnitch.snitch_action:
+    action: pause
+    match_tags:
+      - backups
+    name_regex: ^db-
+    workers: 8
+
+- name: Unpause them afterwards
+  mikemorency.deadmanssnitch.snitch_action:
+    action: unpause
+    match_tags:
+      - backups
+    name_regex: ^db-
+
+- name: Delete snitches by ID
+  mikemorency.deadmanssnitch.snitch_action:
+    action: delete
+    ids:
+      - c2354d53d2
+      - 9f8e7d6c5b
+"""
+
+RETURN = r"""
+snitches:
+    description:
+        - The outcome for each selected snitch, in the order they were listed, followed by any O(ids) that were not found.
+        - RV(snitches[].status) is the status of the snitch before the module was run.
+        - RV(snitches[].outcome) is one of V(paused), V(unpaused), V(deleted), V(skipped) if the snitch was already in
+          the requested state, V(not_found), or V(failed).
+        - RV(snitches[].elapsed) is the number of seconds the API call for the snitch took.
+    type: list
+    elements: dict
+    returned: always
+    sample: [
+        {
+            'name': "db-backup",
+            'id': "123456",
+            'status': "healthy",
+            'outcome': "paused",
+            'elapsed': 0.184,
+            'changed': true,
+            'failed': false,
+        },
+    ]
+
+api_calls:
+    description:
+        - The number of pause, unpause, or delete calls that were sent.
+    type: int
+    returned: always
+    sample: 12
+
+elapsed:
+    description:
+        - The number of seconds it took to list the account and apply the action to every selected snitch.
+    type: float
+    returned: always
+    sample: 1.052
+
+api_retries:
+    description:
+        - The number of API requests that were retried, and the total number of seconds spent waiting before retrying.
+    type: dict
+    returned: always
+    sample: {
+        'retries': 1,
+        'wait_seconds': 0.512,
+    }
+
+api_stats:
+    description:
+        - The API requests made by the module, when O(api_stats=true).
+        - RV(api_stats.endpoints) has the totals for each endpoint, and RV(api_stats.requests) has every request in the order they finished.
+    type: dict
+    returned: when O(api_stats=true)
+    sample: {
+        'calls': 3,
+        'cache_hits': 0,
+        'retries': 0,
+        'seconds': 0.48,
+        'bytes': 1412,
+        'endpoints': {
+            'GET /snitches': {'calls': 1, 'seconds': 0.301, 'bytes': 1412, 'errors': 0, 'cache_hits': 0},
+            'POST /snitches/{token}/pause': {'calls': 2, 'seconds': 0.179, 'bytes': 0, 'errors': 0, 'cache_hits': 0},
+        },
+        'requests': [
+            {'method': 'GET', 'endpoint': '/snitches', 'status': 200, 'bytes': 1412, 'latency': 0.301, 'retries': 0, 'cache_hit': false},
+            {'method': 'POST', 'endpoint': '/snitches/{token}/pause', 'status': 204, 'bytes': 0, 'latency': 0.087, 'retries': 0, 'cache_hit': false},
+            {'method': 'POST', 'endpoint': '/snitches/{token}/pause', 'status': 204, 'bytes': 0, 'latency': 0.092, 'retries': 0, 'cache_hit': false},
+        ],
+    }
+"""
+
+from ansible.module_utils.basic import AnsibleModule
+import logging
+import re
+import time
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.concurrency import (
+    run_concurrently,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.module_base import (
+    ModuleBase,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.selectors import (
+    SELECTOR_OPTIONS,
+    SnitchSelector,
+    selector_argument_spec,
+)
+
+logger = logging.getLogger(__name__)
+
+ACTIONS = ["pause", "unpause", "delete"]
+OUTCOMES = dict(pause="paused", unpause="unpaused", delete="deleted")
+
+
+class SnitchActionModule(ModuleBase):
+    def __init__(self, module, client=None):
+        super().__init__(module, client=client)
+        try:
+            self.selector = SnitchSelector.from_params(self.params)
+        except re.error as e:
+            self.module.fail_json(msg=f"name_regex is not a valid regular expression: {e}")
+        self.ids = self.params["ids"]
+
+    def select(self):
+        """
+        Returns the selected snitches, in the order they were listed, and the IDs that were not found
+        """
+        snitches = self.selector.select(self.client.iter_snitches())
+        if self.ids is None:
+            return snitches, []
+        wanted = set(self.ids)
+        snitches = [snitch for snitch in snitches if snitch["token"] in wanted]
+        found = set(snitch["token"] for snitch in snitches)
+        return snitches, [snitch_id for snitch_id in dict.fromkeys(self.ids) if snitch_id not in found]
+
+    def is_needed(self, snitch: dict):
+        """Returns True if the action would change the snitch"""
+        action = self.params["action"]
+        if action == "pause":
+            return snitch.get("status") != "paused"
+        if action == "unpause":
+            return snitch.get("status") == "paused"
+        return True
+
+    def apply(self, snitch: dict):
+        """Sends the API call for the action. Returns the number of seconds it took."""
+        started = time.monotonic()
+        action = self.params["action"]
+        if action == "pause":
+            self.client.pause_snitch(snitch_id=snitch["token"])
+        elif action == "unpause":
+            self.client.unpause_snitch(snitch_id=snitch["token"])
+        else:
+            self.client.delete_snitch(snitch_id=snitch["token"])
+        return time.monotonic() - started
+
+    def run(self):
+        snitches, missing = self.select()
+        to_apply = [snitch for snitch in snitches if self.is_needed(snitch)]
+
+        outcomes = dict()
+        if to_apply and not self.module.check_mode:
+            for task in run_concurrently(self.apply, to_apply, workers=self.params["workers"]):
+                outcomes[task.item["token"]] = task
+
+        needed = set(snitch["token"] for snitch in to_apply)
+        results = []
+        for snitch in snitches:
+            task = outcomes.get(snitch["token"])
+            failed = bool(task and task.failed)
+            item_result = dict(
+                name=snitch["name"],
+                id=snitch["token"],
+                status=snitch.get("status"),
+                outcome=OUTCOMES[self.params["action"]] if snitch["token"] in needed else "skipped",
+                elapsed=round(task.result, 3) if task and not failed else 0.0,
+                changed=snitch["token"] in needed and not failed,
+                failed=failed,
+            )
+            if failed:
+                item_result["outcome"] = "failed"
+                item_result["msg"] = self.format_error(task.error)
+            results.append(item_result)
+
+        for snitch_id in missing:
+            results.append(dict(
+                name=None,
+                id=snitch_id,
+                status=None,
+                outcome="not_found",
+                elapsed=0.0,
+                changed=False,
+                failed=self.params["action"] != "delete",
+            ))
+
+        return results, len(outcomes)
+
+
+def module_spec():
+    # define available arguments/parameters a user can pass to the module
+    module_args = {
+        **ModuleBase.base_argument_spec(),
+        **selector_argument_spec(),
+        **dict(
+            action=dict(type="str", required=True, choices=ACTIONS),
+            ids=dict(type="list", elements="str", required=False),
+            workers=dict(type="int", required=False, default=4),
+        ),
+    }
+
+    return dict(
+        argument_spec=module_args,
+        supports_check_mode=True,
+        required_one_of=[
+            ["ids", *SELECTOR_OPTIONS],
+        ],
+    )
+
+
+def run_module(module, client=None):
+    result = dict(changed=False, snitches=[], api_calls=0, elapsed=0.0)
+    started = time.monotonic()
+
+    action_module = SnitchActionModule(module, client=client)
+    try:
+        result["snitches"], result["api_calls"] = action_module.run()
+    except Exception as e:
+        action_module.handle_exception(e)
+
+    result["elapsed"] = round(time.monotonic() - started, 3)
+    result["changed"] = any(r["changed"] for r in result["snitches"])
+    failed = [r for r in result["snitches"] if r["failed"]]
+    if failed:
+        module.fail_json(
+            msg=f"Failed to {module.params['action']} {len(failed)} of {len(result['snitches'])} snitches",
+            **result,
+            **action_module.client_stats()
+        )
+
+    action_module.exit_json(**result)
+
+
+def main():
+    module = AnsibleModule(**module_spec())
+    with ModuleBase.profiled(module):
+        run_module(module)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.NOTSET)
+    main()
@@ -0,0 +1,274 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2025, mikemorency
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: snitch_bulk
+short_description: Create, update, or delete many Dead Man's Snitches in one task
+description:
+    - Create, update, or delete many Dead Man's Snitches in one task.
+    - The snitches in the account are fetched once, and the changes needed for each item are
+      applied concurrently.
+    - Each item in O(snitches) behaves the same way as the M(mikemorency.deadmanssnitch.snitch) module.
+
+extends_documentation_fragment:
+    - mikemorency.deadmanssnitch.module_base
+
+options:
+    snitches:
+        description:
+            - The snitches to manage.
+            - Each item must specify either O(snitches[].name) or O(snitches[].id).
+            - An item may not target the same snitch as another item.
+        required: true
+        type: list
+        elements: dict
+        suboptions:
+            name:
+                description:
+                    - The name of the snitch to create, or the new name of the snitch if updating.
+                    - This is required when creating a new snitch.
+                required: false
+                type: str
+            id:
+                description:
+                    - The ID of the snitch to update.
+                required: false
+                type: str
+            state:
+                description:
+                    - Controls if the snitch should be 'present' or 'absent'
+                required: false
+                default: present
+                type: str
+                choices: ['present', 'absent']
+            interval:
+                description:
+                    - The interval at which the snitch will be expected to check in.
+                    - This is required when creating a new snitch.
+                required: false
+                type: str
+                choices: [
+                    '1_minute', '2_minute', '3_minute', '5_minute', '10_minute', '15_minute', '30_minute',
+                    'hourly', '2_hour', '3_hour', '4_hour', '6_hour', '8_hour', '12_hour',
+                    'daily', 'weekly', 'monthly'
+                ]
+            alert_type:
+                description:
+                    - The type of alerts the snitch will use.
+                required: false
+                type: str
+                choices: ['basic', 'smart']
+            alert_email:
+                description:
+                    - One or more email addresses to which alerts should be sent.
+                    - This list is absolute. Any existing email addresses on the snitch will be replaced.
+                required: false
+                type: list
+                elements: str
+            notes:
+                description:
+                    - A note to associate with the snitch.
+                required: false
+                type: str
+            tags:
+                description:
+                    - A list of tags to associate with the snitch.
+                required: false
+                type: list
+                elements: str
+    workers:
+        description:
+            - The maximum number of API calls to make at the same time.
+            - The number of pooled connections is set by O(pool_size), so this should not be larger than O(pool_size).
+        required: false
+        default: 4
+        type: int
+"""
+
+EXAMPLES = r"""
+- name: Manage many snitches at once
+  mikemorency.deadmanssnitch.snitch_bulk:
+    workers: 8
+    snitches:
+      - name: backup-db
+        interval: daily
+        tags: [backups]
+      - name: backup-files
+        interval: daily
+        tags: [backups]
+      - name: old-job
+        state: absent
+
+- name: Manage snitches defined in a variable
+  mikemorency.deadmanssnitch.snitch_bulk:
+    snitches: "{{ snitch_definitions }}"
+"""
+
+RETURN = r"""
+results:
+    description:
+        - The outcome for each item in O(snitches), in the same order.
+        - RV(results[].action) is one of V(create), V(update), V(delete), or V(none).
+        - When run in diff mode, items that are changed include a C(diff) key with the fields that
+          change before and after.
+    type: list
+    elements: dict
+    returned: always
+    sample: [
+        {
+            'name': "backup-db",
+            'id': "123456",
+            'state': "present",
+            'action': "create",
+            'changed': true,
+            'failed': false,
+        },
+    ]
+
+api_retries:
+    description:
+        - The number of API requests that were retried, and the total number of seconds spent waiting before retrying.
+    type: dict
+    returned: always
+    sample: {
+        'retries': 1,
+        'wait_seconds': 0.512,
+    }
+
+api_stats:
+    description:
+        - The API requests made by the module, when O(api_stats=true).
+        - RV(api_stats.endpoints) has the totals for each endpoint, and RV(api_stats.requests) has every request in the order they finished.
+    type: dict
+    returned: when O(api_stats=true)
+    sample: {
+        'calls': 3,
+        'cache_hits': 0,
+        'retries': 0,
+        'seconds': 0.538,
+        'bytes': 2235,
+        'endpoints': {
+            'GET /snitches': {'calls': 1, 'seconds': 0.301, 'bytes': 1412, 'errors': 0, 'cache_hits': 0},
+            'PATCH /snitches/{token}': {'calls': 1, 'seconds': 0.111, 'bytes': 418, 'errors': 0, 'cache_hits': 0},
+            'POST /snitches': {'calls': 1, 'seconds': 0.126, 'bytes': 405, 'errors': 0, 'cache_hits': 0},
+        },
+        'requests': [
+            {'method': 'GET', 'endpoint': '/snitches', 'status': 200, 'bytes': 1412, 'latency': 0.301, 'retries': 0, 'cache_hit': false},
+            {'method': 'PATCH', 'endpoint': '/snitches/{token}', 'status': 200, 'bytes': 418, 'latency': 0.111, 'retries': 0, 'cache_hit': false},
+            {'method': 'POST', 'endpoint': '/snitches', 'status': 201, 'bytes': 405, 'latency': 0.126, 'retries': 0, 'cache_hit': false},
+        ],
+    }
+"""
+
+from ansible.module_utils.basic import AnsibleModule
+import logging
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.module_base import (
+    ModuleBase,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.reconcile import (
+    Reconciler,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.snitch import (
+    SnitchModule,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class SnitchBulkModule(ModuleBase):
+    def __init__(self, module, client=None):
+        super().__init__(module, client=client)
+        self.reconciler = Reconciler(module, self.client)
+
+    def validate_items_are_unique(self, snitches_by_name=None):
+        """
+        Fails if more than one item targets the same snitch. If the live snitches are given, names are
+        resolved to IDs first, so an item with the name of a snitch and an item with its ID are caught.
+        """
+        seen = set()
+        for params in self.params["snitches"]:
+            live_snitch = None if params["id"] else (snitches_by_name or dict()).get(params["name"])
+            if params["id"]:
+                key = ("id", params["id"])
+            elif live_snitch:
+                key = ("id", live_snitch["token"])
+            else:
+                key = ("name", params["name"])
+            if key in seen:
+                self.module.fail_json(
+                    msg=f"More than one item in snitches targets the snitch with {key[0]} {key[1]}"
+                )
+            seen.add(key)
+
+    def run(self):
+        self.validate_items_are_unique()
+        self.reconciler.load_live_snitches()
+        self.validate_items_are_unique(self.reconciler.snitches_by_name)
+        changes = [self.reconciler.plan(params) for params in self.params["snitches"]]
+        self.reconciler.apply(changes, workers=self.params["workers"])
+        return [change.result() for change in changes]
+
+
+def module_spec():
+    # define available arguments/parameters a user can pass to the module
+    module_args = {
+        **ModuleBase.base_argument_spec(),
+        **dict(
+            snitches=dict(
+                type="list",
+                elements="dict",
+                required=True,
+                options=SnitchModule.argument_spec(),
+                required_one_of=[
+                    ["name", "id"],
+                ],
+            ),
+            workers=dict(type="int", required=False, default=4),
+        ),
+    }
+
+    return dict(
+        argument_spec=module_args,
+        supports_check_mode=True,
+    )
+
+
+def run_module(module, client=None):
+    result = dict(changed=False, results=[])
+
+    bulk_module = SnitchBulkModule(module, client=client)
+    try:
+        result["results"] = bulk_module.run()
+    except Exception as e:
+        bulk_module.handle_exception(e)
+
+    result["changed"] = any(r["changed"] for r in result["results"])
+    failed = [r for r in result["results"] if r["failed"]]
+    if failed:
+        module.fail_json(
+            msg=f"Failed to apply changes to {len(failed)} of {len(result['results'])} snitches",
+            **result,
+            **bulk_module.client_stats()
+        )
+
+    bulk_module.exit_json(**result)
+
+
+def main():
+    module = AnsibleModule(**module_spec())
+    with ModuleBase.profiled(module):
+        run_module(module)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.NOTSET)
+    main()
@@ -0,0 +1,335 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2025, mikemorency
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: snitch_checkin
+short_description: Check in many snitches in one task
+description:
+    - Checks in snitches, for example at the end of the batch jobs they monitor.
+    - The check-ins are sent concurrently over pooled keep-alive connections, and failed check-ins are retried with
+      the same backoff as API requests.
+    - Check-ins are authorized by the snitch token, so O(api_key) is only needed to look up O(names).
+    - Each snitch is checked in once, even if it is given more than once.
+
+extends_documentation_fragment:
+    - mikemorency.deadmanssnitch.module_base
+
+options:
+    tokens:
+        description:
+            - The tokens of the snitches to check in. The token is the last part of the check-in URL of a snitch, and it
+              is the same as the snitch ID.
+        required: false
+        type: list
+        elements: str
+    names:
+        description:
+            - The names of the snitches to check in.
+            - The names are looked up with one request to list the snitches in the account, which needs O(api_key).
+              The lookup stops as soon as every name is found.
+            - Names that are not in the account are reported as failed in RV(check_ins).
+        required: false
+        type: list
+        elements: str
+    message:
+        description:
+            - A message to send with every check-in, for example a summary of the job output.
+        required: false
+        type: str
+    exit_code:
+        description:
+            - The exit code of the job, which is sent with every check-in.
+            - V(0) reports the job as successful. Any other value reports it as failed, and the snitch alerts.
+        required: false
+        type: int
+    workers:
+        description:
+            - The maximum number of check-ins to send at the same time.
+            - The number of pooled connections is set by O(pool_size), so this should not be larger than O(pool_size).
+        required: false
+        default: 8
+        type: int
+"""
+
+EXAMPLES = r"""
+- name: Check in the snitches of the nightly jobs
+  mikemorency.deadmanssnitch.snitch_checkin:
+    tokens:
+      - c2354d53d2
+      - 9f8e7d6c5b
+
+- name: Report a failed job by name, with a message
+  mikemorency.deadmanssnitch.snitch_checkin:
+    names:
+      - db-backup
+    exit_code: "{{ backup_result.rc }}"
+    message: "{{ backup_result.stderr | default('') | truncate(200) }}"
+
+- name: Check in hundreds of snitches at once
+  mikemorency.deadmanssnitch.snitch_checkin:
+    tokens: "{{ job_tokens }}"
+    workers: 16
+    pool_size: 16
+"""
+
+RETURN = r"""
+check_ins:
+    description:
+        - The outcome of each check-in, in the order the snitches were given, with O(tokens) before O(names).
+        - RV(check_ins[].name) is only set for snitches that were given by name.
+        - RV(check_ins[].status_code) is the status code of the check-in response. It is not set in check mode, or if
+          the check-in failed before a response was received.
+        - RV(check_ins[].elapsed) is the number of seconds the check-in took, including retries.
+    type: list
+    elements: dict
+    returned: always
+    sample: [
+        {
+            'token': "c2354d53d2",
+            'name': "db-backup",
+            'status_code': 202,
+            'elapsed': 0.094,
+            'changed': true,
+            'failed': false,
+        },
+    ]
+
+check_ins_sent:
+    description:
+        - The number of check-ins that were sent to the check-in host. Retries are not counted.
+        - Check-ins are not API calls. The request to look up O(names) is counted in RV(api_stats).
+    type: int
+    returned: always
+    sample: 12
+
+elapsed:
+    description:
+        - The number of seconds it took to look up the names and send every check-in.
+    type: float
+    returned: always
+    sample: 0.352
+
+api_retries:
+    description:
+        - The number of requests that were retried, and the total number of seconds spent waiting before retrying.
+    type: dict
+    returned: always
+    sample: {
+        'retries': 1,
+        'wait_seconds': 0.512,
+    }
+
+api_stats:
+    description:
+        - The requests made by the module, when O(api_stats=true). Check-ins are recorded under the endpoint C(/check_in).
+        - RV(api_stats.endpoints) has the totals for each endpoint, and RV(api_stats.requests) has every request in the order they finished.
+    type: dict
+    returned: when O(api_stats=true)
+    sample: {
+        'calls': 2,
+        'cache_hits': 0,
+        'retries': 0,
+        'seconds': 0.396,
+        'bytes': 1427,
+        'endpoints': {
+            'GET /snitches': {'calls': 1, 'seconds': 0.301, 'bytes': 1412, 'errors': 0, 'cache_hits': 0},
+            'GET /check_in': {'calls': 1, 'seconds': 0.095, 'bytes': 15, 'errors': 0, 'cache_hits': 0},
+        },
+        'requests': [
+            {'method': 'GET', 'endpoint': '/snitches', 'status': 200, 'bytes': 1412, 'latency': 0.301, 'retries': 0, 'cache_hit': false},
+            {'method': 'GET', 'endpoint': '/check_in', 'status': 202, 'bytes': 15, 'latency': 0.095, 'retries': 0, 'cache_hit': false},
+        ],
+    }
+"""
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.basic import missing_required_lib
+import logging
+import time
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.checkin import (
+    CheckInClient,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.module_base import (
+    ModuleBase,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.retry import (
+    RetryPolicy,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.transport import (
+    requests_available,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class SnitchCheckinModule(ModuleBase):
+    def __init__(self, module, client=None):
+        checkin_client = None
+        if client is None and not module.params["names"]:
+            # Only names need the API, so the check-in client is the only client
+            client = checkin_client = self.create_checkin_client(module)
+        super().__init__(module, client=client)
+        if checkin_client is None:
+            # Share the retry policy and recorder, so the retries and stats in the result include the check-ins
+            checkin_client = self.create_checkin_client(module, retry_policy=self.client.retry_policy)
+            checkin_client.recorder = getattr(self.client, "recorder", None)
+        else:
+            checkin_client.recorder = self._create_recorder()
+        self.checkin_client = checkin_client
+
+    @staticmethod
+    def create_checkin_client(module, retry_policy=None):
+        """Creates the client that sends the check-ins"""
+        params = module.params
+        if params["transport"] == "requests" and not requests_available():
+            module.fail_json(msg=missing_required_lib("requests"))
+        if retry_policy is None:
+            retry_policy = RetryPolicy(
+                max_retries=params["max_retries"],
+                backoff=params["retry_backoff"],
+                retry_all_methods=params["retry_all_methods"],
+                deadline=params["deadline"],
+            )
+        return CheckInClient(
+            pool_size=params["pool_size"],
+            timeout=params["timeout"],
+            retry_policy=retry_policy,
+            transport=params["transport"] or "auto",
+        )
+
+    def find_tokens(self, names: list):
+        """Returns the token of each name that is in the account, reading the list only until every name is found"""
+        wanted = set(names)
+        tokens = dict()
+        for snitch in self.client.iter_snitches():
+            if snitch["name"] in wanted and snitch["name"] not in tokens:
+                tokens[snitch["name"]] = snitch["token"]
+                if len(tokens) == len(wanted):
+                    break
+        return tokens
+
+    def plan(self):
+        """
+        Returns the check-ins to send, one for each snitch, and the names that were not found
+        """
+        check_ins = dict()
+        for token in self.params["tokens"] or []:
+            check_ins.setdefault(token, dict(token=token, name=None))
+
+        missing = []
+        names = list(dict.fromkeys(self.params["names"] or []))
+        if names:
+            tokens = self.find_tokens(names)
+            for name in names:
+                if name not in tokens:
+                    missing.append(name)
+                elif tokens[name] in check_ins:
+                    check_ins[tokens[name]]["name"] = name
+                else:
+                    check_ins[tokens[name]] = dict(token=tokens[name], name=name)
+
+        for check_in in check_ins.values():
+            check_in.update(message=self.params["message"], exit_code=self.params["exit_code"])
+        return list(check_ins.values()), missing
+
+    def run(self):
+        check_ins, missing = self.plan()
+
+        outcomes = dict()
+        if check_ins and not self.module.check_mode:
+            for task in self.checkin_client.check_in_many(check_ins, workers=self.params["workers"]):
+                outcomes[task.item["token"]] = task
+
+        results = []
+        for check_in in check_ins:
+            task = outcomes.get(check_in["token"])
+            failed = bool(task and task.failed)
+            item_result = dict(
+                token=check_in["token"],
+                name=check_in["name"],
+                status_code=task.result["status_code"] if task and not failed else None,
+                elapsed=round(task.result["elapsed"], 3) if task and not failed else 0.0,
+                changed=not failed,
+                failed=failed,
+            )
+            if failed:
+                item_result["msg"] = self.format_error(task.error)
+            results.append(item_result)
+
+        for name in missing:
+            results.append(dict(
+                token=None,
+                name=name,
+                status_code=None,
+                elapsed=0.0,
+                changed=False,
+                failed=True,
+                msg=f"Unable to find snitch with name {name}",
+            ))
+
+        return results, len(outcomes)
+
+
+def module_spec():
+    # define available arguments/parameters a user can pass to the module
+    module_args = {
+        **ModuleBase.base_argument_spec(),
+        **dict(
+            tokens=dict(type="list", elements="str", required=False, no_log=False),
+            names=dict(type="list", elements="str", required=False),
+            message=dict(type="str", required=False),
+            exit_code=dict(type="int", required=False),
+            workers=dict(type="int", required=False, default=8),
+        ),
+    }
+
+    return dict(
+        argument_spec=module_args,
+        supports_check_mode=True,
+        required_one_of=[
+            ["tokens", "names"],
+        ],
+    )
+
+
+def run_module(module, client=None):
+    result = dict(changed=False, check_ins=[], check_ins_sent=0, elapsed=0.0)
+    started = time.monotonic()
+
+    checkin_module = SnitchCheckinModule(module, client=client)
+    try:
+        result["check_ins"], result["check_ins_sent"] = checkin_module.run()
+    except Exception as e:
+        checkin_module.handle_exception(e)
+
+    result["elapsed"] = round(time.monotonic() - started, 3)
+    result["changed"] = any(r["changed"] for r in result["check_ins"])
+    failed = [r for r in result["check_ins"] if r["failed"]]
+    if failed:
+        module.fail_json(
+            msg=f"Failed to check in {len(failed)} of {len(result['check_ins'])} snitches",
+            **result,
+            **checkin_module.client_stats()
+        )
+
+    checkin_module.exit_json(**result)
+
+
+def main():
+    module = AnsibleModule(**module_spec())
+    with ModuleBase.profiled(module):
+        run_module(module)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.NOTSET)
+    main()
@@ -17,6 +17,7 @@ description: Looks up information about one or more snitches
 
 extends_documentation_fragment:
     - mikemorency.deadmanssnitch.module_base
+    - mikemorency.deadmanssnitch.snapshot
 
 options:
     name:
@@ -37,41 +38,179 @@ options:
         required: false
         type: list
         elements: str
+
+    names:
+        description:
+            - A list of exact snitch names to lookup.
+            - The results for each name and ID are returned in RV(lookups), in the same order as O(names) followed by O(ids).
+            - Names are found by listing the snitches in the account once.
+        required: false
+        type: list
+        elements: str
+
+    ids:
+        description:
+            - A list of exact snitch IDs to lookup.
+            - If there are no more IDs than O(workers) and O(names) is not set, each snitch is fetched by ID with
+              concurrent requests. Otherwise, the snitches in the account are listed once and the IDs are found in the list.
+              If O(cache_ttl) is set, the list is always used, because it is likely to be cached.
+        required: false
+        type: list
+        elements: str
+
+    workers:
+        description:
+            - The maximum number of requests to send at the same time when looking up O(ids).
+        required: false
+        type: int
+        default: 4
+
+    tag_query:
+        description:
+            - A boolean query on the snitch tags. Tags are combined with V(AND), V(OR), and V(NOT), and can be grouped
+              with parentheses, for example V(prod AND (db OR web\) AND NOT legacy).
+            - V(NOT) binds tighter than V(AND), and V(AND) binds tighter than V(OR). The operators must be upper case.
+            - Tags that contain spaces or parentheses, or that are the same as an operator, can be quoted with double quotes.
+            - The snitches are listed once and the query is answered from a local index, so complex queries do not
+              need extra API calls.
+        required: false
+        type: str
+
+    status:
+        description:
+            - Only return snitches with one of these statuses.
+        required: false
+        type: list
+        elements: str
+        choices: ['pending', 'healthy', 'failed', 'errored', 'missing', 'paused']
+
+    interval:
+        description:
+            - Only return snitches with one of these intervals.
+        required: false
+        type: list
+        elements: str
+        choices: [
+            '1_minute', '2_minute', '3_minute', '5_minute', '10_minute', '15_minute', '30_minute',
+            'hourly', '2_hour', '3_hour', '4_hour', '6_hour', '8_hour', '12_hour',
+            'daily', 'weekly', 'monthly'
+        ]
+
+    alert_type:
+        description:
+            - Only return snitches with one of these alert types.
+        required: false
+        type: list
+        elements: str
+        choices: ['basic', 'smart']
+
+    name_pattern:
+        description:
+            - Only return snitches with a name that matches this regular expression.
+            - The expression can match any part of the name. Use V(^) and V($) to match the whole name.
+        required: false
+        type: str
+
+    fields:
+        description:
+            - Only return these fields for each snitch, for example V(token) and V(name).
+            - Fields that a snitch does not have are returned as null.
+            - This also applies to the snitches in RV(lookups).
+        required: false
+        type: list
+        elements: str
+
+    sort_by:
+        description:
+            - Sort the returned snitches by this field. Snitches without a value for the field are always last.
+            - The field does not need to be in O(fields).
+            - If this is not set, the snitches are returned in the order the API returns them.
+        required: false
+        type: str
+
+    sort_order:
+        description:
+            - The order to sort the snitches in when O(sort_by) is set.
+        required: false
+        type: str
+        default: asc
+        choices: ['asc', 'desc']
+
+    limit:
+        description:
+            - The maximum number of snitches to return.
+            - When listing snitches without O(sort_by), the module stops reading the API response once it has
+              enough snitches.
+        required: false
+        type: int
+
+    offset:
+        description:
+            - The number of snitches to skip before returning any, after sorting.
+        required: false
+        type: int
+        default: 0
+
+    count_only:
+        description:
+            - Only count the matching snitches. The count is returned in RV(count), and RV(snitches) is empty.
+        required: false
+        type: bool
+        default: false
 """
 
 EXAMPLES = r"""
-- name: Ensure tags are present
-  mikemorency.deadmanssnitch.tags:
-    id: 12345
-    state: present
-    tags:
-      - one
-      - two
-      - three
-
-- name: Ensure tags are absent
-  mikemorency.deadmanssnitch.tags:
-    id: 12345
-    state: absent
-    tags:
-      - one
-      - two
-      - three
-
-- name: Replace all tags on snitch with list
-  mikemorency.deadmanssnitch.tags:
-    id: 12345
-    state: absolute
+- name: Get all snitches
+  mikemorency.deadmanssnitch.snitch_info:
+
+- name: Get a snitch by name
+  mikemorency.deadmanssnitch.snitch_info:
+    name: backup-db
+
+- name: Get a snitch by ID
+  mikemorency.deadmanssnitch.snitch_info:
+    id: c2354d53d2
+
+- name: Get snitches with tags
+  mikemorency.deadmanssnitch.snitch_info:
     tags:
-      - one
-      - two
-      - three
-
-- name: Remove all tags
-  mikemorency.deadmanssnitch.tags:
-    id: 12345
-    state: absolute
-    tags: []
+      - production
+
+- name: Lookup several snitches in one task
+  mikemorency.deadmanssnitch.snitch_info:
+    names:
+      - backup-db
+      - backup-files
+    ids:
+      - c2354d53d2
+  register: _lookup
+
+- name: Show the snitches that were not found
+  ansible.builtin.debug:
+    msg: "{{ _lookup.lookups | rejectattr('found') | list }}"
+
+- name: Get the failed production snitches that are not for databases
+  mikemorency.deadmanssnitch.snitch_info:
+    tag_query: production AND NOT (postgres OR mysql)
+    status:
+      - failed
+      - missing
+    name_pattern: ^backup-
+
+- name: Get the names of the ten most recently created snitches
+  mikemorency.deadmanssnitch.snitch_info:
+    fields:
+      - token
+      - name
+    sort_by: created_at
+    sort_order: desc
+    limit: 10
+
+- name: Count the paused snitches
+  mikemorency.deadmanssnitch.snitch_info:
+    status:
+      - paused
+    count_only: true
 """
 
 RETURN = r"""
@@ -94,34 +233,122 @@ snitches:
             'updated_at': "2021-01-01T00:00:00Z",
         }
     ]
+
+count:
+    description:
+        - The number of matching snitches, ignoring O(limit) and O(offset).
+    type: int
+    returned: when O(count_only=true)
+    sample: 42
+
+lookups:
+    description:
+        - The result for each value in O(names) and O(ids), in the order they were given, when either is used.
+        - RV(lookups[].snitch) is null when the snitch was not found.
+        - RV(snitches) has the snitches that were found, in the same order.
+    type: list
+    elements: dict
+    returned: when O(names) or O(ids) is used
+    sample: [
+        {'name': "backup-db", 'found': true, 'snitch': {'token': "123456", 'name': "backup-db"}},
+        {'id': "c2354d53d2", 'found': false, 'snitch': null},
+    ]
+
+strategy:
+    description:
+        - How the snitches in O(names) and O(ids) were looked up. V(list) means the account was listed once, and
+          V(get) means each snitch was fetched by ID.
+    type: str
+    returned: when O(names) or O(ids) is used
+    sample: list
+
+api_retries:
+    description:
+        - The number of API requests that were retried, and the total number of seconds spent waiting before retrying.
+    type: dict
+    returned: always
+    sample: {
+        'retries': 1,
+        'wait_seconds': 0.512,
+    }
+
+api_stats:
+    description:
+        - The API requests made by the module, when O(api_stats=true).
+        - RV(api_stats.endpoints) has the totals for each endpoint, and RV(api_stats.requests) has every request in the order they finished.
+    type: dict
+    returned: when O(api_stats=true)
+    sample: {
+        'calls': 1,
+        'cache_hits': 0,
+        'retries': 0,
+        'seconds': 0.301,
+        'bytes': 1412,
+        'endpoints': {
+            'GET /snitches': {'calls': 1, 'seconds': 0.301, 'bytes': 1412, 'errors': 0, 'cache_hits': 0},
+        },
+        'requests': [
+            {'method': 'GET', 'endpoint': '/snitches', 'status': 200, 'bytes': 1412, 'latency': 0.301, 'retries': 0, 'cache_hit': false},
+        ],
+    }
 """
 from ansible.module_utils.basic import AnsibleModule
 
 import logging
+import re
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.client import (
+    RequestError,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.concurrency import (
+    run_concurrently,
+)
 from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.module_base import (
     ModuleBase,
 )
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.selectors import (
+    STATUS_CHOICES,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.shaping import (
+    ResultShaper,
+    shaping_argument_spec,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.snitch import (
+    INTERVAL_CHOICES,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.snitch_index import (
+    SnitchIndex,
+    TagQueryError,
+    parse_tag_query,
+)
 
 logger = logging.getLogger(__name__)
 
 
 class SnitchInfoModule(ModuleBase):
-    def __init__(self, module):
-        super().__init__(module)
+    READ_ONLY = True
+
+    def __init__(self, module, client=None):
+        super().__init__(module, client=client)
+        self.shaper = ResultShaper.from_params(self.params)
 
     def get_snitch_by_name(self):
         snitches = []
-        for snitch in self.client.list_snitches():
+        for snitch in self.client.iter_snitches():
             if snitch["name"] == self.params["name"]:
                 snitches.append(snitch)
                 break
         return snitches
 
     def get_snitches_by_tags(self):
+        if self.shaper.requested:
+            return self.client.iter_snitches(tags=self.params["tags"])
         snitches = self.client.list_snitches(tags=self.params["tags"])
         return snitches if snitches else []
 
     def get_all_snitches(self):
+        if self.shaper.requested:
+            # The snitches are shaped while the response is read, so the full list is never built
+            return self.client.iter_snitches()
         snitches = self.client.list_snitches()
         return snitches if snitches else []
 
@@ -129,49 +356,167 @@ class SnitchInfoModule(ModuleBase):
         snitch = self.client.get_snitch(snitch_id=self.params["id"])
         return [snitch] if snitch else []
 
+    @property
+    def filters_requested(self):
+        return any(self.params[option] is not None for option in FILTER_OPTIONS)
+
+    def validate_filters(self):
+        """Fails the module before any API calls if the tag query, name pattern, or paging options are invalid"""
+        error = self.shaper.validate()
+        if error:
+            self.module.fail_json(msg=error)
+        if self.params["tag_query"] is not None:
+            try:
+                parse_tag_query(self.params["tag_query"])
+            except TagQueryError as e:
+                self.module.fail_json(msg=f"Invalid tag_query: {e}")
+        if self.params["name_pattern"] is not None:
+            try:
+                re.compile(self.params["name_pattern"])
+            except re.error as e:
+                self.module.fail_json(msg=f"Invalid name_pattern: {e}")
+
+    def get_filtered_snitches(self):
+        """
+        Lists the snitches once, filtered by tags on the API side if they are given, and applies the
+        other filters with a local index
+        """
+        if self.params["tags"]:
+            snitches = self.client.list_snitches(tags=self.params["tags"])
+        else:
+            snitches = self.client.list_snitches()
+        return SnitchIndex(snitches or []).query(
+            tag_query=self.params["tag_query"],
+            status=self.params["status"],
+            interval=self.params["interval"],
+            alert_type=self.params["alert_type"],
+            name_pattern=self.params["name_pattern"],
+        )
+
+    def plan_lookups(self):
+        """
+        Decides how to find the snitches in names and ids. Fetching a few IDs concurrently is faster
+        than listing a large account, but names can only be found in the list, and a cached list
+        costs nothing.
+        """
+        if self.params["names"] or self.client.cache:
+            return "list"
+        if len(set(self.params["ids"])) <= self.params["workers"]:
+            return "get"
+        return "list"
+
+    def _get_snitch_or_none(self, snitch_id):
+        try:
+            return self.client.get_snitch(snitch_id=snitch_id)
+        except RequestError as e:
+            if getattr(getattr(e.exception, "response", None), "status_code", None) == 404:
+                return None
+            raise
+
+    def lookup_many(self, strategy):
+        """
+        Returns a lookup result for every name and ID, in the order they were given
+        """
+        names = self.params["names"] or []
+        ids = self.params["ids"] or []
+        by_name, by_id = dict(), dict()
+        if strategy == "list":
+            for snitch in self.client.list_snitches() or []:
+                by_name.setdefault(snitch["name"], snitch)
+                by_id[snitch["token"]] = snitch
+        else:
+            unique_ids = list(dict.fromkeys(ids))
+            for task in run_concurrently(self._get_snitch_or_none, unique_ids, workers=self.params["workers"]):
+                if task.failed:
+                    raise task.error
+                by_id[task.item] = task.result
+
+        lookups = [dict(name=name, found=name in by_name, snitch=by_name.get(name)) for name in names]
+        lookups += [dict(id=snitch_id, found=by_id.get(snitch_id) is not None, snitch=by_id.get(snitch_id))
+                    for snitch_id in ids]
+        return lookups
+
+
+FILTER_OPTIONS = ["tag_query", "status", "interval", "alert_type", "name_pattern"]
+
 
-def run_module():
+def module_spec():
     # define available arguments/parameters a user can pass to the module
     module_args = {
         **ModuleBase.base_argument_spec(),
+        **ModuleBase.snapshot_argument_spec(),
         **dict(
             name=dict(type="str", required=False),
             id=dict(type="str", required=False),
             tags=dict(type="list", elements="str", required=False),
+            names=dict(type="list", elements="str", required=False),
+            ids=dict(type="list", elements="str", required=False),
+            workers=dict(type="int", required=False, default=4),
+            tag_query=dict(type="str", required=False),
+            status=dict(type="list", elements="str", required=False, choices=STATUS_CHOICES),
+            interval=dict(type="list", elements="str", required=False, choices=INTERVAL_CHOICES),
+            alert_type=dict(type="list", elements="str", required=False, choices=["basic", "smart"]),
+            name_pattern=dict(type="str", required=False),
+            **shaping_argument_spec()
         ),
     }
 
-    # seed the result dict in the object
-    result = dict(changed=False, snitches=[])
-
-    module = AnsibleModule(
+    return dict(
         argument_spec=module_args,
         supports_check_mode=True,
-        mutually_exclusive=[("name", "id", "tags")],
+        mutually_exclusive=[("name", "id", "tags", "names"), ("name", "id", "tags", "ids")] + [
+            (lookup, option) for lookup in ("name", "id", "names", "ids") for option in FILTER_OPTIONS
+        ],
     )
-    snitch_info = SnitchInfoModule(module)
+
+
+def run_module(module, client=None):
+    # seed the result dict in the object
+    result = dict(changed=False, snitches=[])
+
+    snitch_info = SnitchInfoModule(module, client=client)
+    snitch_info.validate_filters()
 
     try:
-        if module.params["name"]:
-            result["snitches"] = snitch_info.get_snitch_by_name()
+        if snitch_info.filters_requested:
+            snitches = snitch_info.get_filtered_snitches()
+        elif module.params["names"] is not None or module.params["ids"] is not None:
+            result["strategy"] = snitch_info.plan_lookups()
+            result["lookups"] = snitch_info.lookup_many(result["strategy"])
+            # The full snitches are shaped below, so they can be sorted by a field that is not returned
+            snitches = [lookup["snitch"] for lookup in result["lookups"] if lookup["found"]]
+            for lookup in result["lookups"]:
+                lookup["snitch"] = snitch_info.shaper.project(lookup["snitch"])
+        elif module.params["name"]:
+            snitches = snitch_info.get_snitch_by_name()
         elif module.params["id"]:
-            result["snitches"] = snitch_info.get_snitch_by_id()
+            snitches = snitch_info.get_snitch_by_id()
         elif module.params["tags"]:
-            result["snitches"] = snitch_info.get_snitches_by_tags()
+            snitches = snitch_info.get_snitches_by_tags()
+        else:
+            snitches = snitch_info.get_all_snitches()
+
+        if snitch_info.shaper.count_only:
+            result["count"] = snitch_info.shaper.count(snitches)
+        elif snitch_info.shaper.requested:
+            result["snitches"] = snitch_info.shaper.shape(snitches)
         else:
-            result["snitches"] = snitch_info.get_all_snitches()
+            result["snitches"] = snitches
     except Exception as e:
         module.fail_json(
             msg=f"Failed to get snitches: {e}",
-            error_type=type(e),
+            error_type=type(e).__name__,
             error_message=str(e),
+            **snitch_info.client_stats()
         )
 
-    module.exit_json(**result)
+    snitch_info.exit_json(**result)
 
 
 def main():
-    run_module()
+    module = AnsibleModule(**module_spec())
+    with ModuleBase.profiled(module):
+        run_module(module)
 
 
 if __name__ == "__main__":
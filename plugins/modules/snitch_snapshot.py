@@ -0,0 +1,194 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2025, mikemorency
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: snitch_snapshot
+short_description: Save every snitch in the account to a snapshot file
+description:
+    - Saves every snitch in the account to a snapshot file, as a point in time backup of the account.
+    - The snitches are streamed from the API to a gzip compressed JSON lines file, with one snitch per line.
+      An index of the snitch tokens and names is written next to it, with the same path and an C(.index) suffix.
+    - The snapshot can be used with the O(mikemorency.deadmanssnitch.snitch#module:snapshot_path) option of the
+      M(mikemorency.deadmanssnitch.snitch), M(mikemorency.deadmanssnitch.tags), and
+      M(mikemorency.deadmanssnitch.snitch_info) modules, so they read snitches from the file instead of the API.
+    - The files are replaced atomically, so tasks reading an older snapshot are not affected while it is written.
+    - If the snitches are the same as in the existing snapshot, the files are not replaced and the module reports no
+      change. In check mode, nothing is read or written and the module always reports a change.
+
+extends_documentation_fragment:
+    - mikemorency.deadmanssnitch.module_base
+
+options:
+    path:
+        description:
+            - The path to write the snapshot to.
+            - The directory must already exist.
+        required: true
+        type: path
+
+    tags:
+        description:
+            - Only save snitches that have all of these tags.
+        required: false
+        type: list
+        elements: str
+"""
+
+EXAMPLES = r"""
+- name: Save a snapshot of the account
+  mikemorency.deadmanssnitch.snitch_snapshot:
+    path: /var/backups/snitches.jsonl.gz
+
+- name: Check the snitches against the snapshot, without any API calls
+  mikemorency.deadmanssnitch.snitch:
+    name: "{{ item.name }}"
+    interval: "{{ item.interval }}"
+    snapshot_path: /var/backups/snitches.jsonl.gz
+  check_mode: true
+  loop: "{{ snitches }}"
+"""
+
+RETURN = r"""
+path:
+    description:
+        - The path of the snapshot.
+    type: str
+    returned: always
+    sample: /var/backups/snitches.jsonl.gz
+
+index_path:
+    description:
+        - The path of the snapshot index.
+    type: str
+    returned: always
+    sample: /var/backups/snitches.jsonl.gz.index
+
+count:
+    description:
+        - The number of snitches saved in the snapshot.
+    type: int
+    returned: when not in check mode
+    sample: 1200
+
+created_at:
+    description:
+        - The time the snapshot was started, in UTC.
+        - If the existing snapshot was kept because nothing changed, this is the time that snapshot was started.
+    type: str
+    returned: when not in check mode
+    sample: "2025-01-01T00:00:00Z"
+
+api_retries:
+    description:
+        - The number of API requests that were retried, and the total number of seconds spent waiting before retrying.
+    type: dict
+    returned: always
+    sample: {
+        'retries': 1,
+        'wait_seconds': 0.512,
+    }
+
+api_stats:
+    description:
+        - The API requests made by the module, when O(api_stats=true).
+        - RV(api_stats.endpoints) has the totals for each endpoint, and RV(api_stats.requests) has every request in the order they finished.
+    type: dict
+    returned: when O(api_stats=true)
+    sample: {
+        'calls': 1,
+        'cache_hits': 0,
+        'retries': 0,
+        'seconds': 1.204,
+        'bytes': 48213,
+        'endpoints': {
+            'GET /snitches': {'calls': 1, 'seconds': 1.204, 'bytes': 48213, 'errors': 0, 'cache_hits': 0},
+        },
+        'requests': [
+            {'method': 'GET', 'endpoint': '/snitches', 'status': 200, 'bytes': 48213, 'latency': 1.204, 'retries': 0, 'cache_hit': false},
+        ],
+    }
+"""
+
+from ansible.module_utils.basic import AnsibleModule
+
+import logging
+import os
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.module_base import (
+    ModuleBase,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.snapshot import (
+    index_path,
+    write_snapshot,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class SnitchSnapshotModule(ModuleBase):
+    def __init__(self, module, client=None):
+        super().__init__(module, client=client)
+        self.path = self.params["path"]
+
+    def validate_path(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        if not os.path.isdir(directory):
+            self.module.fail_json(msg=f"The directory for the snapshot does not exist: {directory}")
+
+    def save(self):
+        """
+        Streams the snitches from the API into the snapshot. Returns the index, and True if the
+        snapshot changed.
+        """
+        return write_snapshot(self.path, self.client.iter_snitches(tags=self.params["tags"]))
+
+
+def module_spec():
+    # define available arguments/parameters a user can pass to the module
+    module_args = {
+        **ModuleBase.base_argument_spec(),
+        **dict(
+            path=dict(type="path", required=True),
+            tags=dict(type="list", elements="str", required=False),
+        ),
+    }
+
+    return dict(
+        argument_spec=module_args,
+        supports_check_mode=True,
+    )
+
+
+def run_module(module, client=None):
+    snapshot = SnitchSnapshotModule(module, client=client)
+    snapshot.validate_path()
+    result = dict(changed=True, path=snapshot.path, index_path=index_path(snapshot.path))
+
+    if not module.check_mode:
+        try:
+            index, result["changed"] = snapshot.save()
+        except Exception as e:
+            snapshot.handle_exception(e)
+        result["count"] = index["count"]
+        result["created_at"] = index["created_at"]
+
+    snapshot.exit_json(**result)
+
+
+def main():
+    module = AnsibleModule(**module_spec())
+    with ModuleBase.profiled(module):
+        run_module(module)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.NOTSET)
+    main()
@@ -0,0 +1,480 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2025, mikemorency
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: snitch_sync
+short_description: Make the snitches in an account match a declared list
+description:
+    - Makes the snitches in an account match a declared list of snitches.
+    - The snitches in the account are listed once, and each declared snitch is matched to a live snitch by name.
+      Snitches that do not exist are created, and snitches that differ are updated. The changes are applied concurrently.
+    - If O(prune=true), live snitches that are not declared are deleted.
+    - Use O(owner_tag) to share an account with snitches that are not managed by this task.
+
+extends_documentation_fragment:
+    - mikemorency.deadmanssnitch.module_base
+
+options:
+    snitches:
+        description:
+            - Every snitch that should exist.
+            - Each name may only be declared once.
+        required: true
+        type: list
+        elements: dict
+        suboptions:
+            name:
+                description:
+                    - The name of the snitch. Snitches are matched to the live snitches by name.
+                required: true
+                type: str
+            interval:
+                description:
+                    - The interval at which the snitch will be expected to check in.
+                    - This is required when creating a new snitch.
+                required: false
+                type: str
+                choices: [
+                    '1_minute', '2_minute', '3_minute', '5_minute', '10_minute', '15_minute', '30_minute',
+                    'hourly', '2_hour', '3_hour', '4_hour', '6_hour', '8_hour', '12_hour',
+                    'daily', 'weekly', 'monthly'
+                ]
+            alert_type:
+                description:
+                    - The type of alerts the snitch will use.
+                required: false
+                type: str
+                choices: ['basic', 'smart']
+            alert_email:
+                description:
+                    - One or more email addresses to which alerts should be sent.
+                    - This list is absolute. Any existing email addresses on the snitch will be replaced.
+                required: false
+                type: list
+                elements: str
+            notes:
+                description:
+                    - A note to associate with the snitch.
+                required: false
+                type: str
+            tags:
+                description:
+                    - A list of tags to associate with the snitch.
+                    - If O(owner_tag) is set, it is added to this list.
+                required: false
+                type: list
+                elements: str
+    owner_tag:
+        description:
+            - A tag that marks the snitches managed by this task.
+            - The tag is added to every declared snitch, including live snitches that are adopted because they have a
+              declared name.
+            - If this is set, only live snitches with the tag are deleted by O(prune).
+        required: false
+        type: str
+    prune:
+        description:
+            - Delete live snitches that are not declared in O(snitches).
+            - If O(owner_tag) is set, only snitches with that tag are deleted. Otherwise, every snitch in the account
+              that is not declared is deleted.
+            - If more than one live snitch has the name of a declared snitch, the first one listed is managed and the
+              others are not deleted. A warning is shown for each of them.
+        required: false
+        default: false
+        type: bool
+    max_delete:
+        description:
+            - The maximum number of snitches that may be deleted.
+            - If more snitches would be deleted, the module fails before making any changes.
+              With O(plan_only=true), a warning is shown instead.
+        required: false
+        type: int
+    plan_only:
+        description:
+            - Only plan the changes. The planned changes and API calls are returned in RV(plan) and RV(results),
+              and no changes are made.
+            - Unlike check mode, RV(changed) is V(false) because nothing was changed.
+        required: false
+        default: false
+        type: bool
+    state_file:
+        description:
+            - The path to a file that stores the state of the managed snitches between runs. This enables incremental
+              mode.
+            - After each run, the file records the C(updated_at) timestamp of each managed snitch, a hash of its
+              declared state, and its fields. On the next run, snitches with the same C(updated_at) and declared
+              state are not compared again, so the work done is proportional to the number of snitches that changed.
+            - Snitches that were changed or deleted outside of Ansible since the last run are returned in RV(drift).
+            - The file is not written in check mode or when O(plan_only=true). A file for a different account is ignored.
+            - The file is tied to the account of O(api_key), so O(api_key) must be set, even when the module is run with
+              the C(ansible.netcommon.httpapi) connection.
+        required: false
+        type: path
+    workers:
+        description:
+            - The maximum number of API calls to make at the same time.
+            - The number of pooled connections is set by O(pool_size), so this should not be larger than O(pool_size).
+        required: false
+        default: 4
+        type: int
+"""
+
+EXAMPLES = r"""
+- name: Manage every snitch tagged with ansible
+  mikemorency.deadmanssnitch.snitch_sync:
+    owner_tag: ansible
+    prune: true
+    max_delete: 10
+    snitches:
+      - name: backup-db
+        interval: daily
+        tags: [backups]
+      - name: backup-files
+        interval: daily
+        tags: [backups]
+
+- name: Show the API calls that a sync would make
+  mikemorency.deadmanssnitch.snitch_sync:
+    snitches: "{{ snitch_definitions }}"
+    prune: true
+    plan_only: true
+  register: _plan
+
+- name: Nightly compliance run that only compares snitches that changed
+  mikemorency.deadmanssnitch.snitch_sync:
+    snitches: "{{ snitch_definitions }}"
+    owner_tag: ansible
+    state_file: /var/lib/ansible/snitch-sync.json
+  register: _sync
+
+- name: Show the changes made outside of Ansible
+  ansible.builtin.debug:
+    var: _sync.drift
+"""
+
+RETURN = r"""
+plan:
+    description:
+        - The number of snitches that need each action, and the number of API calls needed to apply them.
+        - RV(plan.api_calls) does not include the call that lists the snitches in the account.
+        - RV(plan.skipped) is the number of unchanged snitches that were not compared, because they had not changed
+          since the last run. It is only returned when O(state_file) is set.
+    type: dict
+    returned: always
+    sample: {
+        'create': 1,
+        'update': 2,
+        'delete': 1,
+        'unchanged': 40,
+        'skipped': 38,
+        'api_calls': 4,
+    }
+
+drift:
+    description:
+        - The managed snitches that were changed or deleted outside of Ansible since the last run.
+        - RV(drift[].change) is V(modified) or V(deleted). For modified snitches, RV(drift[].fields) has the
+          value of each changed field after the last run and now.
+        - Modified snitches are updated to their declared state by this run, unless they are not declared anymore.
+    type: list
+    elements: dict
+    returned: when O(state_file) is set
+    sample: [
+        {
+            'id': "123456",
+            'name': "backup-db",
+            'change': "modified",
+            'updated_at': "2025-01-02T00:00:00.000Z",
+            'fields': {'interval': {'before': "daily", 'after': "hourly"}},
+        },
+    ]
+
+results:
+    description:
+        - The outcome for each declared snitch, in the same order, followed by the snitches that are deleted.
+        - RV(results[].action) is one of V(create), V(update), V(delete), or V(none).
+        - When run in diff mode, snitches that are changed include a C(diff) key with the fields that
+          change before and after.
+    type: list
+    elements: dict
+    returned: always
+    sample: [
+        {
+            'name': "backup-db",
+            'id': "123456",
+            'state': "present",
+            'action': "create",
+            'changed': true,
+            'failed': false,
+        },
+        {
+            'name': "old-job",
+            'id': "789012",
+            'state': "absent",
+            'action': "delete",
+            'changed': true,
+            'failed': false,
+        },
+    ]
+
+api_retries:
+    description:
+        - The number of API requests that were retried, and the total number of seconds spent waiting before retrying.
+    type: dict
+    returned: always
+    sample: {
+        'retries': 1,
+        'wait_seconds': 0.512,
+    }
+
+api_stats:
+    description:
+        - The API requests made by the module, when O(api_stats=true).
+        - RV(api_stats.endpoints) has the totals for each endpoint, and RV(api_stats.requests) has every request in the order they finished.
+    type: dict
+    returned: when O(api_stats=true)
+    sample: {
+        'calls': 3,
+        'cache_hits': 0,
+        'retries': 0,
+        'seconds': 0.505,
+        'bytes': 1830,
+        'endpoints': {
+            'GET /snitches': {'calls': 1, 'seconds': 0.301, 'bytes': 1412, 'errors': 0, 'cache_hits': 0},
+            'PATCH /snitches/{token}': {'calls': 1, 'seconds': 0.111, 'bytes': 418, 'errors': 0, 'cache_hits': 0},
+            'DELETE /snitches/{token}': {'calls': 1, 'seconds': 0.093, 'bytes': 0, 'errors': 0, 'cache_hits': 0},
+        },
+        'requests': [
+            {'method': 'GET', 'endpoint': '/snitches', 'status': 200, 'bytes': 1412, 'latency': 0.301, 'retries': 0, 'cache_hit': false},
+            {'method': 'PATCH', 'endpoint': '/snitches/{token}', 'status': 200, 'bytes': 418, 'latency': 0.111, 'retries': 0, 'cache_hit': false},
+            {'method': 'DELETE', 'endpoint': '/snitches/{token}', 'status': 204, 'bytes': 0, 'latency': 0.093, 'retries': 0, 'cache_hit': false},
+        ],
+    }
+"""
+
+from ansible.module_utils.basic import AnsibleModule
+import logging
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.drift import (
+    DriftState,
+    account_fingerprint,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.module_base import (
+    ModuleBase,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.reconcile import (
+    Reconciler,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.snitch import (
+    SnitchModule,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class SnitchSyncModule(ModuleBase):
+    def __init__(self, module, client=None):
+        super().__init__(module, client=client)
+        self.reconciler = Reconciler(module, self.client)
+        self.drift_state = None
+        if self.params["state_file"]:
+            if not self.params["api_key"]:
+                # The httpapi connection does not share its API key, so the account of the state file is not known
+                self.module.fail_json(msg="state_file requires api_key, so the state file can be tied to the account")
+            self.drift_state = DriftState(self.params["state_file"], account_fingerprint(self.params["api_key"]))
+
+    def validate_names_are_unique(self):
+        seen = set()
+        for params in self.params["snitches"]:
+            if params["name"] in seen:
+                self.module.fail_json(msg=f"The snitch {params['name']} is declared more than once")
+            seen.add(params["name"])
+
+    def desired_params(self, params: dict):
+        """
+        Returns the params for a declared snitch in the shape used by SnitchModule, with the owner tag added
+        """
+        desired = dict(params, id=None, state="present")
+        owner_tag = self.params["owner_tag"]
+        if owner_tag:
+            tags = params["tags"]
+            if tags is None:
+                live_snitch = self.reconciler.snitches_by_name.get(params["name"]) or dict()
+                tags = live_snitch.get("tags") or []
+            if owner_tag not in tags:
+                tags = list(tags) + [owner_tag]
+            desired["tags"] = tags
+        return desired
+
+    def is_owned(self, snitch: dict):
+        owner_tag = self.params["owner_tag"]
+        return not owner_tag or owner_tag in (snitch.get("tags") or [])
+
+    def plan(self):
+        """
+        Returns the changes for the declared snitches, followed by the deletes if prune is enabled
+        """
+        self.reconciler.load_live_snitches()
+        changes = [self.plan_declared(self.desired_params(params)) for params in self.params["snitches"]]
+        if self.params["prune"]:
+            declared = set(change.id for change in changes if change.id)
+            declared_names = set(params["name"] for params in self.params["snitches"])
+            for token, snitch in self.reconciler.snitches_by_token.items():
+                if token in declared or not self.is_owned(snitch):
+                    continue
+                if snitch["name"] in declared_names:
+                    # Another live snitch with the same name was matched to the declared snitch, so this one
+                    # may be the snitch the user meant to keep
+                    self.module.warn(
+                        f"The snitch {snitch['name']} ({token}) was not deleted, because more than one live snitch "
+                        "has that name. Rename or delete the duplicate snitches."
+                    )
+                    continue
+                changes.append(self.reconciler.plan_delete(snitch))
+        return changes
+
+    def plan_declared(self, params: dict):
+        """
+        Plans the change for a declared snitch. In incremental mode, snitches that have not changed since
+        the last run are not compared.
+        """
+        live_snitch = self.reconciler.snitches_by_name.get(params["name"])
+        if live_snitch and self.drift_state and self.drift_state.is_unchanged(live_snitch, params):
+            return self.reconciler.unchanged(params, live_snitch)
+        return self.reconciler.plan(params)
+
+    def summarize(self, changes):
+        summary = dict(create=0, update=0, delete=0, unchanged=0, api_calls=0)
+        if self.drift_state:
+            summary["skipped"] = 0
+        for change in changes:
+            summary["unchanged" if change.action == "none" else change.action] += 1
+            summary["api_calls"] += change.api_calls
+            if change.skipped:
+                summary["skipped"] += 1
+        return summary
+
+    def drift_report(self):
+        return self.drift_state.report(self.reconciler.snitches_by_token)
+
+    def save_drift_state(self, changes):
+        """
+        Records the state of every declared snitch that is now in its declared state. Snitches that were
+        deleted or are not declared anymore are forgotten, and snitches that failed keep their state from
+        the last run.
+        """
+        declared = set()
+        for change in changes:
+            if change.action == "delete":
+                if change.error is None:
+                    self.drift_state.forget(change.id)
+                continue
+            declared.add(change.id)
+            if change.error is None:
+                self.drift_state.record(change.item.live_snitch, change.item.params)
+        for token in list(self.drift_state.snitches):
+            if token not in declared:
+                self.drift_state.forget(token)
+
+        self.drift_state.advance(self.reconciler.snitches_by_token.values())
+        self.drift_state.advance(change.item.live_snitch for change in changes
+                                 if change.action in ("create", "update") and change.error is None)
+        self.drift_state.save()
+
+    def check_delete_limit(self, summary):
+        max_delete = self.params["max_delete"]
+        if max_delete is None or summary["delete"] <= max_delete:
+            return
+        msg = f"{summary['delete']} snitches would be deleted, which is more than max_delete ({max_delete})"
+        if self.params["plan_only"]:
+            self.module.warn(msg)
+        else:
+            self.module.fail_json(msg=msg, plan=summary, **self.client_stats())
+
+    def apply(self, changes):
+        """Applies the changes, unless only a plan was requested. Returns the result for each change."""
+        if not self.params["plan_only"]:
+            self.reconciler.apply(changes, workers=self.params["workers"])
+        results = [change.result() for change in changes]
+        if self.params["plan_only"]:
+            for item_result in results:
+                item_result["changed"] = False
+        return results
+
+
+def module_spec():
+    # define available arguments/parameters a user can pass to the module
+    snitch_options = SnitchModule.argument_spec()
+    del snitch_options["id"]
+    del snitch_options["state"]
+    snitch_options["name"] = dict(type="str", required=True)
+
+    module_args = {
+        **ModuleBase.base_argument_spec(),
+        **dict(
+            snitches=dict(type="list", elements="dict", required=True, options=snitch_options),
+            owner_tag=dict(type="str", required=False),
+            prune=dict(type="bool", required=False, default=False),
+            max_delete=dict(type="int", required=False),
+            plan_only=dict(type="bool", required=False, default=False),
+            state_file=dict(type="path", required=False),
+            workers=dict(type="int", required=False, default=4),
+        ),
+    }
+
+    return dict(
+        argument_spec=module_args,
+        supports_check_mode=True,
+    )
+
+
+def run_module(module, client=None):
+    result = dict(changed=False, plan=dict(), results=[])
+
+    sync_module = SnitchSyncModule(module, client=client)
+    sync_module.validate_names_are_unique()
+    try:
+        changes = sync_module.plan()
+    except Exception as e:
+        sync_module.handle_exception(e)
+
+    result["plan"] = sync_module.summarize(changes)
+    if sync_module.drift_state:
+        result["drift"] = sync_module.drift_report()
+    sync_module.check_delete_limit(result["plan"])
+    try:
+        result["results"] = sync_module.apply(changes)
+        if sync_module.drift_state and not module.check_mode and not module.params["plan_only"]:
+            sync_module.save_drift_state(changes)
+    except Exception as e:
+        sync_module.handle_exception(e)
+
+    result["changed"] = any(r["changed"] for r in result["results"])
+    failed = [r for r in result["results"] if r["failed"]]
+    if failed:
+        module.fail_json(
+            msg=f"Failed to apply changes to {len(failed)} of {len(result['results'])} snitches",
+            **result,
+            **sync_module.client_stats()
+        )
+
+    sync_module.exit_json(**result)
+
+
+def main():
+    module = AnsibleModule(**module_spec())
+    with ModuleBase.profiled(module):
+        run_module(module)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.NOTSET)
+    main()
@@ -17,21 +17,47 @@ description: Add, update, or delete tags on a snitch
 
 extends_documentation_fragment:
     - mikemorency.deadmanssnitch.module_base
+    - mikemorency.deadmanssnitch.snapshot
 
 options:
     name:
         description:
-            - The name of the snitch to create, or the new name of the snitch if updating.
-            - Either O(name) or O(id) must be specified.
-            - This is required when creating a new snitch.
+            - The name of the snitch to update.
+            - One of O(name), O(id), O(match_tags), O(name_regex), or O(status) must be specified.
         required: false
         type: str
     id:
         description:
             - The ID of the snitch to update.
-            - Either O(name) or O(id) must be specified.
+            - One of O(name), O(id), O(match_tags), O(name_regex), or O(status) must be specified.
         required: false
         type: str
+    match_tags:
+        description:
+            - Update every snitch that has all of these tags.
+            - The selector options O(match_tags), O(name_regex), and O(status) can be combined. A snitch
+              is only updated if it matches all of the options that are set.
+            - The account is listed once and the snitches are selected locally, so any number of snitches
+              can be updated in a single task.
+            - Cannot be used with O(name) or O(id).
+        required: false
+        type: list
+        elements: str
+    name_regex:
+        description:
+            - Update every snitch with a name that matches this regular expression.
+            - The expression may match any part of the name. Use C(^) and C($) to match the whole name.
+            - Cannot be used with O(name) or O(id).
+        required: false
+        type: str
+    status:
+        description:
+            - Update every snitch with one of these statuses.
+            - Cannot be used with O(name) or O(id).
+        required: false
+        type: list
+        elements: str
+        choices: ['pending', 'healthy', 'failed', 'errored', 'missing', 'paused']
     tags:
         description:
             - A list of tags to modify on the snitch
@@ -49,9 +75,43 @@ options:
         default: present
         type: str
         choices: ['present', 'absent', 'absolute']
+    strategy:
+        description:
+            - How the tag changes are sent to the API.
+            - If V(per_tag), missing tags are added with one request and each tag that needs to be removed
+              is deleted with its own request. The removals are sent concurrently.
+            - If V(replace), the full list of tags is set with one request. Any tags added to the snitch by
+              someone else between reading and updating the snitch are lost.
+            - If V(auto), V(replace) is used when it needs fewer requests than V(per_tag).
+        required: false
+        default: auto
+        type: str
+        choices: ['auto', 'per_tag', 'replace']
+    workers:
+        description:
+            - The maximum number of requests to send at the same time.
+            - When snitches are selected with O(match_tags), O(name_regex), or O(status), this is the number
+              of snitches that are updated at the same time.
+            - The number of pooled connections is set by O(pool_size), so this should not be larger than O(pool_size).
+        required: false
+        default: 4
+        type: int
 """
 
 EXAMPLES = r"""
+- name: Mark every failed production snitch for triage
+  mikemorency.deadmanssnitch.tags:
+    match_tags: [production]
+    status: [failed, errored]
+    tags: [triage]
+    workers: 8
+
+- name: Remove a retired tag from every backup snitch
+  mikemorency.deadmanssnitch.tags:
+    name_regex: "^backup-"
+    tags: [legacy]
+    state: absent
+
 - name: Create a new alert policy
   alert_policy:
     name: foo
@@ -72,56 +132,144 @@ snitch:
     description:
         - Identification for the affected snitch.
     type: dict
-    returned: always
+    returned: when O(name) or O(id) is used
     sample: {
         'id': "123456",
         'name': "my-snitch",
     }
 
-old_tags:
+old:
     description:
         - The tags on the snitch before the module was run.
     type: list
-    returned: always
+    returned: changed
     sample: [
         "1",
         "2",
         "3"
     ]
 
-new_tags:
+new:
     description:
         - The tags on the snitch after the module was run.
     type: list
-    returned: always
+    returned: changed
     sample: [
         "1",
         "2",
         "3"
     ]
+
+strategy:
+    description:
+        - The strategy that was used to change the tags. This is never V(auto).
+    type: str
+    returned: when O(name) or O(id) is used
+    sample: replace
+
+snitches:
+    description:
+        - The outcome for each selected snitch, when O(match_tags), O(name_regex), or O(status) is used.
+        - RV(snitches[].old) and RV(snitches[].new) are the tags before and after the module was run.
+    type: list
+    elements: dict
+    returned: when O(match_tags), O(name_regex), or O(status) is used
+    sample: [
+        {
+            'name': "backup-db",
+            'id': "123456",
+            'old': ["production"],
+            'new': ["production", "triage"],
+            'strategy': "per_tag",
+            'api_calls': 1,
+            'changed': true,
+            'failed': false,
+        },
+    ]
+
+api_calls:
+    description:
+        - The number of API requests that were made to change the tags. This does not include looking up the snitches.
+        - In check mode, this is the number of API requests that would be made.
+    type: int
+    returned: always
+    sample: 1
+
+api_retries:
+    description:
+        - The number of API requests that were retried, and the total number of seconds spent waiting before retrying.
+    type: dict
+    returned: always
+    sample: {
+        'retries': 1,
+        'wait_seconds': 0.512,
+    }
+
+api_stats:
+    description:
+        - The API requests made by the module, when O(api_stats=true).
+        - RV(api_stats.endpoints) has the totals for each endpoint, and RV(api_stats.requests) has every request in the order they finished.
+    type: dict
+    returned: when O(api_stats=true)
+    sample: {
+        'calls': 2,
+        'cache_hits': 0,
+        'retries': 0,
+        'seconds': 0.202,
+        'bytes': 440,
+        'endpoints': {
+            'GET /snitches/{token}': {'calls': 1, 'seconds': 0.098, 'bytes': 402, 'errors': 0, 'cache_hits': 0},
+            'POST /snitches/{token}/tags': {'calls': 1, 'seconds': 0.104, 'bytes': 38, 'errors': 0, 'cache_hits': 0},
+        },
+        'requests': [
+            {'method': 'GET', 'endpoint': '/snitches/{token}', 'status': 200, 'bytes': 402, 'latency': 0.098, 'retries': 0, 'cache_hit': false},
+            {'method': 'POST', 'endpoint': '/snitches/{token}/tags', 'status': 200, 'bytes': 38, 'latency': 0.104, 'retries': 0, 'cache_hit': false},
+        ],
+    }
 """
 
 from ansible.module_utils.basic import AnsibleModule
 import logging
+import re
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.concurrency import (
+    run_concurrently,
+)
 from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.module_base import (
     ModuleBase,
 )
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.selectors import (
+    SELECTOR_OPTIONS,
+    SnitchSelector,
+    selector_argument_spec,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.tags import (
+    TAG_STATES,
+    TAG_STRATEGIES,
+    TagPlan,
+    desired_tags,
+)
 
 logger = logging.getLogger(__name__)
 
 
 class TagsModule(ModuleBase):
-    def __init__(self, module):
-        super().__init__(module)
-        self._lookup_live_snitch()
-        self._live_tags = set(self.live_snitch['tags'])
-        self._param_tags = set(self.params['tags'])
+    def __init__(self, module, client=None):
+        super().__init__(module, client=client)
+        self.live_snitch = None
+        self.selector = None
+        if SnitchSelector.is_requested(self.params):
+            try:
+                self.selector = SnitchSelector.from_params(self.params)
+            except re.error as e:
+                self.module.fail_json(msg=f"name_regex is not a valid regular expression: {e}")
+        else:
+            self._lookup_live_snitch()
 
     def _lookup_live_snitch(self):
         if self.params["id"]:
             self.live_snitch = self.client.get_snitch(snitch_id=self.params["id"])
         elif self.params["name"]:
-            for snitch in self.client.list_snitches():
+            for snitch in self.client.iter_snitches():
                 if snitch["name"] == self.params["name"]:
                     self.live_snitch = snitch
                     break
@@ -129,81 +277,146 @@ class TagsModule(ModuleBase):
         if not self.live_snitch:
             self.fail_unable_to_find_snitch()
 
-    def state_absolute(self):
-        if self._param_tags != self._live_tags:
-            tags_to_change = list(self._param_tags)
-            self.client.replace_snitch_tags(snitch_id=self.live_snitch["token"], tags=tags_to_change)
-            return True, tags_to_change
+    def plan(self, snitch=None):
+        snitch = snitch or self.live_snitch
+        live_tags = snitch["tags"]
+        new_tags = desired_tags(live_tags, self.params["tags"], self.params["state"])
+        return TagPlan(snitch["token"], live_tags, new_tags)
 
-        return False, list(self._live_tags)
+    def apply(self, plan, workers=None):
+        """
+        Applies the plan, unless the module is in check mode.
+        Returns the number of API calls that were made, or in check mode, the number that would be made.
+        """
+        if self.module.check_mode:
+            return plan.api_calls(self.params["strategy"])
+        workers = self.params["workers"] if workers is None else workers
+        return plan.apply(self.client, strategy=self.params["strategy"], workers=workers)
 
-    def state_present(self):
-        tags_to_add = list(self._param_tags.difference(self._live_tags))
-        if tags_to_add:
-            new_tags = list(self._param_tags.union(self._live_tags))
-            self.client.append_snitch_tags(snitch_id=self.live_snitch["token"], tags=tags_to_add)
-            return True, new_tags
+    def apply_to_selected(self):
+        """
+        Plans and applies the tag changes for every snitch that matches the selector. The snitches
+        are updated concurrently, and the calls for each snitch are sent one at a time so the number
+        of requests in flight stays within the worker limit.
+        Returns the results for each snitch, in the order they were listed.
+        """
+        snitches = self.selector.select(self.client.iter_snitches())
+        plans = [(snitch, self.plan(snitch)) for snitch in snitches]
 
-        return False, list(self._live_tags)
+        outcomes = dict()
+        to_apply = [p for p in plans if p[1].changed]
+        for task in run_concurrently(lambda p: self.apply(p[1], workers=1), to_apply, workers=self.params["workers"]):
+            outcomes[task.item[0]["token"]] = task
 
-    def state_absent(self):
-        tags_to_remove = list(self._param_tags.intersection(self._live_tags))
-        if tags_to_remove:
-            new_tags = list(self._live_tags.difference(self._param_tags))
-            for tag in tags_to_remove:
-                self.client.remove_snitch_tag(snitch_id=self.live_snitch["token"], tag=tag)
-            return True, new_tags
+        results = []
+        strategy = self.params["strategy"]
+        for snitch, plan in plans:
+            task = outcomes.get(snitch["token"])
+            item_result = dict(
+                name=snitch["name"],
+                id=snitch["token"],
+                old=plan.old_tags,
+                new=plan.new_tags,
+                strategy=plan.resolve_strategy(strategy),
+                api_calls=task.result if task and not task.failed else 0,
+                changed=plan.changed and not (task and task.failed),
+                failed=bool(task and task.failed),
+            )
+            if item_result["failed"]:
+                item_result["msg"] = self.format_error(task.error)
+            results.append(item_result)
 
-        return False, list(self._live_tags)
+        return results
 
 
-def main():
+def module_spec():
     # define available arguments/parameters a user can pass to the module
     module_args = {
         **ModuleBase.base_argument_spec(),
+        **ModuleBase.snapshot_argument_spec(),
+        **selector_argument_spec(),
         **dict(
             name=dict(type="str", required=False),
             id=dict(type="str", required=False),
             tags=dict(type="list", elements="str", required=True),
             state=dict(
                 type="str",
-                choices=["present", "absent", "absolute"],
+                choices=TAG_STATES,
                 default="present",
                 required=False,
             ),
+            strategy=dict(
+                type="str",
+                choices=TAG_STRATEGIES,
+                default="auto",
+                required=False,
+            ),
+            workers=dict(type="int", required=False, default=4),
         ),
     }
 
-    module = AnsibleModule(
+    return dict(
         argument_spec=module_args,
         supports_check_mode=True,
         required_one_of=[
-            ["name", "id"],
-        ]
+            ["name", "id", *SELECTOR_OPTIONS],
+        ],
+        mutually_exclusive=[
+            [option, *SELECTOR_OPTIONS]
+            for option in ["name", "id"]
+        ],
     )
-    tag_module = TagsModule(module)
-    result = dict(changed=False, snitch=dict(
+
+
+def run_selected(module, tag_module):
+    result = dict(changed=False, api_calls=0, snitches=[])
+    try:
+        result["snitches"] = tag_module.apply_to_selected()
+    except Exception as e:
+        tag_module.handle_exception(e)
+
+    result["changed"] = any(r["changed"] for r in result["snitches"])
+    result["api_calls"] = sum(r["api_calls"] for r in result["snitches"])
+    failed = [r for r in result["snitches"] if r["failed"]]
+    if failed:
+        module.fail_json(
+            msg=f"Failed to change tags on {len(failed)} of {len(result['snitches'])} snitches",
+            **result,
+            **tag_module.client_stats()
+        )
+    tag_module.exit_json(**result)
+
+
+def run_module(module, client=None):
+    tag_module = TagsModule(module, client=client)
+    if tag_module.selector:
+        return run_selected(module, tag_module)
+
+    result = dict(changed=False, api_calls=0, snitch=dict(
         name=tag_module.live_snitch['name'],
         id=tag_module.live_snitch['token']
     ))
     try:
-        old_tags = tag_module.live_snitch['tags']
-        if module.params['state'] == "present":
-            changed, new_tags = tag_module.state_present()
-        elif module.params['state'] == "absent":
-            changed, new_tags = tag_module.state_absent()
-        else:
-            changed, new_tags = tag_module.state_absolute()
-
-        result["changed"] = changed
-        if changed:
-            result["old"] = old_tags
-            result["new"] = new_tags
+        plan = tag_module.plan()
+        result["changed"] = plan.changed
+        result["strategy"] = plan.resolve_strategy(module.params["strategy"])
+        if plan.changed:
+            result["old"] = plan.old_tags
+            result["new"] = plan.new_tags
+            if module._diff:
+                result["diff"] = dict(before=dict(tags=plan.old_tags), after=dict(tags=plan.new_tags))
+        result["api_calls"] = tag_module.apply(plan)
 
     except Exception as e:
         tag_module.handle_exception(e)
 
-    module.exit_json(**result)
+    tag_module.exit_json(**result)
+
+
+def main():
+    module = AnsibleModule(**module_spec())
+    with ModuleBase.profiled(module):
+        run_module(module)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,160 @@
+# Copyright: (c) 2025, mikemorency
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible.module_utils.basic import env_fallback
+from ansible.module_utils.common.arg_spec import ArgumentSpecValidator
+from ansible.module_utils.common.parameters import remove_values
+from ansible.plugins.action import ActionBase
+from ansible.utils.display import Display
+
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.module_base import (
+    ModuleBase,
+)
+
+display = Display()
+
+# Clients are kept for the life of the worker process, so every item in a task loop reuses the
+# same connection pool.
+_CLIENTS = dict()
+
+
+class ModuleExit(BaseException):
+    """
+    Raised by ControllerModule.exit_json and ControllerModule.fail_json to stop the module logic.
+    Like the SystemExit raised by AnsibleModule, it is not an Exception, so the handlers that modules
+    wrap around their API calls do not catch it.
+    """
+    def __init__(self, result):
+        super().__init__(result.get("msg", ""))
+        self.result = result
+
+
+class ControllerModule:
+    """
+    Implements the parts of AnsibleModule that the modules in this collection use, so their logic
+    can run inside the controller process instead of being shipped to a host by AnsiballZ.
+    """
+    def __init__(self, module_args, argument_spec, check_mode=False, diff=False, environment=None,
+                 supports_check_mode=True, name=None, **validator_kwargs):
+        self.check_mode = check_mode and supports_check_mode
+        self._diff = diff
+        self._name = name
+        self._socket_path = None
+        self._warnings = []
+
+        args = dict(module_args)
+        self._apply_env_fallbacks(args, argument_spec, environment or dict())
+        validator = ArgumentSpecValidator(argument_spec, **validator_kwargs)
+        validated = validator.validate(args)
+        self.no_log_values = validated._no_log_values
+        self.params = validated.validated_parameters
+        if validated.error_messages:
+            self.fail_json(msg=", ".join(validated.error_messages))
+
+    @staticmethod
+    def _apply_env_fallbacks(args, argument_spec, environment):
+        """
+        The task environment is only applied to module processes, so env_fallback would not see it
+        when running on the controller. Look the variables up in the task environment first.
+        """
+        for name, spec in argument_spec.items():
+            fallback = spec.get("fallback")
+            if args.get(name) is not None or not fallback or fallback[0] is not env_fallback:
+                continue
+            for env_name in fallback[1]:
+                if env_name in environment:
+                    args[name] = environment[env_name]
+                    break
+
+    def _finalize(self, result):
+        if self._warnings:
+            result["warnings"] = self._warnings
+        return remove_values(result, self.no_log_values)
+
+    def warn(self, warning):
+        self._warnings.append(warning)
+
+    def exit_json(self, **kwargs):
+        kwargs.setdefault("changed", False)
+        raise ModuleExit(self._finalize(kwargs))
+
+    def fail_json(self, msg, **kwargs):
+        kwargs["failed"] = True
+        kwargs["msg"] = msg
+        raise ModuleExit(self._finalize(kwargs))
+
+
+def get_shared_client(module):
+    """
+    Returns a Client for the module's connection options, creating it the first time it is needed.
+    Returns None if the module reads from a snapshot, so the module creates its own read only client.
+    """
+    params = module.params
+    if params.get("snapshot_path"):
+        return None
+    key = tuple(params.get(k) for k in sorted(ModuleBase.base_argument_spec()))
+    if key not in _CLIENTS:
+        _CLIENTS[key] = ModuleBase(module).client
+    else:
+        _CLIENTS[key].retry_policy.reset()
+        if _CLIENTS[key].recorder:
+            _CLIENTS[key].recorder.reset()
+    return _CLIENTS[key]
+
+
+class ControllerActionBase(ActionBase):
+    """
+    Runs a module from this collection in the controller process when the task would run on the
+    controller anyway, for example with delegate_to: localhost. Otherwise the module is executed
+    normally.
+
+    Subclasses set MODULE to the python module that implements the Ansible module. It must provide
+    module_spec() and run_module(module, client=None).
+    """
+    MODULE = None
+
+    def get_client(self, module):
+        """
+        Returns the client to run the module with. Subclasses can return None, so the module creates
+        its own client.
+        """
+        return get_shared_client(module)
+
+    def _runs_on_controller(self):
+        if self._task.async_val:
+            return False
+        return self._connection.transport in ("local", "ansible.builtin.local")
+
+    def run(self, tmp=None, task_vars=None):
+        result = super().run(tmp, task_vars)
+        del tmp
+
+        if not self._runs_on_controller():
+            display.vvvv("Executing module on the target host", host=self._play_context.remote_addr)
+            result.update(self._execute_module(task_vars=task_vars))
+            return result
+
+        environment = dict()
+        self._compute_environment_string(raw_environment_out=environment)
+        try:
+            module = ControllerModule(
+                self._task.args,
+                check_mode=self._play_context.check_mode,
+                diff=self._play_context.diff,
+                environment=environment,
+                name=self._task.action,
+                **self.MODULE.module_spec()
+            )
+            with ModuleBase.profiled(module):
+                self.MODULE.run_module(module, client=self.get_client(module))
+        except ModuleExit as e:
+            result.update(e.result)
+        else:
+            result.update(failed=True, msg="The module did not return a result")
+
+        return result
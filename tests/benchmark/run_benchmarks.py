@@ -0,0 +1,296 @@
+#!/usr/bin/env python
+# Copyright: (c) 2025, mikemorency
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""
+Benchmarks for the hot paths in the collection.
+
+The API is served by the emulator in tests/unit/common/dms_server.py, running in a separate process
+so the timings and the tracemalloc peaks only include the client side. Module runs use the
+ControllerModule from the action plugins, so they measure the module logic and the API calls but
+not the AnsiballZ startup cost. The module runs are idempotent after the first, untimed run, so
+they measure a run that finds nothing to change.
+
+The collection must be importable, for example:
+    PYTHONPATH=~/.ansible/collections python tests/benchmark/run_benchmarks.py --output results.json
+
+Results are written as JSON. Pass a previous results file with --compare to print the change in
+the median time and peak memory of every benchmark.
+"""
+
+import argparse
+import json
+import multiprocessing
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.client import Client
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.retry import RetryPolicy
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.snitch import SnitchModule
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.snitch_index import SnitchIndex
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.tags import TagPlan, desired_tags
+from ansible_collections.mikemorency.deadmanssnitch.plugins.modules import snitch, snitch_bulk, tags
+from ansible_collections.mikemorency.deadmanssnitch.plugins.plugin_utils.action_base import (
+    ControllerModule,
+    ModuleExit,
+)
+from ansible_collections.mikemorency.deadmanssnitch.tests.unit.common.dms_server import (
+    FakeDmsServer,
+    make_snitch,
+)
+
+DEFAULT_SIZES = [100, 1000, 10000, 50000]
+
+
+def _serve(snitch_count, latency, url_queue, stop_event):
+    server = FakeDmsServer(latency=latency)
+    for index in range(snitch_count):
+        server.add_snitch(make_snitch(index, token=f"token{index:05d}", tags=["bench", f"group{index % 10}"]))
+    with server:
+        url_queue.put(server.url)
+        stop_event.wait()
+
+
+class ServerProcess:
+    """Runs a FakeDmsServer with snitch_count snitches in a child process"""
+    def __init__(self, snitch_count, latency=0.0):
+        self.snitch_count = snitch_count
+        self.latency = latency
+        self.url = None
+
+    def __enter__(self):
+        url_queue = multiprocessing.Queue()
+        self._stop = multiprocessing.Event()
+        self._process = multiprocessing.Process(
+            target=_serve, args=(self.snitch_count, self.latency, url_queue, self._stop), daemon=True
+        )
+        self._process.start()
+        self.url = url_queue.get(timeout=120)
+        return self
+
+    def __exit__(self, *args):
+        self._stop.set()
+        self._process.join(timeout=10)
+
+
+class BenchModule:
+    """The parts of AnsibleModule that the module_utils classes use"""
+    check_mode = False
+    _diff = False
+
+    def __init__(self, params):
+        self.params = params
+
+    def fail_json(self, **kwargs):
+        raise RuntimeError(kwargs.get("msg"))
+
+
+def make_client(url):
+    client = Client("key", retry_policy=RetryPolicy(max_retries=0))
+    client._url_base = url
+    return client
+
+
+def measure(name, func, repeat, **params):
+    """
+    Times func repeat times, then runs it once more under tracemalloc to find the peak memory use
+    """
+    func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = dict(
+        name=name,
+        params=params,
+        repeat=repeat,
+        min_seconds=min(timings),
+        median_seconds=statistics.median(timings),
+        mean_seconds=statistics.mean(timings),
+        peak_memory_bytes=peak,
+    )
+    print(f"{name} {params}: median {result['median_seconds'] * 1000:.3f} ms, peak {peak / 1024:.1f} KiB",
+          file=sys.stderr)
+    return result
+
+
+def bench_make_request(url, repeat, calls=100):
+    client = make_client(url)
+
+    def run():
+        for _ in range(calls):
+            client._make_request("GET", "snitches/token00000")
+
+    result = measure("client_make_request", run, repeat, calls=calls)
+    result["per_call_seconds"] = result["median_seconds"] / calls
+    return result
+
+
+def bench_lookup(sizes, repeat):
+    results = []
+    for size in sizes:
+        with ServerProcess(size) as server:
+            client = make_client(server.url)
+            params = dict(name=f"snitch-{size - 1:05d}", id=None)
+
+            def run():
+                module = SnitchModule(BenchModule(params), client=client)
+                if not module.lookup_live_snitch():
+                    raise RuntimeError("Snitch was not found")
+
+            results.append(measure("lookup_live_snitch", run, repeat, snitches=size))
+    return results
+
+
+def bench_changes_needed(repeat, tag_count=500, iterations=1000):
+    live = make_snitch(0, tags=[f"tag{i}" for i in range(tag_count)],
+                       alert_email=[f"user{i}@example.com" for i in range(20)])
+    params = dict(live, id=None, state="present", tags=list(reversed(live["tags"])),
+                  alert_email=list(reversed(live["alert_email"])))
+    module = SnitchModule(BenchModule(params), client=object())
+    module.live_snitch = live
+
+    def run():
+        for _ in range(iterations):
+            module.are_changes_needed()
+
+    return measure("are_changes_needed", run, repeat, tags=tag_count, iterations=iterations)
+
+
+def bench_tag_plan(repeat, tag_count=1000, iterations=200):
+    live_tags = [f"tag{i}" for i in range(tag_count)]
+    wanted = [f"tag{i}" for i in range(0, tag_count * 2, 2)]
+    results = []
+    for state in ("present", "absent", "absolute"):
+        def run():
+            for _ in range(iterations):
+                plan = TagPlan("token", live_tags, desired_tags(live_tags, wanted, state))
+                plan.resolve_strategy("auto")
+
+        results.append(measure("tag_plan", run, repeat, state=state, tags=tag_count, iterations=iterations))
+    return results
+
+
+def bench_snitch_index(sizes, repeat):
+    query = "bench AND (group1 OR group2) AND NOT team3"
+    results = []
+    for size in sizes:
+        snitches = [make_snitch(i, tags=["bench", f"group{i % 10}", f"team{i % 7}"]) for i in range(size)]
+
+        def run():
+            SnitchIndex(snitches).query(tag_query=query, status=["pending", "healthy"], name_pattern="1$")
+
+        results.append(measure("snitch_index_query", run, repeat, snitches=size))
+    return results
+
+
+def run_module(module, url, args):
+    controller_module = ControllerModule(dict(args, api_key="key"), **module.module_spec())
+    try:
+        module.run_module(controller_module, client=make_client(url))
+    except ModuleExit as e:
+        if e.result.get("failed"):
+            raise RuntimeError(e.result["msg"])
+        return e.result
+    raise RuntimeError("The module did not exit")
+
+
+def bench_modules(size, repeat):
+    results = []
+    with ServerProcess(size) as server:
+        cases = [
+            (snitch, dict(name=f"snitch-{size - 1:05d}", interval="daily")),
+            (tags, dict(id="token00000", tags=["bench"])),
+            (tags, dict(match_tags=["group1"], tags=["bench"], workers=8)),
+            (snitch_bulk, dict(snitches=[
+                dict(name=f"snitch-{i:05d}", interval="daily") for i in range(0, size, max(1, size // 100))
+            ], workers=8)),
+        ]
+        for module, args in cases:
+            results.append(measure(
+                f"module_{module.__name__.rsplit('.', 1)[-1]}",
+                lambda: run_module(module, server.url, args),
+                repeat,
+                snitches=size,
+                options=sorted(args),
+            ))
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+
+    def key(result):
+        return result["name"], json.dumps(result["params"], sort_keys=True)
+
+    previous = {key(r): r for r in baseline["results"]}
+    for result in results["results"]:
+        old = previous.get(key(result))
+        if not old:
+            continue
+        time_change = result["median_seconds"] / old["median_seconds"] - 1 if old["median_seconds"] else 0
+        memory_change = (
+            result["peak_memory_bytes"] / old["peak_memory_bytes"] - 1 if old["peak_memory_bytes"] else 0
+        )
+        print(f"{result['name']} {result['params']}: time {time_change:+.1%}, memory {memory_change:+.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", help="Write the results to this file instead of stdout")
+    parser.add_argument("--compare", help="A previous results file to compare the results with")
+    parser.add_argument("--repeat", type=int, default=5, help="The number of timed runs for each benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="The account sizes to use for the lookup benchmark")
+    parser.add_argument("--module-size", type=int, default=1000,
+                        help="The account size to use for the module benchmarks")
+    args = parser.parse_args()
+
+    results = []
+    with ServerProcess(1) as server:
+        results.append(bench_make_request(server.url, args.repeat))
+    results.extend(bench_lookup(args.sizes, args.repeat))
+    results.append(bench_changes_needed(args.repeat))
+    results.extend(bench_tag_plan(args.repeat))
+    results.extend(bench_snitch_index(args.sizes, args.repeat))
+    results.extend(bench_modules(args.module_size, args.repeat))
+
+    output = dict(
+        revision=git_revision(),
+        python=platform.python_version(),
+        platform=platform.platform(),
+        timestamp=time.time(),
+        results=results,
+    )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(output, f, indent=2)
+    else:
+        json.dump(output, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        compare(output, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import base64
+import collections
+import copy
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.client import (
+    Client,
+)
+
+
+class Fault:
+    """
+    An error response the server sends instead of handling a request.
+    If method or path_pattern are set, the fault is only used for requests that match them.
+    """
+    def __init__(self, status=503, retry_after=None, method=None, path_pattern=None, count=1):
+        self.status = status
+        self.retry_after = retry_after
+        self.method = method
+        self.path_pattern = re.compile(path_pattern) if path_pattern else None
+        self.count = count
+
+    def matches(self, method, path):
+        if self.method and self.method != method:
+            return False
+        if self.path_pattern and not self.path_pattern.search(path):
+            return False
+        return True
+
+
+def make_snitch(index, **kwargs):
+    token = kwargs.pop("token", None) or uuid.uuid4().hex[:10]
+    interval = kwargs.pop("interval", "daily")
+    snitch = {
+        "token": token,
+        "href": f"/v1/snitches/{token}",
+        "name": f"snitch-{index:05d}",
+        "tags": [],
+        "notes": None,
+        "status": "pending",
+        "checked_in_at": None,
+        "check_in_url": f"https://nosnch.in/{token}",
+        "created_at": "2025-01-01T00:00:00.000Z",
+        "alert_type": "basic",
+        "alert_email": [],
+        "interval": interval,
+        "type": {"interval": interval},
+    }
+    snitch.update(kwargs)
+    return snitch
+
+
+def client_class_for(server):
+    """
+    Returns a stand-in for the Client class that points every client at server, so modules can be
+    run against the emulator by patching the Client class of module_base with it.
+    """
+    def create_client(*args, **kwargs):
+        client = Client(*args, **kwargs)
+        client._url_base = server.url
+        return client
+    return create_client
+
+
+class FakeDmsServer:
+    """
+    An in-process HTTP server that implements the parts of the Dead Man's Snitch API that the
+    collection uses. It can be used as a context manager, and clients can be pointed at it by setting
+    Client._url_base to FakeDmsServer.url.
+
+    The account is created with snitch_count generated snitches. Every request waits for latency
+    seconds before it is handled. Faults added with add_fault are sent in the order they were added,
+    and error_rate sends a random error_statuses response for that fraction of the remaining requests.
+    Every request is recorded in requests, and counted by method and endpoint template in counts.
+    If page_size is set, the snitch list is paginated with a Link header.
+
+    Check-ins are sent to checkin_url/<token> without authentication, like the check-in host, and
+    are recorded in check_ins as (token, message, exit_code) tuples.
+    """
+    def __init__(self, snitch_count=0, latency=0.0, error_rate=0.0, error_statuses=(500, 502, 503),
+                 page_size=None, api_key="key", seed=0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_statuses = tuple(error_statuses)
+        self.page_size = page_size
+        self.api_key = api_key
+        self.requests = []
+        self.counts = collections.Counter()
+        self.snitches = collections.OrderedDict()
+        self.check_ins = []
+        self._faults = []
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+        for index in range(snitch_count):
+            self.add_snitch(make_snitch(index))
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    @property
+    def checkin_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/checkin"
+
+    def add_snitch(self, snitch):
+        with self._lock:
+            self.snitches[snitch["token"]] = snitch
+        return snitch
+
+    def add_fault(self, status=503, retry_after=None, method=None, path_pattern=None, count=1):
+        with self._lock:
+            self._faults.append(Fault(status, retry_after, method, path_pattern, count))
+
+    def reset_stats(self):
+        with self._lock:
+            self.requests = []
+            self.counts = collections.Counter()
+
+    def start(self):
+        server = self
+
+        class Handler(_Handler):
+            fake = server
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def _next_fault(self, method, path):
+        with self._lock:
+            for fault in self._faults:
+                if fault.matches(method, path):
+                    fault.count -= 1
+                    if fault.count <= 0:
+                        self._faults.remove(fault)
+                    return fault
+            if self.error_rate and self._random.random() < self.error_rate:
+                return Fault(self._random.choice(self.error_statuses))
+        return None
+
+    def _record(self, method, path, template, status):
+        with self._lock:
+            self.requests.append((method, path, status))
+            self.counts[f"{method} {template}"] += 1
+
+    def handle(self, method, path, query, body):
+        """
+        Returns the status, headers, body, and endpoint template for a request.
+        The body is a copy, so it can be serialized while other requests change the account.
+        """
+        with self._lock:
+            status, headers, response, template = self._dispatch(method, path, query, body)
+            return status, headers, copy.deepcopy(response), template
+
+    def _dispatch(self, method, path, query, body):
+        parts = path.strip("/").split("/")
+        if parts[0] == "checkin" and len(parts) == 2:
+            return self._check_in(method, unquote(parts[1]), query) + ("/checkin/{token}",)
+        if parts[:2] != ["v1", "snitches"]:
+            return 404, {}, {"error": "not_found"}, path
+
+        tail = parts[2:]
+        if not tail:
+            if method == "GET":
+                return self._list(query) + ("/v1/snitches",)
+            if method == "POST":
+                return 201, {}, self._create(body), "/v1/snitches"
+            return 405, {}, None, "/v1/snitches"
+
+        snitch = self.snitches.get(tail[0])
+        template = "/v1/snitches/{token}" + "".join(
+            "/{tag}" if i == 2 else f"/{p}" for i, p in enumerate(tail[1:], start=1)
+        )
+        if snitch is None:
+            return 404, {}, {"error": "not_found"}, template
+
+        if len(tail) == 1:
+            if method == "GET":
+                return 200, {}, snitch, template
+            if method == "PATCH":
+                return 200, {}, self._update(snitch, body), template
+            if method == "DELETE":
+                del self.snitches[snitch["token"]]
+                return 204, {}, None, template
+        elif tail[1] == "tags":
+            if method == "POST" and len(tail) == 2:
+                snitch["tags"] = list(dict.fromkeys(snitch["tags"] + list(body or [])))
+                return 200, {}, snitch["tags"], template
+            if method == "DELETE" and len(tail) == 3:
+                snitch["tags"] = [t for t in snitch["tags"] if t != unquote(tail[2])]
+                return 200, {}, snitch["tags"], template
+        elif tail[1] in ("pause", "unpause") and method == "POST":
+            snitch["status"] = "paused" if tail[1] == "pause" else "pending"
+            return 204, {}, None, template
+
+        return 405, {}, None, template
+
+    def _check_in(self, method, token, query):
+        snitch = self.snitches.get(token)
+        if method != "GET":
+            return 405, {}, None
+        if snitch is None:
+            return 404, {}, {"error": "not_found"}
+        message = query.get("m", [None])[0]
+        exit_code = query.get("s", [None])[0]
+        self.check_ins.append((token, message, exit_code))
+        snitch["checked_in_at"] = "2025-01-01T00:00:00.000Z"
+        snitch["status"] = "healthy" if exit_code in (None, "0") else "errored"
+        return 202, {}, "Got it, thanks!"
+
+    def _list(self, query):
+        snitches = list(self.snitches.values())
+        if query.get("tags"):
+            wanted = set(query["tags"][0].split(","))
+            snitches = [s for s in snitches if wanted.issubset(s["tags"])]
+
+        headers = {}
+        if self.page_size:
+            page = int(query.get("page", ["1"])[0])
+            start = (page - 1) * self.page_size
+            if start + self.page_size < len(snitches):
+                next_query = "&".join(f"{k}={v[0]}" for k, v in query.items() if k != "page")
+                next_query = f"{next_query}&page={page + 1}" if next_query else f"page={page + 1}"
+                headers["Link"] = f'<{self.url}/snitches?{next_query}>; rel="next"'
+            snitches = snitches[start:start + self.page_size]
+        return 200, headers, snitches
+
+    def _create(self, body):
+        body = {k: v for k, v in (body or {}).items() if v is not None}
+        snitch = make_snitch(len(self.snitches), **body)
+        self.snitches[snitch["token"]] = snitch
+        return snitch
+
+    @staticmethod
+    def _update(snitch, body):
+        for key, value in (body or {}).items():
+            snitch[key] = value
+            if key == "interval":
+                snitch["type"] = {"interval": value}
+        return snitch
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Send the headers and body in one write, so Nagle's algorithm does not delay every response
+    wbufsize = 64 * 1024
+    disable_nagle_algorithm = True
+    fake = None
+
+    def log_message(self, *args):
+        pass
+
+    def _authorized(self):
+        header = self.headers.get("Authorization", "")
+        if not header.startswith("Basic "):
+            return False
+        user = base64.b64decode(header[6:]).decode("utf-8").split(":", 1)[0]
+        return user == self.fake.api_key
+
+    def _send(self, status, headers, body):
+        payload = json.dumps(body).encode("utf-8") if body is not None else b""
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        if payload:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if payload:
+            self.wfile.write(payload)
+
+    def _handle(self):
+        fake = self.fake
+        url = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+
+        if fake.latency:
+            time.sleep(fake.latency)
+
+        if not url.path.startswith("/checkin/") and not self._authorized():
+            fake._record(self.command, url.path, url.path, 401)
+            return self._send(401, {}, {"error": "unauthorized"})
+
+        fault = fake._next_fault(self.command, url.path)
+        if fault:
+            fake._record(self.command, url.path, url.path, fault.status)
+            headers = {"Retry-After": str(fault.retry_after)} if fault.retry_after is not None else {}
+            return self._send(fault.status, headers, {"error": "injected"})
+
+        body = json.loads(raw) if raw else None
+        status, headers, response, template = fake.handle(self.command, url.path, parse_qs(url.query), body)
+        fake._record(self.command, url.path, template, status)
+        self._send(status, headers, response)
+
+    do_GET = _handle
+    do_POST = _handle
+    do_PATCH = _handle
+    do_DELETE = _handle
@@ -56,13 +56,16 @@ def set_module_args(args=None):
             yield
 
 
-class AnsibleExitJson(Exception):
-    """Exception class to be raised by module.exit_json and caught by the test case"""
+class AnsibleExitJson(BaseException):
+    """
+    Exception class to be raised by module.exit_json and caught by the test case.
+    Like the SystemExit raised by AnsibleModule, it is not caught by handlers for Exception.
+    """
 
     pass
 
 
-class AnsibleFailJson(Exception):
+class AnsibleFailJson(BaseException):
     pass
 
 
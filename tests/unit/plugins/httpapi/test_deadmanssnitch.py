@@ -0,0 +1,62 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import io
+import json
+from unittest.mock import Mock
+
+from ansible.plugins.loader import httpapi_loader
+
+
+class DummyResponse:
+    def __init__(self, code=200, reason="OK"):
+        self.code = code
+        self.reason = reason
+
+
+class TestHttpApi:
+    def setup_method(self):
+        self.connection = Mock()
+        self.httpapi = httpapi_loader.get("mikemorency.deadmanssnitch.deadmanssnitch", self.connection)
+        self.httpapi.set_options(direct={"dms_api_key": "key"})
+        self.snitches = [{"token": "1", "name": "one"}, {"token": "2", "name": "two"}]
+
+    def respond(self, body, code=200, reason="OK"):
+        self.connection.send.return_value = (
+            DummyResponse(code, reason),
+            io.BytesIO(json.dumps(body).encode()),
+        )
+
+    def test_login(self):
+        self.httpapi.login(None, None)
+        assert self.connection._auth == {"Authorization": "Basic a2V5Og=="}
+
+    def test_list_is_remembered(self):
+        self.respond(self.snitches)
+        assert self.httpapi.send_request(None, path="/v1/snitches") == (200, "OK", self.snitches)
+        assert self.httpapi.send_request(None, path="/v1/snitches") == (200, "OK", self.snitches)
+        self.connection.send.assert_called_once()
+
+    def test_writes_update_list(self):
+        self.respond(self.snitches)
+        self.httpapi.send_request(None, path="/v1/snitches")
+
+        self.respond({"token": "3", "name": "three"}, code=201)
+        self.httpapi.send_request("{}", method="POST", path="/v1/snitches")
+        self.respond({"token": "1", "name": "renamed"})
+        self.httpapi.send_request("{}", method="PATCH", path="/v1/snitches/1")
+        self.respond(None, code=204)
+        self.httpapi.send_request(None, method="DELETE", path="/v1/snitches/2")
+
+        _, _, snitches = self.httpapi.send_request(None, path="/v1/snitches")
+        assert snitches == [{"token": "1", "name": "renamed"}, {"token": "3", "name": "three"}]
+
+        self.respond(["a"])
+        self.httpapi.send_request("[]", method="POST", path="/v1/snitches/1/tags")
+        assert self.httpapi._snitches is None
+
+    def test_errors_are_returned(self):
+        self.respond({"error": "not found"}, code=404, reason="Not Found")
+        assert self.httpapi.send_request(None, path="/v1/snitches/9") == (404, "Not Found", {"error": "not found"})
+        assert self.httpapi.handle_httperror(Exception()) is not False
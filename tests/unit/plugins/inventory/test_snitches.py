@@ -0,0 +1,56 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import pytest
+
+from ansible.inventory.data import InventoryData
+from ansible.plugins.loader import inventory_loader
+
+
+@pytest.fixture
+def plugin():
+    plugin = inventory_loader.get("mikemorency.deadmanssnitch.snitches")
+    plugin.inventory = InventoryData()
+    plugin.templar = None
+    plugin.set_options(direct={"plugin": "mikemorency.deadmanssnitch.snitches", "api_key": "key"})
+    return plugin
+
+
+SNITCHES = [
+    {"token": "1", "name": "db-backup", "tags": ["prod", "db"], "status": "failed", "interval": "daily"},
+    {"token": "2", "name": "web-backup", "tags": ["prod"], "status": "healthy", "interval": "hourly"},
+    {"token": "3", "name": "db-backup", "tags": [], "status": "paused", "interval": "daily"},
+]
+
+
+def test_verify_file(plugin, tmp_path):
+    for name, expected in [("snitches.yml", True), ("dms.deadmanssnitch.yaml", True), ("hosts.yml", False)]:
+        path = tmp_path / name
+        path.write_text("plugin: mikemorency.deadmanssnitch.snitches")
+        assert plugin.verify_file(str(path)) is expected
+
+
+def test_populate(plugin):
+    plugin._populate(SNITCHES)
+    inventory = plugin.inventory
+
+    assert sorted(inventory.hosts) == ["db-backup", "web-backup"]
+    assert sorted(h.name for h in inventory.groups["tag_prod"].get_hosts()) == ["db-backup", "web-backup"]
+    assert [h.name for h in inventory.groups["status_failed"].get_hosts()] == ["db-backup"]
+    assert [h.name for h in inventory.groups["interval_hourly"].get_hosts()] == ["web-backup"]
+    assert inventory.get_host("db-backup").vars["snitch_token"] == "1"
+
+
+def test_parse_uses_cache(plugin, mocker):
+    fetch = mocker.patch.object(plugin, "_fetch_snitches", return_value=SNITCHES)
+    mocker.patch.object(plugin, "_read_config_data")
+    mocker.patch.object(plugin, "get_cache_key", return_value="key")
+    plugin.set_option("cache", True)
+    plugin._cache = {}
+
+    plugin.parse(plugin.inventory, None, "snitches.yml", cache=False)
+    plugin.parse(plugin.inventory, None, "snitches.yml", cache=True)
+
+    fetch.assert_called_once()
+    assert plugin._cache["key"] == SNITCHES
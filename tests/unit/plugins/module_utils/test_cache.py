@@ -0,0 +1,98 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from unittest.mock import Mock, patch
+
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.cache import (
+    SnitchCache,
+    api_key_digest,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.client import (
+    Client,
+)
+
+
+class TestSnitchCache:
+    def setup_method(self):
+        self.snitches = [
+            {"token": "1", "name": "one", "tags": ["a"]},
+            {"token": "2", "name": "two", "tags": []},
+        ]
+
+    def test_file_is_keyed_by_api_key(self, tmp_path):
+        cache = SnitchCache("key", ttl=60, path=str(tmp_path))
+        assert api_key_digest("key") in cache.data_file
+        assert SnitchCache("other", ttl=60, path=str(tmp_path)).data_file != cache.data_file
+
+    def test_get_or_fetch_only_fetches_once(self, tmp_path):
+        cache = SnitchCache("key", ttl=60, path=str(tmp_path))
+        fetch = Mock(return_value=self.snitches)
+
+        assert cache.get() is None
+        assert cache.get_or_fetch(fetch) == self.snitches
+        assert cache.get_or_fetch(fetch) == self.snitches
+        assert SnitchCache("key", ttl=60, path=str(tmp_path)).get() == self.snitches
+        fetch.assert_called_once()
+
+    def test_expired_cache_is_refreshed(self, tmp_path):
+        cache = SnitchCache("key", ttl=60, path=str(tmp_path))
+        fetch = Mock(return_value=self.snitches)
+        with patch("time.time", return_value=1000):
+            cache.get_or_fetch(fetch)
+        with patch("time.time", return_value=1061):
+            assert cache.get() is None
+            cache.get_or_fetch(fetch)
+        assert fetch.call_count == 2
+
+    def test_write_through(self, tmp_path):
+        cache = SnitchCache("key", ttl=60, path=str(tmp_path))
+        cache.get_or_fetch(lambda: self.snitches)
+
+        cache.upsert({"token": "3", "name": "three", "tags": []})
+        cache.upsert({"token": "1", "name": "renamed", "tags": ["a"]})
+        cache.remove("2")
+        cache.update_tags("3", ["b"])
+
+        assert sorted(cache.get(), key=lambda s: s["token"]) == [
+            {"token": "1", "name": "renamed", "tags": ["a"]},
+            {"token": "3", "name": "three", "tags": ["b"]},
+        ]
+
+    def test_write_through_without_cache_is_noop(self, tmp_path):
+        cache = SnitchCache("key", ttl=60, path=str(tmp_path))
+        cache.upsert({"token": "3", "name": "three", "tags": []})
+        assert cache.get() is None
+
+    def test_invalidate(self, tmp_path):
+        cache = SnitchCache("key", ttl=60, path=str(tmp_path))
+        cache.get_or_fetch(lambda: self.snitches)
+        cache.invalidate()
+        assert cache.get() is None
+
+
+class TestClientCache:
+    @patch("requests.Session.request")
+    def test_list_snitches_uses_cache(self, mock_request, tmp_path):
+        mock_response = Mock()
+        mock_response.iter_content.return_value = [b'[{"token": "1", "name": "one", "tags": []}]']
+        mock_response.links = {}
+        mock_request.return_value = mock_response
+
+        cache = SnitchCache("key", ttl=60, path=str(tmp_path))
+        client = Client("key", cache=cache)
+        client.list_snitches()
+        assert Client("key", cache=cache).list_snitches() == [{"token": "1", "name": "one", "tags": []}]
+        mock_request.assert_called_once()
+
+        client.list_snitches(tags=["foo"])
+        assert mock_request.call_count == 2
+
+    @patch("requests.Session.request")
+    def test_delete_writes_through(self, mock_request, tmp_path):
+        mock_request.return_value = Mock()
+        cache = SnitchCache("key", ttl=60, path=str(tmp_path))
+        cache.get_or_fetch(lambda: [{"token": "1", "name": "one", "tags": []}])
+
+        Client("key", cache=cache).delete_snitch("1")
+        assert cache.get() == []
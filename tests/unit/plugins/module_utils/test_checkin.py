@@ -0,0 +1,81 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import pytest
+
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.checkin import (
+    CHECK_IN_URL,
+    CheckInClient,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.client import (
+    RequestError,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.instrumentation import (
+    RequestRecorder,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.retry import (
+    RetryPolicy,
+)
+from ...common.dms_server import FakeDmsServer
+
+
+def make_client(server, **kwargs):
+    kwargs.setdefault("retry_policy", RetryPolicy(max_retries=3, backoff=0))
+    client = CheckInClient(**kwargs)
+    client._url_base = server.checkin_url
+    return client
+
+
+@pytest.fixture(params=["requests", "urllib"])
+def transport(request):
+    return request.param
+
+
+@pytest.fixture
+def server():
+    with FakeDmsServer(snitch_count=20) as server:
+        yield server
+
+
+def test_check_in_url():
+    client = CheckInClient()
+    assert client._check_in_url("abc123") == f"{CHECK_IN_URL}/abc123"
+    assert client._check_in_url("abc123", message="done & dusted", exit_code=0) == (
+        f"{CHECK_IN_URL}/abc123?m=done+%26+dusted&s=0"
+    )
+
+
+class TestCheckInAgainstEmulator:
+    def test_check_in(self, server, transport):
+        client = make_client(server, transport=transport)
+        token = next(iter(server.snitches))
+        assert client.check_in(token) == 202
+        assert client.check_in(token, message="exit 1", exit_code=1) == 202
+        assert server.check_ins == [(token, None, None), (token, "exit 1", "1")]
+        assert server.snitches[token]["status"] == "errored"
+
+    def test_unknown_token(self, server, transport):
+        client = make_client(server, transport=transport)
+        with pytest.raises(RequestError) as e:
+            client.check_in("missing")
+        assert e.value.exception.response.status_code == 404
+
+    def test_retries_with_backoff(self, server, transport):
+        server.add_fault(status=503, path_pattern="^/checkin/", count=2)
+        client = make_client(server, transport=transport)
+        assert client.check_in(next(iter(server.snitches))) == 202
+        assert client.retry_policy.stats["retries"] == 2
+        assert len(server.check_ins) == 1
+
+    def test_check_in_many(self, server, transport):
+        recorder = RequestRecorder()
+        client = make_client(server, transport=transport, recorder=recorder)
+        check_ins = [dict(token=token, exit_code=0) for token in server.snitches] + [dict(token="missing")]
+        tasks = client.check_in_many(check_ins, workers=8)
+
+        assert [task.item["token"] for task in tasks] == [c["token"] for c in check_ins]
+        assert all(task.result["status_code"] == 202 for task in tasks[:-1])
+        assert tasks[-1].failed
+        assert len(server.check_ins) == 20
+        assert recorder.summary()["endpoints"]["GET /check_in"]["calls"] == 21
@@ -7,6 +7,11 @@ from unittest.mock import Mock, patch
 
 from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.client import (
     Client,
+    ConnectionClient,
+    RequestError,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.streaming import (
+    iter_json_array,
 )
 
 
@@ -20,12 +25,33 @@ class TestClient:
         client = Client("test_key")
         assert client.api_key == "test_key"
         assert client._url_base == "https://api.deadmanssnitch.com/v1"
-
-    @patch("requests.request")
+        assert client.pool_size == 10
+        assert client.timeout == 30
+
+    def test_session_is_reused(self):
+        client = Client("test_key", pool_size=4, transport="requests")
+        session = client.transport.session
+        assert client.transport.session is session
+        adapter = session.get_adapter(self.base_url)
+        assert adapter._pool_maxsize == 4
+
+        client.close()
+        assert client.transport._session is None
+        assert client.transport.session is not session
+
+    @patch("requests.Session.request")
+    def test_custom_timeout(self, mock_request):
+        mock_request.return_value = Mock()
+        client = Client("test_key", timeout=5)
+        client.get_snitch("123")
+        assert mock_request.call_args[1]["timeout"] == 5
+
+    @patch("requests.Session.request")
     def test_list_snitches_no_tags(self, mock_request):
         mock_response = Mock()
-        mock_response.json.return_value = {"snitches": [{"id": "1", "name": "test"}]}
+        mock_response.iter_content.return_value = [b'[{"id": "1", "name": "test"}]']
         mock_response.raise_for_status.return_value = None
+        mock_response.links = {}
         mock_request.return_value = mock_response
 
         result = self.client.list_snitches()
@@ -35,14 +61,17 @@ class TestClient:
             method="GET",
             headers={},
             auth=mock.ANY,
+            stream=True,
+            timeout=30,
         )
-        assert result == {"snitches": [{"id": "1", "name": "test"}]}
+        assert result == [{"id": "1", "name": "test"}]
 
-    @patch("requests.request")
+    @patch("requests.Session.request")
     def test_list_snitches_with_tags(self, mock_request):
         mock_response = Mock()
-        mock_response.json.return_value = {"snitches": [{"id": "1", "name": "test"}]}
+        mock_response.iter_content.return_value = [b'[{"id": "1", "name": "test"}]']
         mock_response.raise_for_status.return_value = None
+        mock_response.links = {}
         mock_request.return_value = mock_response
 
         tags = ["tag1", "tag2", "tag3"]
@@ -53,10 +82,12 @@ class TestClient:
             method="GET",
             headers={},
             auth=mock.ANY,
+            stream=True,
+            timeout=30,
         )
-        assert result == {"snitches": [{"id": "1", "name": "test"}]}
+        assert result == [{"id": "1", "name": "test"}]
 
-    @patch("requests.request")
+    @patch("requests.Session.request")
     def test_get_snitch(self, mock_request):
         mock_response = Mock()
         mock_response.json.return_value = {"id": "123", "name": "test_snitch"}
@@ -70,10 +101,11 @@ class TestClient:
             method="GET",
             headers={},
             auth=mock.ANY,
+            timeout=30,
         )
         assert result == {"id": "123", "name": "test_snitch"}
 
-    @patch("requests.request")
+    @patch("requests.Session.request")
     def test_create_snitch_minimal(self, mock_request):
         mock_response = Mock()
         mock_response.json.return_value = {"id": "new_id", "name": "new_snitch"}
@@ -92,11 +124,12 @@ class TestClient:
             method="POST",
             headers={"Content-Type": "application/json"},
             auth=mock.ANY,
+            timeout=30,
             json=expected_data,
         )
         assert result == {"id": "new_id", "name": "new_snitch"}
 
-    @patch("requests.request")
+    @patch("requests.Session.request")
     def test_create_snitch_full(self, mock_request):
         mock_response = Mock()
         mock_response.json.return_value = {"id": "new_id", "name": "full_snitch"}
@@ -126,11 +159,12 @@ class TestClient:
             method="POST",
             headers={"Content-Type": "application/json"},
             auth=mock.ANY,
+            timeout=30,
             json=expected_data,
         )
         assert result == {"id": "new_id", "name": "full_snitch"}
 
-    @patch("requests.request")
+    @patch("requests.Session.request")
     def test_update_snitch_no_changes(self, mock_request):
         mock_response = Mock()
         mock_response.json.return_value = {"id": "123", "name": "updated_snitch"}
@@ -143,11 +177,12 @@ class TestClient:
             url=f"{self.base_url}/snitches/123",
             method="PATCH",
             headers={"Content-Type": "application/json"},
-            auth=mock.ANY
+            auth=mock.ANY,
+            timeout=30,
         )
         assert result == {"id": "123", "name": "updated_snitch"}
 
-    @patch("requests.request")
+    @patch("requests.Session.request")
     def test_update_snitch_with_changes(self, mock_request):
         mock_response = Mock()
         mock_response.json.return_value = {"id": "123", "name": "updated_snitch"}
@@ -178,11 +213,23 @@ class TestClient:
             method="PATCH",
             headers={"Content-Type": "application/json"},
             auth=mock.ANY,
+            timeout=30,
             json=expected_data,
         )
         assert result == {"id": "123", "name": "updated_snitch"}
 
-    @patch("requests.request")
+    @patch("requests.Session.request")
+    def test_update_snitch_clears_fields(self, mock_request):
+        mock_response = Mock()
+        mock_response.json.return_value = {"id": "123", "tags": []}
+        mock_response.raise_for_status.return_value = None
+        mock_request.return_value = mock_response
+
+        self.client.update_snitch(snitch_id="123", notes="", tags=[])
+
+        assert mock_request.call_args[1]["json"] == {"notes": "", "tags": []}
+
+    @patch("requests.Session.request")
     def test_remove_snitch_tag(self, mock_request):
         mock_response = Mock()
         mock_response.json.return_value = {"id": "123", "tags": []}
@@ -196,10 +243,11 @@ class TestClient:
             method="DELETE",
             headers={"Content-Type": "application/json"},
             auth=mock.ANY,
+            timeout=30,
         )
         assert result == {"id": "123", "tags": []}
 
-    @patch("requests.request")
+    @patch("requests.Session.request")
     def test_append_snitch_tags(self, mock_request):
         mock_response = Mock()
         mock_response.json.return_value = {"id": "123", "tags": ["existing", "new_tag"]}
@@ -214,11 +262,12 @@ class TestClient:
             method="POST",
             headers={"Content-Type": "application/json"},
             auth=mock.ANY,
+            timeout=30,
             json=tags_to_add,
         )
         assert result == {"id": "123", "tags": ["existing", "new_tag"]}
 
-    @patch("requests.request")
+    @patch("requests.Session.request")
     def test_replace_snitch_tags(self, mock_request):
         mock_response = Mock()
         mock_response.json.return_value = {"id": "123", "tags": ["tag1", "tag2"]}
@@ -234,11 +283,12 @@ class TestClient:
             method="PATCH",
             headers={"Content-Type": "application/json"},
             auth=mock.ANY,
+            timeout=30,
             json=expected_data,
         )
         assert result == {"id": "123", "tags": ["tag1", "tag2"]}
 
-    @patch("requests.request")
+    @patch("requests.Session.request")
     def test_delete_snitch(self, mock_request):
         mock_response = Mock()
         mock_response.json.return_value = {"deleted": True}
@@ -252,10 +302,11 @@ class TestClient:
             method="DELETE",
             headers={},
             auth=mock.ANY,
+            timeout=30,
         )
         assert result == {"deleted": True}
 
-    @patch("requests.request")
+    @patch("requests.Session.request")
     def test_pause_snitch(self, mock_request):
         mock_response = Mock()
         mock_response.json.return_value = {"id": "123", "status": "paused"}
@@ -269,10 +320,11 @@ class TestClient:
             method="POST",
             headers={},
             auth=mock.ANY,
+            timeout=30,
         )
         assert result == {"id": "123", "status": "paused"}
 
-    @patch("requests.request")
+    @patch("requests.Session.request")
     def test_unpause_snitch(self, mock_request):
         mock_response = Mock()
         mock_response.json.return_value = {"id": "123", "status": "active"}
@@ -286,10 +338,11 @@ class TestClient:
             method="POST",
             headers={},
             auth=mock.ANY,
+            timeout=30,
         )
         assert result == {"id": "123", "status": "active"}
 
-    @patch("requests.request")
+    @patch("requests.Session.request")
     def test_content_type_header_for_post_patch(self, mock_request):
         mock_response = Mock()
         mock_response.json.return_value = {"id": "123"}
@@ -307,3 +360,93 @@ class TestClient:
         headers = call_args[1]["headers"]
         assert "Content-Type" in headers
         assert headers["Content-Type"] == "application/json"
+
+
+class TestConnectionClient:
+    def setup_method(self):
+        with patch("ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.client.Connection") as mock_connection:
+            self.client = ConnectionClient("/tmp/socket")
+            self.connection = mock_connection.return_value
+
+    def test_list_snitches(self):
+        self.connection.send_request.return_value = (200, "OK", [{"token": "1"}])
+        assert self.client.list_snitches(tags=["a", "b"]) == [{"token": "1"}]
+        self.connection.send_request.assert_called_once_with(
+            None, method="GET", path="/v1/snitches?tags=a,b", headers={}
+        )
+
+    def test_create_snitch(self):
+        self.connection.send_request.return_value = (201, "Created", {"token": "1"})
+        self.client.create_snitch(name="foo", interval="hourly")
+        self.connection.send_request.assert_called_once_with(
+            '{"name": "foo", "interval": "hourly"}',
+            method="POST",
+            path="/v1/snitches",
+            headers={"Content-Type": "application/json"},
+        )
+
+    def test_error_status(self):
+        self.connection.send_request.return_value = (404, "Not Found", {"error": "not found"})
+        try:
+            self.client.get_snitch("1")
+        except RequestError as e:
+            assert e.exception.response.status_code == 404
+            assert e.exception.response.json() == {"error": "not found"}
+            assert e.exception.request.url == "/v1/snitches/1"
+        else:
+            raise AssertionError("RequestError was not raised")
+
+
+class TestIterSnitches:
+    def build_response(self, chunks, next_url=None):
+        response = Mock()
+        response.status_code = 200
+        response.raise_for_status.return_value = None
+        response.iter_content.return_value = chunks
+        response.links = {"next": {"url": next_url}} if next_url else {}
+        return response
+
+    def test_iter_json_array(self):
+        body = b'[{"token": "1", "name": "caf\xc3\xa9"}, {"token": "2", "tags": ["a,b", "]"]}]'
+        for size in (1, 3, 7, len(body)):
+            chunks = [body[i:i + size] for i in range(0, len(body), size)]
+            assert list(iter_json_array(chunks)) == [
+                {"token": "1", "name": "café"},
+                {"token": "2", "tags": ["a,b", "]"]},
+            ]
+        assert list(iter_json_array([b" [ ] "])) == []
+
+    def test_iter_json_array_invalid(self):
+        for body in (b'{"snitches": []}', b'[{"token": "1"}', b""):
+            try:
+                list(iter_json_array([body]))
+            except ValueError:
+                pass
+            else:
+                raise AssertionError(f"ValueError was not raised for {body!r}")
+
+    @patch("requests.Session.request")
+    def test_follows_pagination(self, mock_request):
+        mock_request.side_effect = [
+            self.build_response([b'[{"token": "1"}]'], next_url="https://api.deadmanssnitch.com/v1/snitches?page=2"),
+            self.build_response([b'[{"token": "2"}]']),
+        ]
+        client = Client("key")
+        assert [s["token"] for s in client.iter_snitches(tags=["a"])] == ["1", "2"]
+        assert mock_request.call_args_list[0][1]["url"] == "https://api.deadmanssnitch.com/v1/snitches?tags=a"
+        assert mock_request.call_args_list[0][1]["stream"] is True
+        assert mock_request.call_args_list[1][1]["url"] == "https://api.deadmanssnitch.com/v1/snitches?page=2"
+
+    @patch("requests.Session.request")
+    def test_early_termination_closes_response(self, mock_request):
+        def chunks():
+            yield b'[{"token": "1"},'
+            raise AssertionError("the rest of the response should not be read")
+
+        response = self.build_response(chunks(), next_url="https://api.deadmanssnitch.com/v1/snitches?page=2")
+        mock_request.return_value = response
+        snitches = Client("key").iter_snitches()
+        assert next(snitches) == {"token": "1"}
+        snitches.close()
+        response.close.assert_called_once()
+        mock_request.assert_called_once()
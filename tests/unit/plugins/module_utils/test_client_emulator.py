@@ -0,0 +1,113 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import pytest
+
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.cache import (
+    SnitchCache,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.client import (
+    Client,
+    RequestError,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.retry import (
+    RetryPolicy,
+)
+from ...common.dms_server import FakeDmsServer, make_snitch
+
+
+def make_client(server, api_key="key", **kwargs):
+    kwargs.setdefault("retry_policy", RetryPolicy(max_retries=3, backoff=0))
+    client = Client(api_key, **kwargs)
+    client._url_base = server.url
+    return client
+
+
+@pytest.fixture(params=["requests", "urllib"])
+def transport(request):
+    return request.param
+
+
+@pytest.fixture
+def server():
+    with FakeDmsServer(snitch_count=5) as server:
+        yield server
+
+
+class TestClientAgainstEmulator:
+    def test_crud(self, server, transport):
+        client = make_client(server, transport=transport)
+        snitch = client.create_snitch(name="new", interval="hourly", tags=["a"])
+        assert client.get_snitch(snitch["token"])["name"] == "new"
+
+        updated = client.update_snitch(snitch["token"], interval="daily", tags=[])
+        assert updated["interval"] == "daily"
+        assert updated["tags"] == []
+
+        client.delete_snitch(snitch["token"])
+        with pytest.raises(RequestError):
+            client.get_snitch(snitch["token"])
+        assert len(client.list_snitches()) == 5
+
+    def test_tags_and_pause(self, server, transport):
+        client = make_client(server, transport=transport)
+        token = next(iter(server.snitches))
+        assert client.append_snitch_tags(token, ["a", "b"]) == ["a", "b"]
+        assert client.remove_snitch_tag(token, "a") == ["b"]
+        assert client.replace_snitch_tags(token, ["c"])["tags"] == ["c"]
+
+        client.pause_snitch(token)
+        assert server.snitches[token]["status"] == "paused"
+        client.unpause_snitch(token)
+        assert server.snitches[token]["status"] == "pending"
+
+    def test_request_accounting(self, server, transport):
+        client = make_client(server, transport=transport)
+        for token in list(server.snitches)[:3]:
+            client.get_snitch(token)
+        client.list_snitches()
+        assert server.counts == {"GET /v1/snitches/{token}": 3, "GET /v1/snitches": 1}
+
+    def test_retries_injected_faults(self, server, transport):
+        server.add_fault(status=429, retry_after=0)
+        server.add_fault(status=503, count=2)
+        client = make_client(server, transport=transport)
+        assert len(client.list_snitches()) == 5
+        assert [r[2] for r in server.requests] == [429, 503, 503, 200]
+        assert client.retry_policy.stats["retries"] == 3
+
+    def test_bad_api_key(self, server, transport):
+        client = make_client(server, api_key="wrong", transport=transport)
+        with pytest.raises(RequestError) as e:
+            client.list_snitches()
+        assert e.value.exception.response.status_code == 401
+
+    def test_pagination_and_tag_filter(self, transport):
+        with FakeDmsServer(snitch_count=7, page_size=3) as server:
+            server.add_snitch(make_snitch(100, tags=["x", "y"]))
+            client = make_client(server, transport=transport)
+            assert len(list(client.iter_snitches())) == 8
+            assert server.counts["GET /v1/snitches"] == 3
+            assert [s["name"] for s in client.iter_snitches(tags=["x"])] == ["snitch-00100"]
+
+    def test_list_snitches_follows_pagination(self, transport):
+        with FakeDmsServer(snitch_count=17, page_size=7) as server:
+            client = make_client(server, transport=transport)
+            snitches = client.list_snitches()
+            assert [s["name"] for s in snitches] == [f"snitch-{i:05d}" for i in range(17)]
+            assert server.counts["GET /v1/snitches"] == 3
+
+    def test_cached_list_has_every_page(self, tmp_path):
+        with FakeDmsServer(snitch_count=17, page_size=7) as server:
+            client = make_client(server, cache=SnitchCache("key", ttl=60, path=str(tmp_path)))
+            assert len(client.list_snitches()) == 17
+            assert len(make_client(server, cache=SnitchCache("key", ttl=60, path=str(tmp_path))).list_snitches()) == 17
+            assert server.counts["GET /v1/snitches"] == 3
+
+    def test_connection_errors_are_retried(self, transport):
+        with FakeDmsServer() as server:
+            client = make_client(server, transport=transport, retry_policy=RetryPolicy(max_retries=1, backoff=0))
+        with pytest.raises(client.transport.retryable_errors):
+            client.list_snitches()
+        assert client.retry_policy.stats["retries"] == 1
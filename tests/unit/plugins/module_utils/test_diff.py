@@ -0,0 +1,58 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.diff import (
+    build_diff,
+    canonicalize,
+    changed_fields,
+)
+
+LIVE = {
+    "token": "123",
+    "name": "backup",
+    "interval": "daily",
+    "alert_type": "basic",
+    "alert_email": ["a@example.com", "b@example.com"],
+    "notes": None,
+    "tags": ["prod", "db"],
+}
+
+
+class TestCanonicalize:
+    def test_unordered_fields(self):
+        assert canonicalize("tags", ["b", "a", "b"]) == ["a", "b"]
+        assert canonicalize("alert_email", None) == []
+
+    def test_optional_text(self):
+        assert canonicalize("notes", None) == ""
+        assert canonicalize("name", None) is None
+
+
+class TestChangedFields:
+    def test_order_and_duplicates_are_ignored(self):
+        desired = dict(tags=["db", "prod", "db"], alert_email=["b@example.com", "a@example.com"])
+        assert changed_fields(desired, LIVE) == dict()
+
+    def test_unset_fields_are_not_managed(self):
+        assert changed_fields(dict(name=None, interval="daily"), LIVE) == dict()
+
+    def test_only_changed_fields_are_returned(self):
+        desired = dict(name="backup", interval="hourly", notes="", tags=[])
+        assert changed_fields(desired, LIVE) == dict(interval="hourly", tags=[])
+
+
+class TestBuildDiff:
+    def test_update(self):
+        diff = build_diff(LIVE, dict(name="backup", interval="hourly"))
+        assert diff == dict(before=dict(interval="daily"), after=dict(interval="hourly"))
+
+    def test_create(self):
+        diff = build_diff(None, dict(name="new", interval="daily", notes=None))
+        assert diff == dict(before=dict(), after=dict(name="new", interval="daily"))
+
+    def test_delete(self):
+        diff = build_diff(LIVE, None)
+        assert diff["after"] == dict()
+        assert diff["before"]["name"] == "backup"
+        assert "token" not in diff["before"]
@@ -0,0 +1,77 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.cache import (
+    api_key_digest,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.drift import (
+    DriftState,
+    account_fingerprint,
+    desired_hash,
+)
+
+LIVE = {
+    "token": "aaa", "name": "backup", "interval": "daily", "alert_type": "basic", "alert_email": ["b", "a"],
+    "notes": None, "tags": ["prod"], "updated_at": "2025-01-01T00:00:00.000Z",
+}
+DESIRED = dict(name="backup", interval="daily", alert_email=["a", "b"], tags=None, alert_type=None, notes=None)
+
+
+def saved_state(tmp_path):
+    state = DriftState(str(tmp_path / "state.json"), "account")
+    state.record(LIVE, DESIRED)
+    state.advance([LIVE])
+    state.save()
+    return DriftState(str(tmp_path / "state.json"), "account")
+
+
+class TestDriftState:
+    def test_unchanged_after_save(self, tmp_path):
+        state = saved_state(tmp_path)
+        assert state.watermark == LIVE["updated_at"]
+        assert state.is_unchanged(LIVE, DESIRED) is True
+        assert state.report({"aaa": LIVE}) == []
+
+    def test_desired_state_changed(self, tmp_path):
+        state = saved_state(tmp_path)
+        assert state.is_unchanged(LIVE, dict(DESIRED, interval="hourly")) is False
+
+    def test_desired_hash_ignores_order_and_unmanaged_fields(self):
+        assert desired_hash(DESIRED) == desired_hash(dict(DESIRED, alert_email=["b", "a"], state="present"))
+
+    def test_modified_outside_ansible(self, tmp_path):
+        state = saved_state(tmp_path)
+        live = dict(LIVE, interval="hourly", updated_at="2025-01-02T00:00:00.000Z")
+        assert state.is_unchanged(live, DESIRED) is False
+        assert state.report({"aaa": live}) == [dict(
+            id="aaa", name="backup", change="modified", updated_at="2025-01-02T00:00:00.000Z",
+            fields=dict(interval=dict(before="daily", after="hourly")),
+        )]
+
+    def test_touched_without_field_changes(self, tmp_path):
+        state = saved_state(tmp_path)
+        live = dict(LIVE, alert_email=["a", "b"], updated_at="2025-01-02T00:00:00.000Z")
+        assert state.report({"aaa": live}) == []
+
+    def test_deleted_outside_ansible(self, tmp_path):
+        state = saved_state(tmp_path)
+        assert state.report(dict()) == [dict(id="aaa", name="backup", change="deleted", fields=dict())]
+
+    def test_other_account_is_ignored(self, tmp_path):
+        saved_state(tmp_path)
+        state = DriftState(str(tmp_path / "state.json"), "other")
+        assert state.snitches == dict()
+        assert state.is_unchanged(LIVE, DESIRED) is False
+
+    def test_api_key_is_not_stored(self, tmp_path):
+        saved_state(tmp_path)
+        with open(tmp_path / "state.json") as f:
+            assert json.load(f)["account"] == "account"
+
+
+def test_account_fingerprint():
+    assert account_fingerprint("key") == api_key_digest("key")[:16]
+    assert account_fingerprint("key") != account_fingerprint("other")
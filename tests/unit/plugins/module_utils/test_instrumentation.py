@@ -0,0 +1,97 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+
+import pytest
+
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.cache import SnitchCache
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.client import (
+    Client,
+    RequestError,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.instrumentation import (
+    RequestRecorder,
+    endpoint_template,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.retry import RetryPolicy
+from ...common.dms_server import FakeDmsServer
+
+
+@pytest.mark.parametrize("uri, expected", [
+    ("snitches", "/snitches"),
+    ("snitches/abc123", "/snitches/{token}"),
+    ("snitches/abc123/tags/prod", "/snitches/{token}/tags/{tag}"),
+    ("snitches/abc123/pause", "/snitches/{token}/pause"),
+    ("https://api.deadmanssnitch.com/v1/snitches?tags=a&page=2", "/snitches"),
+    ("/v1/snitches/abc123", "/snitches/{token}"),
+])
+def test_endpoint_template(uri, expected):
+    assert endpoint_template(uri) == expected
+
+
+class TestRequestRecorder:
+    def test_summary(self):
+        recorder = RequestRecorder()
+        recorder.record("GET", "/snitches", status=200, bytes=100, latency=0.25)
+        recorder.record("GET", "/snitches", latency=0.01, cache_hit=True)
+        recorder.record("DELETE", "/snitches/{token}", status=404, bytes=10, latency=0.1, retries=1,
+                        error="RequestError")
+
+        summary = recorder.summary()
+        assert summary["calls"] == 3
+        assert summary["cache_hits"] == 1
+        assert summary["retries"] == 1
+        assert summary["bytes"] == 110
+        assert summary["endpoints"]["GET /snitches"]["calls"] == 2
+        assert summary["endpoints"]["DELETE /snitches/{token}"]["errors"] == 1
+
+    def test_trace_file(self, tmp_path):
+        trace_file = tmp_path / "trace.jsonl"
+        recorder = RequestRecorder(trace_file=str(trace_file), context=dict(module="snitch"))
+        recorder.record("GET", "/snitches", status=200)
+        recorder.record("GET", "/snitches/{token}", status=200)
+
+        lines = [json.loads(line) for line in trace_file.read_text().splitlines()]
+        assert [line["endpoint"] for line in lines] == ["/snitches", "/snitches/{token}"]
+        assert lines[0]["module"] == "snitch"
+        assert "pid" in lines[0]
+
+
+class TestClientInstrumentation:
+    def make_client(self, server, **kwargs):
+        client = Client("key", retry_policy=RetryPolicy(backoff=0), recorder=RequestRecorder(), **kwargs)
+        client._url_base = server.url
+        return client
+
+    def test_records_calls(self):
+        with FakeDmsServer(snitch_count=3, page_size=2) as server:
+            server.add_fault(status=503, method="GET", path_pattern="/snitches/")
+            client = self.make_client(server)
+            token = next(iter(server.snitches))
+
+            client.get_snitch(token)
+            assert len(list(client.iter_snitches())) == 3
+            with pytest.raises(RequestError):
+                client.get_snitch("missing")
+
+        requests = client.recorder.requests
+        assert [(r["method"], r["endpoint"], r["status"]) for r in requests] == [
+            ("GET", "/snitches/{token}", 200),
+            ("GET", "/snitches", 200),
+            ("GET", "/snitches", 200),
+            ("GET", "/snitches/{token}", 404),
+        ]
+        assert requests[0]["retries"] == 1
+        assert requests[1]["bytes"] > 0
+        assert requests[3]["error"] == "RequestError"
+
+    def test_records_cache_hits(self, tmp_path):
+        with FakeDmsServer(snitch_count=3) as server:
+            client = self.make_client(server, cache=SnitchCache("key", ttl=60, path=str(tmp_path)))
+            client.list_snitches()
+            client.list_snitches()
+
+        assert [r["cache_hit"] for r in client.recorder.requests] == [False, True]
+        assert server.counts["GET /v1/snitches"] == 1
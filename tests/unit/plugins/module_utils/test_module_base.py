@@ -2,15 +2,24 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
-import mock
 from unittest.mock import Mock, patch
 
+import pytest
+
 from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.module_base import (
     ModuleBase,
 )
 from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.client import (
+    ConnectionClient,
     RequestError
 )
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.snapshot import (
+    SnapshotClient,
+    write_snapshot,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.transport import (
+    UrllibTransport
+)
 from ansible.module_utils.basic import env_fallback
 
 
@@ -48,10 +57,108 @@ class TestModuleBase:
         assert module.params == mock_module.params
         assert module.client is not None
 
+    def test_init_client_options(self):
+        mock_module = Mock(params={"api_key": "test_key", "pool_size": 2, "timeout": 5.0})
+        module = ModuleBase(mock_module)
+        assert module.client.pool_size == 2
+        assert module.client.timeout == 5.0
+        assert module.client.cache is None
+
+    def test_init_retry_options(self):
+        mock_module = Mock(params={
+            "api_key": "test_key", "max_retries": 5, "retry_backoff": 0.5, "retry_all_methods": True, "deadline": 60.0
+        })
+        policy = ModuleBase(mock_module).client.retry_policy
+        assert policy.max_retries == 5
+        assert policy.backoff == 0.5
+        assert policy.retry_all_methods is True
+        assert policy.deadline == 60.0
+
+    def test_init_rate_limit(self, tmp_path):
+        mock_module = Mock(params={"api_key": "test_key", "rate_limit": 2.5, "cache_path": str(tmp_path)})
+        limiter = ModuleBase(mock_module).client.rate_limiter
+        assert limiter.rate == 2.5
+        assert limiter.burst == 2
+        assert limiter.directory == str(tmp_path)
+
+    def test_exit_json_includes_retries(self):
+        mock_module = Mock(params={"api_key": "test_key"})
+        module = ModuleBase(mock_module)
+        module.client.retry_policy.retries = 2
+        module.exit_json(changed=True)
+        mock_module.exit_json.assert_called_once_with(
+            changed=True, api_retries={"retries": 2, "wait_seconds": 0.0}
+        )
+
+    def test_exit_json_includes_api_stats(self):
+        mock_module = Mock(params={"api_key": "test_key", "api_stats": True})
+        module = ModuleBase(mock_module)
+        module.client.recorder.record("GET", "/snitches", status=200, bytes=10, latency=0.5)
+        module.exit_json(changed=False)
+        api_stats = mock_module.exit_json.call_args[1]["api_stats"]
+        assert api_stats["calls"] == 1
+        assert api_stats["endpoints"]["GET /snitches"]["seconds"] == 0.5
+
+    def test_no_recorder_by_default(self):
+        module = ModuleBase(Mock(params={"api_key": "test_key"}))
+        assert module.client.recorder is None
+
+    def test_init_with_httpapi_connection(self):
+        mock_module = Mock(params={"api_key": None}, _socket_path="/tmp/socket")
+        module = ModuleBase(mock_module)
+        assert isinstance(module.client, ConnectionClient)
+        mock_module.fail_json.assert_not_called()
+
+    def test_init_requires_api_key_without_connection(self):
+        mock_module = Mock(params={"api_key": None}, _socket_path=None)
+        ModuleBase(mock_module)
+        mock_module.fail_json.assert_called_once()
+        assert "api_key is required" in mock_module.fail_json.call_args[1]["msg"]
+
+    def test_init_cache(self, tmp_path):
+        mock_module = Mock(params={"api_key": "test_key", "cache_ttl": 60, "cache_path": str(tmp_path)})
+        module = ModuleBase(mock_module)
+        assert module.client.cache is not None
+        assert module.client.cache.ttl == 60
+        assert module.client.cache.directory == str(tmp_path)
+
     def test_base_argument_spec(self):
         assert ModuleBase.base_argument_spec() == {
             "api_key": dict(
-                type="str", required=True, fallback=(env_fallback, ["DMS_API_KEY"]), no_log=True
+                type="str", required=False, fallback=(env_fallback, ["DMS_API_KEY"]), no_log=True
+            ),
+            "pool_size": dict(type="int", required=False, default=10),
+            "timeout": dict(type="float", required=False, default=30),
+            "cache_ttl": dict(
+                type="int", required=False, default=0, fallback=(env_fallback, ["DMS_CACHE_TTL"])
+            ),
+            "cache_path": dict(
+                type="path", required=False, fallback=(env_fallback, ["DMS_CACHE_PATH"])
+            ),
+            "max_retries": dict(type="int", required=False, default=3),
+            "retry_backoff": dict(type="float", required=False, default=1.0),
+            "retry_all_methods": dict(type="bool", required=False, default=False),
+            "deadline": dict(type="float", required=False),
+            "rate_limit": dict(
+                type="float", required=False, default=0, fallback=(env_fallback, ["DMS_RATE_LIMIT"])
+            ),
+            "rate_limit_burst": dict(type="int", required=False),
+            "api_stats": dict(
+                type="bool", required=False, default=False, fallback=(env_fallback, ["DMS_API_STATS"])
+            ),
+            "api_trace_file": dict(
+                type="path", required=False, fallback=(env_fallback, ["DMS_API_TRACE_FILE"])
+            ),
+            "profile": dict(
+                type="str", required=False, choices=["cpu", "memory", "all"], fallback=(env_fallback, ["DMS_PROFILE"])
+            ),
+            "profile_dir": dict(
+                type="path", required=False, fallback=(env_fallback, ["DMS_PROFILE_DIR"])
+            ),
+            "profile_top": dict(type="int", required=False, default=25),
+            "transport": dict(
+                type="str", required=False, default="auto", choices=["auto", "requests", "urllib"],
+                fallback=(env_fallback, ["DMS_TRANSPORT"])
             ),
         }
 
@@ -102,6 +209,7 @@ class TestModuleBase:
         assert kwargs["request_body"] == "body"
         assert kwargs["code"] == 404
         assert kwargs["response"] == {"error": "not found"}
+        assert kwargs["api_retries"] == {"retries": 0, "wait_seconds": 0.0}
 
     def test_fail_unable_to_find_snitch_id(self):
         mock_module = Mock(params={"api_key": "test_key", "id": "foo", "name": None})
@@ -126,9 +234,44 @@ class TestModuleBase:
         assert kwargs["searched"]["value"] == "bar"
 
     def test_init_calls_handle_missing_lib_if_requests_missing(self):
-        # Patch HAS_REQUESTS to False and check handle_missing_lib is called
-        with patch("ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.module_base.HAS_REQUESTS", False):
+        # Patch requests_available to False and check handle_missing_lib is called
+        with patch("ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.module_base.requests_available",
+                   return_value=False):
             with patch.object(ModuleBase, "handle_missing_lib") as mock_handle_missing_lib:
-                mock_module = Mock(params={"api_key": "test_key"})
+                mock_module = Mock(params={"api_key": "test_key", "transport": "requests"})
                 ModuleBase(mock_module)
-                mock_handle_missing_lib.assert_called_once_with("requests", mock.ANY)
+                mock_handle_missing_lib.assert_called_once_with("requests")
+
+    def test_init_falls_back_to_urllib_if_requests_missing(self):
+        with patch("ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.transport.requests_available",
+                   return_value=False):
+            module = ModuleBase(Mock(params={"api_key": "test_key", "transport": "auto"}))
+        assert isinstance(module.client.transport, UrllibTransport)
+        module.module.fail_json.assert_not_called()
+
+
+class TestModuleBaseSnapshot:
+    def _snapshot(self, tmp_path):
+        path = str(tmp_path / "snitches.jsonl.gz")
+        write_snapshot(path, [{"token": "aaa", "name": "one", "tags": []}])
+        return path
+
+    def test_snapshot_client_in_check_mode(self, tmp_path):
+        mock_module = Mock(params={"snapshot_path": self._snapshot(tmp_path)}, check_mode=True)
+        module = ModuleBase(mock_module)
+        assert isinstance(module.client, SnapshotClient)
+        mock_module.fail_json.assert_not_called()
+
+    def test_snapshot_requires_check_mode(self, tmp_path):
+        mock_module = Mock(params={"snapshot_path": self._snapshot(tmp_path)}, check_mode=False)
+        mock_module.fail_json.side_effect = SystemExit
+        with pytest.raises(SystemExit):
+            ModuleBase(mock_module)
+        assert "check mode" in mock_module.fail_json.call_args[1]["msg"]
+
+    def test_read_only_module_can_use_snapshot(self, tmp_path):
+        class ReadOnlyModule(ModuleBase):
+            READ_ONLY = True
+
+        mock_module = Mock(params={"snapshot_path": self._snapshot(tmp_path)}, check_mode=False)
+        assert isinstance(ReadOnlyModule(mock_module).client, SnapshotClient)
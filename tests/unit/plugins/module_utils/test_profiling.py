@@ -0,0 +1,45 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import pstats
+import tracemalloc
+
+import pytest
+from unittest.mock import Mock
+
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.module_base import ModuleBase
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.profiling import Profiler
+
+
+def busy():
+    return sorted(str(i) for i in range(10000))
+
+
+class TestProfiler:
+    def test_cpu_profile(self, tmp_path):
+        with Profiler("cpu", directory=str(tmp_path), top=5, name="snitch") as profiler:
+            busy()
+
+        assert sorted(p.rsplit(".", 1)[-1] for p in profiler.files) == ["pstats", "txt"]
+        stats = pstats.Stats(profiler.files[0])
+        assert any(func[2] == "busy" for func in stats.stats)
+        summary = open(profiler.files[1]).read()
+        assert summary.startswith("snitch:")
+        assert "Top 5 functions" in summary
+
+    def test_memory_profile_is_written_on_exit(self, tmp_path):
+        with pytest.raises(SystemExit):
+            with Profiler("memory", directory=str(tmp_path)) as profiler:
+                busy()
+                raise SystemExit(0)
+
+        assert not tracemalloc.is_tracing()
+        assert len(profiler.files) == 1
+        assert "Peak traced memory" in open(profiler.files[0]).read()
+
+    def test_profiled_is_opt_in(self, tmp_path):
+        assert not isinstance(ModuleBase.profiled(Mock(params={"profile": None})), Profiler)
+        profiler = ModuleBase.profiled(Mock(params={"profile": "all", "profile_dir": str(tmp_path)}, _name="tags"))
+        assert profiler.cpu and profiler.memory
+        assert profiler.name == "tags"
@@ -0,0 +1,51 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from unittest.mock import patch
+
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.rate_limit import (
+    TokenBucket,
+)
+
+
+class TestTokenBucket:
+    @patch("time.sleep")
+    @patch("time.time", return_value=1000.0)
+    def test_burst_then_wait(self, mock_time, mock_sleep, tmp_path):
+        bucket = TokenBucket("key", rate=2, burst=2, path=str(tmp_path))
+        assert bucket.acquire() is True
+        assert bucket.acquire() is True
+        mock_sleep.assert_not_called()
+
+        def advance(seconds):
+            mock_time.return_value += seconds
+        mock_sleep.side_effect = advance
+
+        assert bucket.acquire() is True
+        mock_sleep.assert_called_once_with(0.5)
+        assert bucket.wait_seconds == 0.5
+
+    @patch("time.time", return_value=1000.0)
+    def test_state_is_shared(self, mock_time, tmp_path):
+        first = TokenBucket("key", rate=1, burst=1, path=str(tmp_path))
+        second = TokenBucket("key", rate=1, burst=1, path=str(tmp_path))
+        other_key = TokenBucket("other", rate=1, burst=1, path=str(tmp_path))
+
+        assert first.acquire(timeout=0) is True
+        assert second.acquire(timeout=0) is False
+        assert other_key.acquire(timeout=0) is True
+
+    @patch("time.time", return_value=1000.0)
+    def test_refill_is_capped_at_burst(self, mock_time, tmp_path):
+        bucket = TokenBucket("key", rate=1, burst=2, path=str(tmp_path))
+        bucket.acquire()
+        mock_time.return_value = 5000.0
+        assert bucket.acquire(timeout=0) and bucket.acquire(timeout=0)
+        assert bucket.acquire(timeout=0) is False
+
+    def test_corrupt_state_resets_bucket(self, tmp_path):
+        bucket = TokenBucket("key", rate=1, burst=1, path=str(tmp_path))
+        with open(bucket.state_file, "w") as f:
+            f.write("not json")
+        assert bucket.acquire(timeout=0) is True
@@ -0,0 +1,105 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import pytest
+import requests
+from unittest.mock import Mock, patch
+
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.client import (
+    Client,
+    RequestError,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.retry import (
+    DeadlineExceededError,
+    RetryPolicy,
+    parse_retry_after,
+)
+
+
+def build_response(status_code, headers=None):
+    response = Mock(status_code=status_code, headers=headers or {})
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(response=response)
+    response.json.return_value = {"status": status_code}
+    return response
+
+
+class TestRetryPolicy:
+    def test_parse_retry_after(self):
+        assert parse_retry_after("5") == 5.0
+        assert parse_retry_after("-1") == 0.0
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after(None) is None
+
+    def test_should_retry(self):
+        policy = RetryPolicy(max_retries=2)
+        assert policy.should_retry("GET", 0, status_code=503)
+        assert policy.should_retry("GET", 0, error=Exception())
+        assert not policy.should_retry("GET", 2, status_code=503)
+        assert not policy.should_retry("GET", 0, status_code=404)
+        assert not policy.should_retry("POST", 0, status_code=503)
+        assert not policy.should_retry("PATCH", 0, error=Exception())
+        assert policy.should_retry("POST", 0, status_code=429)
+        assert RetryPolicy(retry_all_methods=True).should_retry("POST", 0, status_code=503)
+
+    def test_get_wait(self):
+        policy = RetryPolicy(backoff=1.0, max_backoff=5.0)
+        assert policy.get_wait(0, status_code=429, headers={"Retry-After": "3"}) == 3.0
+        assert policy.get_wait(0, status_code=429, headers={"Retry-After": "7200"}) == 5.0
+        for attempt in range(10):
+            assert 0 <= policy.get_wait(attempt, status_code=500, headers={"Retry-After": "7"}) <= 5.0
+
+    @patch("time.sleep")
+    def test_wait_respects_deadline(self, mock_sleep):
+        policy = RetryPolicy(deadline=10)
+        assert policy.wait(0, status_code=429, headers={"Retry-After": "2"}) is True
+        assert policy.wait(0, status_code=429, headers={"Retry-After": "20"}) is False
+        mock_sleep.assert_called_once_with(2.0)
+        assert policy.stats == {"retries": 1, "wait_seconds": 2.0}
+
+    def test_check_deadline(self):
+        policy = RetryPolicy(deadline=10)
+        policy.check_deadline()
+        policy._deadline_at = 0
+        with pytest.raises(DeadlineExceededError):
+            policy.check_deadline()
+
+
+@patch("time.sleep")
+class TestClientRetries:
+    @patch("requests.Session.request")
+    def test_retries_server_errors(self, mock_request, mock_sleep):
+        responses = [build_response(502), build_response(503, {"Retry-After": "1"}), build_response(200)]
+        mock_request.side_effect = responses
+        client = Client("key")
+        assert client.get_snitch("1") == {"status": 200}
+        assert mock_request.call_count == 3
+        assert client.retry_policy.retries == 2
+        # The responses that are retried are closed, so their connections go back to the pool
+        assert [r.close.call_count for r in responses] == [1, 1, 0]
+
+    @patch("requests.Session.request")
+    def test_gives_up_after_max_retries(self, mock_request, mock_sleep):
+        mock_request.return_value = build_response(500)
+        client = Client("key", retry_policy=RetryPolicy(max_retries=1))
+        with pytest.raises(RequestError):
+            client.list_snitches()
+        assert mock_request.call_count == 2
+
+    @patch("requests.Session.request")
+    def test_does_not_retry_post(self, mock_request, mock_sleep):
+        mock_request.return_value = build_response(500)
+        with pytest.raises(RequestError):
+            Client("key").create_snitch(name="foo", interval="hourly")
+        mock_request.assert_called_once()
+
+    @patch("requests.Session.request")
+    def test_retries_connection_errors(self, mock_request, mock_sleep):
+        mock_request.side_effect = [requests.exceptions.ConnectionError(), build_response(200)]
+        assert Client("key").delete_snitch("1") == {"status": 200}
+
+        mock_request.side_effect = requests.exceptions.ConnectionError()
+        with pytest.raises(requests.exceptions.ConnectionError):
+            Client("key", retry_policy=RetryPolicy(max_retries=0)).delete_snitch("1")
@@ -0,0 +1,31 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.selectors import (
+    SnitchSelector,
+)
+
+SNITCHES = [
+    {"token": "1", "name": "backup-db", "status": "failed", "tags": ["prod", "db"]},
+    {"token": "2", "name": "backup-files", "status": "healthy", "tags": ["prod"]},
+    {"token": "3", "name": "report", "status": "failed", "tags": []},
+]
+
+
+class TestSnitchSelector:
+    def test_match_tags_requires_every_tag(self):
+        selected = SnitchSelector(match_tags=["prod", "db"]).select(SNITCHES)
+        assert [s["token"] for s in selected] == ["1"]
+
+    def test_name_regex(self):
+        selected = SnitchSelector(name_regex="^backup-").select(SNITCHES)
+        assert [s["token"] for s in selected] == ["1", "2"]
+
+    def test_criteria_are_combined(self):
+        selected = SnitchSelector(name_regex="backup", status=["failed"]).select(SNITCHES)
+        assert [s["token"] for s in selected] == ["1"]
+
+    def test_is_requested(self):
+        assert SnitchSelector.is_requested(dict(match_tags=None, name_regex=None, status=None)) is False
+        assert SnitchSelector.is_requested(dict(match_tags=[], name_regex=None)) is True
@@ -0,0 +1,64 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.shaping import (
+    ResultShaper,
+)
+
+SNITCHES = [
+    {"token": "1", "name": "charlie", "created_at": "2021-01-03T00:00:00Z"},
+    {"token": "2", "name": "alpha", "created_at": None},
+    {"token": "3", "name": "bravo", "created_at": "2021-01-01T00:00:00Z"},
+    {"token": "4", "name": "delta", "created_at": "2021-01-02T00:00:00Z"},
+]
+
+
+def tokens(snitches):
+    return [s["token"] for s in snitches]
+
+
+class TestResultShaper:
+    def test_not_requested(self):
+        assert ResultShaper.from_params(dict(offset=0, sort_order="asc", count_only=False)).requested is False
+
+    def test_projection(self):
+        shaped = ResultShaper(fields=["name", "missing"]).shape(SNITCHES[:1])
+        assert shaped == [{"name": "charlie", "missing": None}]
+
+    def test_limit_stops_iterating(self):
+        seen = []
+
+        def stream():
+            for snitch in SNITCHES:
+                seen.append(snitch["token"])
+                yield snitch
+
+        assert tokens(ResultShaper(limit=1, offset=1).shape(stream())) == ["2"]
+        assert seen == ["1", "2"]
+
+    def test_sort(self):
+        assert tokens(ResultShaper(sort_by="name").shape(SNITCHES)) == ["2", "3", "1", "4"]
+        assert tokens(ResultShaper(sort_by="name", sort_order="desc").shape(SNITCHES)) == ["4", "1", "3", "2"]
+
+    def test_missing_values_are_last(self):
+        assert tokens(ResultShaper(sort_by="created_at").shape(SNITCHES)) == ["3", "4", "1", "2"]
+        assert tokens(ResultShaper(sort_by="created_at", sort_order="desc").shape(SNITCHES)) == ["1", "4", "3", "2"]
+
+    def test_sort_with_limit_matches_full_sort(self):
+        for order in ("asc", "desc"):
+            full = ResultShaper(sort_by="created_at", sort_order=order).shape(SNITCHES)
+            page = ResultShaper(sort_by="created_at", sort_order=order, limit=2, offset=1).shape(SNITCHES)
+            assert page == full[1:3]
+
+    def test_sort_by_field_that_is_not_returned(self):
+        shaped = ResultShaper(fields=["token"], sort_by="name", limit=2).shape(SNITCHES)
+        assert shaped == [{"token": "2"}, {"token": "3"}]
+
+    def test_count(self):
+        assert ResultShaper.count(iter(SNITCHES)) == 4
+
+    def test_validate(self):
+        assert ResultShaper(limit=-1).validate() == "limit must be zero or greater"
+        assert ResultShaper(offset=-1).validate() == "offset must be zero or greater"
+        assert ResultShaper(limit=0).validate() is None
@@ -0,0 +1,100 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import gzip
+import json
+
+import pytest
+
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.client import (
+    RequestError,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.snapshot import (
+    SnapshotClient,
+    SnapshotError,
+    index_path,
+    read_index,
+    write_snapshot,
+)
+
+SNITCHES = [
+    {"token": "aaa", "name": "backup-db", "tags": ["prod", "db"]},
+    {"token": "bbb", "name": "backup-web", "tags": ["prod"]},
+    {"token": "ccc", "name": "report", "tags": []},
+]
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    path = str(tmp_path / "snitches.jsonl.gz")
+    write_snapshot(path, iter(SNITCHES))
+    return path
+
+
+class TestWriteSnapshot:
+    def test_files(self, snapshot):
+        with gzip.open(snapshot, "rt") as f:
+            assert [json.loads(line) for line in f] == SNITCHES
+        with open(index_path(snapshot)) as f:
+            index = json.load(f)
+        assert index["count"] == 3
+        assert index["tokens"] == {"aaa": 0, "bbb": 1, "ccc": 2}
+        assert index["names"]["report"] == 2
+
+    def test_unchanged_snapshot_is_not_replaced(self, snapshot):
+        index, changed = write_snapshot(snapshot, iter(SNITCHES))
+        assert changed is False
+        assert index == read_index(snapshot)
+
+        index, changed = write_snapshot(snapshot, iter(SNITCHES[:2]))
+        assert changed is True
+        assert read_index(snapshot)["count"] == 2
+
+    def test_failed_write_keeps_old_snapshot(self, snapshot):
+        def broken():
+            yield SNITCHES[0]
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            write_snapshot(snapshot, broken())
+        assert SnapshotClient(snapshot).list_snitches() == SNITCHES
+
+
+class TestSnapshotClient:
+    def test_list_and_iter(self, snapshot):
+        client = SnapshotClient(snapshot)
+        assert client.list_snitches() == SNITCHES
+        assert [s["token"] for s in client.iter_snitches(tags=["prod", "db"])] == ["aaa"]
+
+    def test_get_snitch(self, snapshot):
+        client = SnapshotClient(snapshot)
+        assert client.get_snitch("bbb") == SNITCHES[1]
+        with pytest.raises(RequestError) as e:
+            client.get_snitch("zzz")
+        assert e.value.exception.response.status_code == 404
+
+    def test_get_snitch_with_stale_index(self, snapshot):
+        client = SnapshotClient(snapshot)
+        # The data file was replaced after the index was read, and the snitches moved
+        with gzip.open(snapshot, "wt") as f:
+            for snitch in reversed(SNITCHES):
+                f.write(json.dumps(snitch) + "\n")
+        assert client.get_snitch("aaa") == SNITCHES[0]
+        assert client.get_snitch("ccc") == SNITCHES[2]
+
+        with gzip.open(snapshot, "wt") as f:
+            f.write(json.dumps(SNITCHES[1]) + "\n")
+        with pytest.raises(RequestError):
+            client.get_snitch("ccc")
+
+    def test_read_only(self, snapshot):
+        client = SnapshotClient(snapshot)
+        with pytest.raises(SnapshotError):
+            client.update_snitch(snitch_id="aaa", name="new")
+        with pytest.raises(SnapshotError):
+            client.remove_snitch_tag(snitch_id="aaa", tag="prod")
+
+    def test_missing_snapshot(self, tmp_path):
+        with pytest.raises(SnapshotError):
+            SnapshotClient(str(tmp_path / "missing.jsonl.gz"))
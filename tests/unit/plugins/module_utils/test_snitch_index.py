@@ -0,0 +1,78 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import pytest
+
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.snitch_index import (
+    SnitchIndex,
+    TagQueryError,
+    parse_tag_query,
+)
+
+SNITCHES = [
+    {"token": "1", "name": "backup-db", "status": "failed", "interval": "daily", "alert_type": "basic",
+     "tags": ["prod", "db"]},
+    {"token": "2", "name": "backup-files", "status": "healthy", "interval": "hourly", "alert_type": "smart",
+     "tags": ["prod", "web"]},
+    {"token": "3", "name": "report", "status": "failed", "interval": "daily", "alert_type": "basic",
+     "tags": ["legacy", "team a"]},
+    {"token": "4", "name": "cleanup", "status": "paused", "interval": "weekly", "alert_type": "basic",
+     "tags": None},
+]
+
+
+def tokens(snitches):
+    return [s["token"] for s in snitches]
+
+
+class TestParseTagQuery:
+    def test_precedence(self):
+        assert parse_tag_query("a OR b AND NOT c") == (
+            "or", ("tag", "a"), ("and", ("tag", "b"), ("not", ("tag", "c")))
+        )
+
+    def test_parentheses_and_quotes(self):
+        assert parse_tag_query('("team a" OR "NOT") AND b') == (
+            "and", ("or", ("tag", "team a"), ("tag", "NOT")), ("tag", "b")
+        )
+
+    def test_lower_case_words_are_tags(self):
+        assert parse_tag_query("and") == ("tag", "and")
+
+    @pytest.mark.parametrize("query", ["", "a AND", "(a OR b", "a b", "a )", 'a AND "b', "NOT"])
+    def test_invalid(self, query):
+        with pytest.raises(TagQueryError):
+            parse_tag_query(query)
+
+
+class TestSnitchIndex:
+    @pytest.mark.parametrize("query,expected", [
+        ("prod", ["1", "2"]),
+        ("prod AND NOT db", ["2"]),
+        ("db OR legacy", ["1", "3"]),
+        ("NOT prod", ["3", "4"]),
+        ('prod AND (db OR web) OR "team a"', ["1", "2", "3"]),
+        ("missing", []),
+    ])
+    def test_tag_query(self, query, expected):
+        assert tokens(SnitchIndex(SNITCHES).query(tag_query=query)) == expected
+
+    def test_field_filters(self):
+        index = SnitchIndex(SNITCHES)
+        assert tokens(index.query(status=["failed", "paused"])) == ["1", "3", "4"]
+        assert tokens(index.query(interval=["daily"], alert_type=["basic"])) == ["1", "3"]
+        assert tokens(index.query(status=[])) == []
+
+    def test_name_pattern_is_combined(self):
+        index = SnitchIndex(SNITCHES)
+        assert tokens(index.query(tag_query="prod", name_pattern="db$")) == ["1"]
+        assert tokens(index.query(status=["failed"], name_pattern="^re")) == ["3"]
+
+    def test_no_criteria_returns_everything(self):
+        assert tokens(SnitchIndex(SNITCHES).query()) == ["1", "2", "3", "4"]
+
+    def test_fields_are_indexed_on_demand(self):
+        index = SnitchIndex(SNITCHES)
+        index.query(status=["failed"])
+        assert list(index._indexes) == ["status"]
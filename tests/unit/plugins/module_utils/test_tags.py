@@ -0,0 +1,78 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import pytest
+from unittest.mock import MagicMock
+
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.tags import (
+    TagPlan,
+    desired_tags,
+)
+
+
+class TestDesiredTags:
+    def test_present(self):
+        assert desired_tags(["a", "b"], ["c", "a"], "present") == ["a", "b", "c"]
+
+    def test_absent(self):
+        assert desired_tags(["a", "b", "c"], ["b", "x"], "absent") == ["a", "c"]
+
+    def test_absolute(self):
+        assert desired_tags(["a"], ["c", "b", "c"], "absolute") == ["c", "b"]
+
+
+class TestTagPlan:
+    def test_no_changes(self):
+        plan = TagPlan("123", ["a", "b"], ["a", "b"])
+        client = MagicMock()
+        assert plan.changed is False
+        assert plan.apply(client) == 0
+        assert client.mock_calls == []
+
+    def test_auto_uses_replace_for_many_removals(self):
+        plan = TagPlan("123", ["a", "b", "c", "d"], ["a"])
+        assert plan.per_tag_calls == 3
+        assert plan.resolve_strategy("auto") == "replace"
+
+        client = MagicMock()
+        assert plan.apply(client) == 1
+        client.replace_snitch_tags.assert_called_once_with(snitch_id="123", tags=["a"])
+        client.remove_snitch_tag.assert_not_called()
+
+    def test_auto_uses_per_tag_for_additions(self):
+        plan = TagPlan("123", ["a"], ["a", "b", "c"])
+        client = MagicMock()
+        assert plan.resolve_strategy("auto") == "per_tag"
+        assert plan.apply(client) == 1
+        client.append_snitch_tags.assert_called_once_with(snitch_id="123", tags=["b", "c"])
+
+    def test_per_tag(self):
+        plan = TagPlan("123", ["a", "b", "c"], ["c", "d"])
+        client = MagicMock()
+        assert plan.apply(client, strategy="per_tag", workers=4) == 3
+        client.append_snitch_tags.assert_called_once_with(snitch_id="123", tags=["d"])
+        assert sorted(c.kwargs["tag"] for c in client.remove_snitch_tag.call_args_list) == ["a", "b"]
+        client.cache.update_tags.assert_called_once_with("123", ["c", "d"])
+
+    def test_per_tag_failure_is_raised_after_other_calls(self):
+        plan = TagPlan("123", ["a", "b"], [])
+        client = MagicMock()
+        client.remove_snitch_tag.side_effect = [Exception("boom"), None]
+        with pytest.raises(Exception, match="boom"):
+            plan.apply(client, strategy="per_tag", workers=1)
+        assert client.remove_snitch_tag.call_count == 2
+
+    def test_per_tag_failure_invalidates_cache(self):
+        plan = TagPlan("123", ["a", "b"], ["c"])
+        client = MagicMock()
+
+        def remove_snitch_tag(snitch_id, tag):
+            if tag == "b":
+                raise Exception("boom")
+
+        client.remove_snitch_tag.side_effect = remove_snitch_tag
+        with pytest.raises(Exception, match="boom"):
+            plan.apply(client, strategy="per_tag", workers=4)
+        client.cache.invalidate.assert_called_once_with()
+        client.cache.update_tags.assert_not_called()
@@ -0,0 +1,54 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import os
+import subprocess
+import sys
+
+# Modules that are only needed once a request is sent, or only for optional features
+DEFERRED_IMPORTS = [
+    "requests",
+    "urllib3",
+    "ansible.module_utils.urls",
+    "concurrent.futures",
+    "cProfile",
+    "pstats",
+    "gzip",
+]
+# The time allowed for importing every module in the collection, on top of AnsibleModule itself
+MAX_IMPORT_SECONDS = 0.5
+
+IMPORT_SCRIPT = """
+import json
+import sys
+import time
+
+import ansible.module_utils.basic
+
+start = time.perf_counter()
+from ansible_collections.mikemorency.deadmanssnitch.plugins.modules import (
+    snitch, snitch_action, snitch_bulk, snitch_checkin, snitch_info, snitch_snapshot, snitch_sync, tags
+)
+elapsed = time.perf_counter() - start
+print(json.dumps(dict(seconds=elapsed, loaded=[m for m in json.loads(sys.argv[1]) if m in sys.modules])))
+"""
+
+
+def import_modules():
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+    output = subprocess.check_output(
+        [sys.executable, "-c", IMPORT_SCRIPT, json.dumps(DEFERRED_IMPORTS)], env=env, text=True
+    )
+    return json.loads(output)
+
+
+def test_module_imports_are_deferred():
+    assert import_modules()["loaded"] == []
+
+
+def test_module_import_time():
+    # Use the fastest of a few runs, so a busy machine does not fail the test
+    seconds = min(import_modules()["seconds"] for _ in range(3))
+    assert seconds < MAX_IMPORT_SECONDS
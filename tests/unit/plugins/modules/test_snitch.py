@@ -0,0 +1,64 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible_collections.mikemorency.deadmanssnitch.plugins.modules.snitch import (
+    main as module_main
+)
+from ...common.utils import run_module, ModuleTestCase
+
+
+class TestSnitch(ModuleTestCase):
+
+    def __prepare(self, mocker):
+        self.mock_client_class = mocker.patch(
+            "ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.module_base.Client"
+        )
+        self.mock_client_instance = mocker.MagicMock()
+        self.mock_client_class.return_value = self.mock_client_instance
+        self.mock_client_instance.iter_snitches.return_value = iter([
+            {
+                "token": "111",
+                "name": "existing",
+                "interval": "hourly",
+                "alert_type": "basic",
+                "alert_email": ["b@example.com", "a@example.com"],
+                "notes": None,
+                "tags": ["b", "a"],
+            },
+        ])
+        self.mock_client_instance.update_snitch.return_value = {"token": "111", "name": "existing"}
+
+    def test_no_changes_when_order_differs(self, mocker):
+        self.__prepare(mocker)
+        module_args = dict(
+            name="existing", tags=["a", "b"], alert_email=["a@example.com", "b@example.com"], notes=""
+        )
+        result = run_module(module_entry=module_main, module_args=module_args)
+        assert result["changed"] is False
+        self.mock_client_instance.update_snitch.assert_not_called()
+
+    def test_update_sends_only_changed_fields(self, mocker):
+        self.__prepare(mocker)
+        module_args = dict(name="existing", interval="daily", tags=[], alert_type="basic")
+        result = run_module(module_entry=module_main, module_args=module_args)
+        assert result["changed"] is True
+        self.mock_client_instance.update_snitch.assert_called_once_with(
+            snitch_id="111", interval="daily", tags=[]
+        )
+
+    def test_check_mode_with_diff(self, mocker):
+        self.__prepare(mocker)
+        module_args = dict(name="existing", interval="daily", _ansible_check_mode=True, _ansible_diff=True)
+        result = run_module(module_entry=module_main, module_args=module_args)
+        assert result["changed"] is True
+        assert result["diff"] == dict(before=dict(interval="hourly"), after=dict(interval="daily"))
+        self.mock_client_instance.update_snitch.assert_not_called()
+
+    def test_check_mode_create(self, mocker):
+        self.__prepare(mocker)
+        module_args = dict(name="new", interval="daily", _ansible_check_mode=True)
+        result = run_module(module_entry=module_main, module_args=module_args)
+        assert result["changed"] is True
+        assert result["snitch"] == dict(name="new")
+        self.mock_client_instance.create_snitch.assert_not_called()
@@ -0,0 +1,94 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible_collections.mikemorency.deadmanssnitch.plugins.modules.snitch_action import (
+    main as module_main
+)
+from ...common.utils import run_module, ModuleTestCase
+
+
+class TestSnitchAction(ModuleTestCase):
+
+    def __prepare(self, mocker):
+        self.mock_client_class = mocker.patch(
+            "ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.module_base.Client"
+        )
+        self.mock_client_instance = mocker.MagicMock()
+        self.mock_client_class.return_value = self.mock_client_instance
+        snitches = [
+            {"token": "111", "name": "db-backup", "status": "healthy", "tags": ["backups"]},
+            {"token": "222", "name": "db-report", "status": "paused", "tags": ["backups"]},
+            {"token": "333", "name": "web-backup", "status": "failed", "tags": ["backups"]},
+            {"token": "444", "name": "db-other", "status": "healthy", "tags": []},
+        ]
+        self.mock_client_instance.iter_snitches.side_effect = lambda tags=None: iter(snitches)
+
+    def outcomes(self, result):
+        return [(r["id"], r["outcome"]) for r in result["snitches"]]
+
+    def test_pause_is_idempotent(self, mocker):
+        self.__prepare(mocker)
+        module_args = dict(action="pause", match_tags=["backups"], name_regex="^db-")
+        result = run_module(module_entry=module_main, module_args=module_args)
+        assert result["changed"] is True
+        assert self.outcomes(result) == [("111", "paused"), ("222", "skipped")]
+        assert result["api_calls"] == 1
+        assert result["snitches"][1]["status"] == "paused"
+        self.mock_client_instance.pause_snitch.assert_called_once_with(snitch_id="111")
+
+    def test_unpause_only_paused(self, mocker):
+        self.__prepare(mocker)
+        result = run_module(module_entry=module_main, module_args=dict(action="unpause", match_tags=["backups"]))
+        assert self.outcomes(result) == [("111", "skipped"), ("222", "unpaused"), ("333", "skipped")]
+        self.mock_client_instance.unpause_snitch.assert_called_once_with(snitch_id="222")
+
+    def test_delete_by_ids(self, mocker):
+        self.__prepare(mocker)
+        module_args = dict(action="delete", ids=["333", "999", "111"], workers=2)
+        result = run_module(module_entry=module_main, module_args=module_args)
+        assert self.outcomes(result) == [("111", "deleted"), ("333", "deleted"), ("999", "not_found")]
+        assert result["snitches"][2]["failed"] is False
+        assert self.mock_client_instance.delete_snitch.call_count == 2
+
+    def test_missing_id_fails_pause(self, mocker):
+        self.__prepare(mocker)
+        result = run_module(module_entry=module_main, module_args=dict(action="pause", ids=["999"]),
+                            expect_success=False)
+        assert result["msg"] == "Failed to pause 1 of 1 snitches"
+
+    def test_check_mode(self, mocker):
+        self.__prepare(mocker)
+        module_args = dict(action="pause", status=["healthy"], _ansible_check_mode=True)
+        result = run_module(module_entry=module_main, module_args=module_args)
+        assert result["changed"] is True
+        assert self.outcomes(result) == [("111", "paused"), ("444", "paused")]
+        assert result["api_calls"] == 0
+        self.mock_client_instance.pause_snitch.assert_not_called()
+
+    def test_failed_call(self, mocker):
+        self.__prepare(mocker)
+
+        def pause_snitch(snitch_id):
+            if snitch_id == "444":
+                raise Exception("boom")
+
+        self.mock_client_instance.pause_snitch.side_effect = pause_snitch
+        result = run_module(module_entry=module_main, module_args=dict(action="pause", status=["healthy"]),
+                            expect_success=False)
+        assert result["msg"] == "Failed to pause 1 of 2 snitches"
+        assert self.outcomes(result) == [("111", "paused"), ("444", "failed")]
+        assert result["snitches"][1]["msg"] == "boom"
+
+    def test_requires_a_selector(self, mocker):
+        self.__prepare(mocker)
+        result = run_module(module_entry=module_main, module_args=dict(action="delete"), expect_success=False)
+        assert "one of the following is required" in result["msg"]
+
+    def test_invalid_regex(self, mocker):
+        self.__prepare(mocker)
+        module_args = dict(action="pause", name_regex="(")
+        result = run_module(module_entry=module_main, module_args=module_args, expect_success=False)
+        assert result["msg"].startswith("name_regex is not a valid regular expression")
+        self.mock_client_instance.list_snitches.assert_not_called()
+        self.mock_client_instance.iter_snitches.assert_not_called()
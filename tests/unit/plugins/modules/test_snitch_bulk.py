@@ -0,0 +1,121 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible_collections.mikemorency.deadmanssnitch.plugins.modules.snitch_bulk import (
+    main as module_main
+)
+from ...common.dms_server import FakeDmsServer, client_class_for
+from ...common.utils import run_module, ModuleTestCase
+
+
+class TestSnitchBulk(ModuleTestCase):
+
+    def __prepare(self, mocker):
+        self.mock_client_class = mocker.patch(
+            "ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.module_base.Client"
+        )
+        self.mock_client_instance = mocker.MagicMock()
+        self.mock_client_class.return_value = self.mock_client_instance
+        self.mock_client_instance.list_snitches.return_value = [
+            {
+                "token": "111",
+                "name": "existing",
+                "interval": "hourly",
+                "alert_type": "basic",
+                "alert_email": [],
+                "notes": "",
+                "tags": ["a"],
+            },
+            {
+                "token": "222",
+                "name": "to-delete",
+                "interval": "daily",
+                "alert_type": "basic",
+                "alert_email": [],
+                "notes": "",
+                "tags": [],
+            },
+        ]
+        self.mock_client_instance.create_snitch.return_value = {"token": "333", "name": "new"}
+        self.mock_client_instance.update_snitch.return_value = {"token": "111", "name": "existing"}
+
+    def test_reconcile(self, mocker):
+        self.__prepare(mocker)
+        module_args = dict(snitches=[
+            dict(name="existing", interval="hourly"),
+            dict(name="new", interval="daily"),
+            dict(name="to-delete", state="absent"),
+            dict(name="missing", state="absent"),
+        ])
+        result = run_module(module_entry=module_main, module_args=module_args)
+
+        assert result["changed"] is True
+        assert [r["action"] for r in result["results"]] == ["none", "create", "delete", "none"]
+        assert result["results"][1]["id"] == "333"
+        self.mock_client_instance.list_snitches.assert_called_once()
+        self.mock_client_instance.update_snitch.assert_not_called()
+        self.mock_client_instance.create_snitch.assert_called_once()
+        self.mock_client_instance.delete_snitch.assert_called_once_with(snitch_id="222")
+
+    def test_duplicate_items(self, mocker):
+        self.__prepare(mocker)
+        module_args = dict(snitches=[dict(name="existing"), dict(name="existing", state="absent")])
+        result = run_module(module_entry=module_main, module_args=module_args, expect_success=False)
+        assert "More than one item" in result["msg"]
+        self.mock_client_instance.list_snitches.assert_not_called()
+
+    def test_duplicate_items_by_name_and_id(self, mocker):
+        self.__prepare(mocker)
+        module_args = dict(snitches=[dict(name="existing", notes="a"), dict(id="111", notes="b")])
+        result = run_module(module_entry=module_main, module_args=module_args, expect_success=False)
+        assert result["msg"] == "More than one item in snitches targets the snitch with id 111"
+        self.mock_client_instance.update_snitch.assert_not_called()
+
+    def test_update_by_id(self, mocker):
+        self.__prepare(mocker)
+        module_args = dict(snitches=[dict(id="111", notes="changed")])
+        result = run_module(module_entry=module_main, module_args=module_args)
+        assert result["changed"] is True
+        assert result["results"][0]["action"] == "update"
+        self.mock_client_instance.update_snitch.assert_called_once()
+
+    def test_check_mode(self, mocker):
+        self.__prepare(mocker)
+        module_args = dict(
+            snitches=[dict(name="new", interval="daily"), dict(name="to-delete", state="absent")],
+            _ansible_check_mode=True,
+        )
+        result = run_module(module_entry=module_main, module_args=module_args)
+        assert result["changed"] is True
+        self.mock_client_instance.create_snitch.assert_not_called()
+        self.mock_client_instance.delete_snitch.assert_not_called()
+
+    def test_item_failure(self, mocker):
+        self.__prepare(mocker)
+        self.mock_client_instance.create_snitch.side_effect = Exception("API Error")
+        module_args = dict(snitches=[
+            dict(name="new", interval="daily"),
+            dict(name="to-delete", state="absent"),
+        ])
+        result = run_module(module_entry=module_main, module_args=module_args, expect_success=False)
+        assert "1 of 2" in result["msg"]
+        assert result["results"][0]["failed"] is True
+        assert result["results"][0]["msg"] == "API Error"
+        assert result["results"][1]["changed"] is True
+
+    def test_paginated_account(self, mocker):
+        with FakeDmsServer(snitch_count=17, page_size=7) as server:
+            mocker.patch(
+                "ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.module_base.Client",
+                side_effect=client_class_for(server),
+            )
+            module_args = dict(snitches=[
+                dict(name="snitch-00015", interval="hourly"),
+                dict(name="snitch-00016", state="absent"),
+            ])
+            result = run_module(module_entry=module_main, module_args=module_args)
+
+            assert [r["action"] for r in result["results"]] == ["update", "delete"]
+            assert len(server.snitches) == 16
+            assert server.counts["POST /v1/snitches"] == 0
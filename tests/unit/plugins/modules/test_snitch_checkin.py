@@ -0,0 +1,96 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.checkin import (
+    CheckInClient,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.modules.snitch_checkin import (
+    main as module_main
+)
+from ...common.utils import run_module, ModuleTestCase
+
+
+class TestSnitchCheckin(ModuleTestCase):
+
+    def __prepare(self, mocker):
+        self.mock_client_class = mocker.patch(
+            "ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.module_base.Client"
+        )
+        self.mock_client_instance = mocker.MagicMock()
+        self.mock_client_class.return_value = self.mock_client_instance
+        snitches = [
+            {"token": "111", "name": "db-backup"},
+            {"token": "222", "name": "db-report"},
+            {"token": "333", "name": "web-backup"},
+        ]
+        self.listed = []
+
+        def iter_snitches(tags=None):
+            for snitch in snitches:
+                self.listed.append(snitch["token"])
+                yield snitch
+
+        self.mock_client_instance.iter_snitches.side_effect = iter_snitches
+        self.check_in = mocker.patch.object(CheckInClient, "check_in", autospec=True, return_value=202)
+
+    def checked_in(self):
+        return sorted(call.args[1] for call in self.check_in.call_args_list)
+
+    def test_tokens_do_not_use_the_api(self, mocker):
+        self.__prepare(mocker)
+        module_args = dict(tokens=["111", "222", "111"], message="done", exit_code=0)
+        result = run_module(module_entry=module_main, module_args=module_args)
+        assert result["changed"] is True
+        assert [(r["token"], r["status_code"]) for r in result["check_ins"]] == [("111", 202), ("222", 202)]
+        assert result["check_ins_sent"] == 2
+        assert self.checked_in() == ["111", "222"]
+        self.check_in.assert_any_call(mocker.ANY, "111", message="done", exit_code=0)
+        self.mock_client_class.assert_not_called()
+
+    def test_names_are_looked_up(self, mocker):
+        self.__prepare(mocker)
+        module_args = dict(tokens=["222"], names=["db-report", "db-backup"], workers=1)
+        result = run_module(module_entry=module_main, module_args=module_args)
+        assert [(r["token"], r["name"]) for r in result["check_ins"]] == [("222", "db-report"), ("111", "db-backup")]
+        assert self.checked_in() == ["111", "222"]
+        # The list is only read until every name is found
+        assert self.listed == ["111", "222"]
+
+    def test_missing_name_fails(self, mocker):
+        self.__prepare(mocker)
+        result = run_module(module_entry=module_main, module_args=dict(names=["db-backup", "nope"]),
+                            expect_success=False)
+        assert result["msg"] == "Failed to check in 1 of 2 snitches"
+        assert result["check_ins"][1]["msg"] == "Unable to find snitch with name nope"
+        assert self.checked_in() == ["111"]
+
+    def test_failed_check_in(self, mocker):
+        self.__prepare(mocker)
+
+        def check_in(client, token, message=None, exit_code=None):
+            if token == "333":
+                raise Exception("boom")
+            return 202
+
+        self.check_in.side_effect = check_in
+        result = run_module(module_entry=module_main, module_args=dict(tokens=["111", "333"]),
+                            expect_success=False)
+        assert result["msg"] == "Failed to check in 1 of 2 snitches"
+        assert result["check_ins"][1]["failed"] is True
+        assert result["check_ins"][1]["msg"] == "boom"
+        assert result["check_ins"][0]["changed"] is True
+
+    def test_check_mode(self, mocker):
+        self.__prepare(mocker)
+        module_args = dict(tokens=["111"], names=["web-backup"], _ansible_check_mode=True)
+        result = run_module(module_entry=module_main, module_args=module_args)
+        assert result["changed"] is True
+        assert result["check_ins_sent"] == 0
+        assert result["check_ins"][1]["status_code"] is None
+        self.check_in.assert_not_called()
+
+    def test_requires_tokens_or_names(self, mocker):
+        self.__prepare(mocker)
+        result = run_module(module_entry=module_main, module_args=dict(message="hi"), expect_success=False)
+        assert "one of the following is required" in result["msg"]
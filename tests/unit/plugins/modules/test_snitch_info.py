@@ -2,6 +2,12 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.client import (
+    HTTPStatusError,
+    RequestError,
+    RequestInfo,
+    ResponseInfo,
+)
 from ansible_collections.mikemorency.deadmanssnitch.plugins.modules.snitch_info import (
     main as module_main
 )
@@ -22,13 +28,14 @@ class TestSnitchInfo(ModuleTestCase):
     def test_no_match(self, mocker):
         self.__prepare(mocker)
         self.mock_client_instance.list_snitches.return_value = []
+        self.mock_client_instance.iter_snitches.return_value = []
         self.mock_client_instance.get_snitch.return_value = None
 
         module_args = dict(name="test-snitch")
         result = run_module(module_entry=module_main, module_args=module_args)
         assert result["changed"] is False
         assert result["snitches"] == []
-        self.mock_client_instance.list_snitches.assert_called_once()
+        self.mock_client_instance.iter_snitches.assert_called_once()
 
         module_args = dict(id="test-snitch")
         result = run_module(module_entry=module_main, module_args=module_args)
@@ -57,14 +64,14 @@ class TestSnitchInfo(ModuleTestCase):
             "created_at": "2021-01-01T00:00:00Z",
             "updated_at": "2021-01-01T00:00:00Z",
         }
-        self.mock_client_instance.list_snitches.return_value = [mock_snitch]
+        self.mock_client_instance.iter_snitches.return_value = [mock_snitch]
 
         module_args = dict(name="test-snitch")
         result = run_module(module_entry=module_main, module_args=module_args)
 
         assert result["changed"] is False
         assert result["snitches"] == [mock_snitch]
-        self.mock_client_instance.list_snitches.assert_called_once()
+        self.mock_client_instance.iter_snitches.assert_called_once()
 
     def test_snitch_by_id_success(self, mocker):
         self.__prepare(mocker)
@@ -177,7 +184,7 @@ class TestSnitchInfo(ModuleTestCase):
 
     def test_client_exception_handling(self, mocker):
         self.__prepare(mocker)
-        self.mock_client_instance.list_snitches.side_effect = Exception("API Error")
+        self.mock_client_instance.iter_snitches.side_effect = Exception("API Error")
 
         module_args = dict(name="test-snitch")
         result = run_module(
@@ -254,7 +261,7 @@ class TestSnitchInfo(ModuleTestCase):
                 "updated_at": "2021-01-02T00:00:00Z",
             },
         ]
-        self.mock_client_instance.list_snitches.return_value = mock_snitches
+        self.mock_client_instance.iter_snitches.return_value = mock_snitches
 
         module_args = dict(name="test-snitch")
         result = run_module(module_entry=module_main, module_args=module_args)
@@ -262,7 +269,7 @@ class TestSnitchInfo(ModuleTestCase):
         assert result["changed"] is False
         # Should only return the first match due to break statement in get_snitch_by_name
         assert result["snitches"] == [mock_snitches[0]]
-        self.mock_client_instance.list_snitches.assert_called_once()
+        self.mock_client_instance.iter_snitches.assert_called_once()
 
     def test_empty_tags_list(self, mocker):
         self.__prepare(mocker)
@@ -274,3 +281,160 @@ class TestSnitchInfo(ModuleTestCase):
         assert result["changed"] is False
         assert result["snitches"] == []
         self.mock_client_instance.list_snitches.assert_called_once_with()
+
+    def test_lookups_with_list(self, mocker):
+        self.__prepare(mocker)
+        self.mock_client_instance.cache = None
+        mock_snitches = [
+            {"token": "aaa", "name": "first"},
+            {"token": "bbb", "name": "second"},
+        ]
+        self.mock_client_instance.list_snitches.return_value = mock_snitches
+
+        module_args = dict(names=["second", "missing"], ids=["aaa", "zzz"])
+        result = run_module(module_entry=module_main, module_args=module_args)
+
+        assert result["strategy"] == "list"
+        assert result["lookups"] == [
+            {"name": "second", "found": True, "snitch": mock_snitches[1]},
+            {"name": "missing", "found": False, "snitch": None},
+            {"id": "aaa", "found": True, "snitch": mock_snitches[0]},
+            {"id": "zzz", "found": False, "snitch": None},
+        ]
+        assert result["snitches"] == [mock_snitches[1], mock_snitches[0]]
+        self.mock_client_instance.list_snitches.assert_called_once_with()
+        self.mock_client_instance.get_snitch.assert_not_called()
+
+    def test_lookups_with_get(self, mocker):
+        self.__prepare(mocker)
+        self.mock_client_instance.cache = None
+        not_found = RequestError(HTTPStatusError(
+            RequestInfo(url="https://api.deadmanssnitch.com/v1/snitches/zzz", method="GET"),
+            ResponseInfo(status_code=404, reason="Not Found"),
+        ))
+
+        def get_snitch(snitch_id):
+            if snitch_id == "zzz":
+                raise not_found
+            return {"token": snitch_id, "name": f"snitch-{snitch_id}"}
+
+        self.mock_client_instance.get_snitch.side_effect = get_snitch
+
+        module_args = dict(ids=["bbb", "zzz", "aaa", "bbb"])
+        result = run_module(module_entry=module_main, module_args=module_args)
+
+        assert result["strategy"] == "get"
+        assert [(lookup["id"], lookup["found"]) for lookup in result["lookups"]] == [
+            ("bbb", True), ("zzz", False), ("aaa", True), ("bbb", True),
+        ]
+        assert self.mock_client_instance.get_snitch.call_count == 3
+        self.mock_client_instance.list_snitches.assert_not_called()
+
+    def test_lookups_plan(self, mocker):
+        self.__prepare(mocker)
+        self.mock_client_instance.cache = None
+        self.mock_client_instance.list_snitches.return_value = []
+
+        # More IDs than workers are found with a single list
+        result = run_module(module_entry=module_main, module_args=dict(ids=["a", "b", "c"], workers=2))
+        assert result["strategy"] == "list"
+        self.mock_client_instance.get_snitch.assert_not_called()
+
+        # A cached list is always used
+        self.mock_client_instance.cache = mocker.MagicMock()
+        result = run_module(module_entry=module_main, module_args=dict(ids=["a"]))
+        assert result["strategy"] == "list"
+        self.mock_client_instance.get_snitch.assert_not_called()
+
+    def test_lookups_get_error(self, mocker):
+        self.__prepare(mocker)
+        self.mock_client_instance.cache = None
+        self.mock_client_instance.get_snitch.side_effect = RequestError(Exception("boom"))
+
+        result = run_module(module_entry=module_main, module_args=dict(ids=["a"]), expect_success=False)
+        assert result["failed"] is True
+        assert "Failed to get snitches" in result["msg"]
+
+    def test_filters(self, mocker):
+        self.__prepare(mocker)
+        mock_snitches = [
+            {"token": "aaa", "name": "backup-db", "status": "failed", "interval": "daily", "tags": ["prod", "db"]},
+            {"token": "bbb", "name": "backup-web", "status": "healthy", "interval": "daily", "tags": ["prod"]},
+            {"token": "ccc", "name": "report", "status": "failed", "interval": "hourly", "tags": ["prod"]},
+        ]
+        self.mock_client_instance.list_snitches.return_value = mock_snitches
+
+        module_args = dict(tag_query="prod AND NOT db", status=["failed", "healthy"], name_pattern="^backup")
+        result = run_module(module_entry=module_main, module_args=module_args)
+        assert result["snitches"] == [mock_snitches[1]]
+        self.mock_client_instance.list_snitches.assert_called_once_with()
+
+        self.mock_client_instance.list_snitches.reset_mock()
+        module_args = dict(tags=["prod"], interval=["daily"])
+        result = run_module(module_entry=module_main, module_args=module_args)
+        assert result["snitches"] == mock_snitches[:2]
+        self.mock_client_instance.list_snitches.assert_called_once_with(tags=["prod"])
+
+    def test_invalid_filters(self, mocker):
+        self.__prepare(mocker)
+
+        result = run_module(module_entry=module_main, module_args=dict(tag_query="prod AND"), expect_success=False)
+        assert result["msg"].startswith("Invalid tag_query")
+
+        result = run_module(module_entry=module_main, module_args=dict(name_pattern="("), expect_success=False)
+        assert result["msg"].startswith("Invalid name_pattern")
+        self.mock_client_instance.list_snitches.assert_not_called()
+
+    def test_shaping_streams_the_response(self, mocker):
+        self.__prepare(mocker)
+        mock_snitches = [
+            {"token": "aaa", "name": "charlie", "tags": ["prod"]},
+            {"token": "bbb", "name": "alpha", "tags": ["prod"]},
+            {"token": "ccc", "name": "bravo", "tags": []},
+        ]
+        self.mock_client_instance.iter_snitches.side_effect = lambda tags=None: iter(mock_snitches)
+
+        module_args = dict(fields=["name"], sort_by="name", limit=2)
+        result = run_module(module_entry=module_main, module_args=module_args)
+        assert result["snitches"] == [{"name": "alpha"}, {"name": "bravo"}]
+        self.mock_client_instance.list_snitches.assert_not_called()
+
+        module_args = dict(tags=["prod"], count_only=True)
+        result = run_module(module_entry=module_main, module_args=module_args)
+        assert result["count"] == 3
+        assert result["snitches"] == []
+        self.mock_client_instance.iter_snitches.assert_called_with(tags=["prod"])
+
+    def test_shaping_lookups(self, mocker):
+        self.__prepare(mocker)
+        self.mock_client_instance.cache = None
+        self.mock_client_instance.list_snitches.return_value = [
+            {"token": "aaa", "name": "first", "notes": "x"},
+        ]
+
+        module_args = dict(names=["first", "missing"], fields=["token"])
+        result = run_module(module_entry=module_main, module_args=module_args)
+        assert result["lookups"] == [
+            {"name": "first", "found": True, "snitch": {"token": "aaa"}},
+            {"name": "missing", "found": False, "snitch": None},
+        ]
+        assert result["snitches"] == [{"token": "aaa"}]
+
+    def test_shaping_lookups_sorts_by_a_field_that_is_not_returned(self, mocker):
+        self.__prepare(mocker)
+        self.mock_client_instance.cache = None
+        self.mock_client_instance.list_snitches.return_value = [
+            {"token": "aaa", "name": "x", "created_at": "2025-02-01"},
+            {"token": "bbb", "name": "y", "created_at": "2025-01-01"},
+            {"token": "ccc", "name": "z", "created_at": "2025-03-01"},
+        ]
+
+        module_args = dict(names=["x", "y", "z"], fields=["name"], sort_by="created_at")
+        result = run_module(module_entry=module_main, module_args=module_args)
+        assert result["snitches"] == [{"name": "y"}, {"name": "x"}, {"name": "z"}]
+        assert result["lookups"][0]["snitch"] == {"name": "x"}
+
+    def test_invalid_limit(self, mocker):
+        self.__prepare(mocker)
+        result = run_module(module_entry=module_main, module_args=dict(limit=-1), expect_success=False)
+        assert result["msg"] == "limit must be zero or greater"
@@ -0,0 +1,97 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import os
+
+from ansible_collections.mikemorency.deadmanssnitch.plugins.modules.snitch_snapshot import (
+    main as module_main
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.modules.snitch import (
+    main as snitch_main
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.modules.snitch_info import (
+    main as snitch_info_main
+)
+from ...common.utils import run_module, ModuleTestCase
+
+SNITCHES = [
+    {"token": "aaa", "name": "backup-db", "interval": "daily", "alert_type": "basic",
+     "alert_email": [], "notes": None, "tags": ["prod"]},
+    {"token": "bbb", "name": "report", "interval": "hourly", "alert_type": "basic",
+     "alert_email": [], "notes": None, "tags": []},
+]
+
+
+class TestSnitchSnapshot(ModuleTestCase):
+
+    def __prepare(self, mocker):
+        self.mock_client_class = mocker.patch(
+            "ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.module_base.Client"
+        )
+        self.mock_client_instance = mocker.MagicMock()
+        self.mock_client_class.return_value = self.mock_client_instance
+        self.mock_client_instance.iter_snitches.side_effect = lambda tags=None: iter(
+            [snitch for snitch in SNITCHES if set(tags or []).issubset(snitch["tags"])]
+        )
+
+    def test_snapshot(self, mocker, tmp_path):
+        self.__prepare(mocker)
+        path = str(tmp_path / "snitches.jsonl.gz")
+        result = run_module(module_entry=module_main, module_args=dict(path=path))
+        assert result["changed"] is True
+        assert result["count"] == 2
+        assert result["index_path"] == path + ".index"
+        assert os.path.exists(path)
+
+    def test_unchanged_snapshot_is_kept(self, mocker, tmp_path):
+        self.__prepare(mocker)
+        path = str(tmp_path / "snitches.jsonl.gz")
+        first = run_module(module_entry=module_main, module_args=dict(path=path))
+        mtime = os.stat(path).st_mtime_ns
+
+        result = run_module(module_entry=module_main, module_args=dict(path=path))
+        assert result["changed"] is False
+        assert result["created_at"] == first["created_at"]
+        assert os.stat(path).st_mtime_ns == mtime
+
+        result = run_module(module_entry=module_main, module_args=dict(path=path, tags=["prod"]))
+        assert result["changed"] is True
+
+    def test_check_mode(self, mocker, tmp_path):
+        self.__prepare(mocker)
+        path = str(tmp_path / "snitches.jsonl.gz")
+        result = run_module(module_entry=module_main, module_args=dict(path=path, _ansible_check_mode=True))
+        assert result["changed"] is True
+        assert not os.path.exists(path)
+        self.mock_client_instance.iter_snitches.assert_not_called()
+
+    def test_missing_directory(self, mocker, tmp_path):
+        self.__prepare(mocker)
+        path = str(tmp_path / "missing" / "snitches.jsonl.gz")
+        result = run_module(module_entry=module_main, module_args=dict(path=path), expect_success=False)
+        assert "does not exist" in result["msg"]
+
+    def test_modules_read_the_snapshot(self, mocker, tmp_path):
+        self.__prepare(mocker)
+        path = str(tmp_path / "snitches.jsonl.gz")
+        run_module(module_entry=module_main, module_args=dict(path=path))
+        self.mock_client_class.reset_mock()
+
+        result = run_module(module_entry=snitch_info_main, module_args=dict(snapshot_path=path, names=["report"]))
+        assert result["snitches"] == [SNITCHES[1]]
+
+        module_args = dict(snapshot_path=path, name="backup-db", interval="hourly", _ansible_check_mode=True)
+        result = run_module(module_entry=snitch_main, module_args=module_args)
+        assert result["changed"] is True
+        assert result["snitch"]["id"] == "aaa"
+        self.mock_client_class.assert_not_called()
+
+    def test_changes_require_check_mode(self, mocker, tmp_path):
+        self.__prepare(mocker)
+        path = str(tmp_path / "snitches.jsonl.gz")
+        run_module(module_entry=module_main, module_args=dict(path=path))
+
+        module_args = dict(snapshot_path=path, name="backup-db", interval="hourly")
+        result = run_module(module_entry=snitch_main, module_args=module_args, expect_success=False)
+        assert "check mode" in result["msg"]
@@ -0,0 +1,207 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import pytest
+
+from ansible_collections.mikemorency.deadmanssnitch.plugins.modules.snitch_sync import (
+    SnitchSyncModule,
+    main as module_main
+)
+from ...common.dms_server import FakeDmsServer, client_class_for
+from ...common.dms_server import make_snitch as make_live_snitch
+from ...common.utils import run_module, AnsibleFailJson, ModuleTestCase
+
+
+def make_snitch(token, name, tags, interval="daily"):
+    return {
+        "token": token,
+        "name": name,
+        "interval": interval,
+        "alert_type": "basic",
+        "alert_email": [],
+        "notes": None,
+        "tags": tags,
+    }
+
+
+class TestSnitchSync(ModuleTestCase):
+
+    def __prepare(self, mocker):
+        self.mock_client_class = mocker.patch(
+            "ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.module_base.Client"
+        )
+        self.mock_client_instance = mocker.MagicMock()
+        self.mock_client_class.return_value = self.mock_client_instance
+        self.mock_client_instance.list_snitches.return_value = [
+            make_snitch("111", "keep", ["ansible"]),
+            make_snitch("222", "change", ["ansible"], interval="hourly"),
+            make_snitch("333", "stale", ["ansible"]),
+            make_snitch("444", "unmanaged", []),
+        ]
+        self.mock_client_instance.create_snitch.return_value = make_snitch("555", "new", ["ansible"])
+        self.mock_client_instance.update_snitch.return_value = make_snitch("222", "change", ["ansible"])
+
+    def desired(self):
+        return [
+            dict(name="keep", interval="daily", tags=[]),
+            dict(name="change", interval="daily"),
+            dict(name="new", interval="daily", tags=["x"]),
+        ]
+
+    def actions(self, result):
+        return [(r["name"], r["action"]) for r in result["results"]]
+
+    def test_sync_with_owner_tag(self, mocker):
+        self.__prepare(mocker)
+        module_args = dict(snitches=self.desired(), owner_tag="ansible", prune=True)
+        result = run_module(module_entry=module_main, module_args=module_args)
+
+        assert result["changed"] is True
+        assert self.actions(result) == [("keep", "none"), ("change", "update"), ("new", "create"), ("stale", "delete")]
+        assert result["plan"] == dict(create=1, update=1, delete=1, unchanged=1, api_calls=3)
+        self.mock_client_instance.list_snitches.assert_called_once_with()
+        self.mock_client_instance.update_snitch.assert_called_once_with(snitch_id="222", interval="daily")
+        assert self.mock_client_instance.create_snitch.call_args[1]["tags"] == ["x", "ansible"]
+        self.mock_client_instance.delete_snitch.assert_called_once_with(snitch_id="333")
+
+    def test_prune_without_owner_tag(self, mocker):
+        self.__prepare(mocker)
+        module_args = dict(snitches=self.desired(), prune=True)
+        result = run_module(module_entry=module_main, module_args=module_args)
+        deleted = [r["id"] for r in result["results"] if r["action"] == "delete"]
+        assert deleted == ["333", "444"]
+
+    def test_prune_keeps_live_snitches_with_duplicate_names(self, mocker):
+        self.__prepare(mocker)
+        self.mock_client_instance.list_snitches.return_value.append(make_snitch("666", "keep", ["ansible"]))
+        warn = mocker.patch("ansible.module_utils.basic.AnsibleModule.warn")
+        module_args = dict(snitches=self.desired(), owner_tag="ansible", prune=True)
+        result = run_module(module_entry=module_main, module_args=module_args)
+
+        assert [r["id"] for r in result["results"] if r["action"] == "delete"] == ["333"]
+        assert result["results"][0]["id"] == "111"
+        assert "The snitch keep (666) was not deleted" in warn.call_args[0][0]
+        self.mock_client_instance.delete_snitch.assert_called_once_with(snitch_id="333")
+
+    def test_no_prune(self, mocker):
+        self.__prepare(mocker)
+        result = run_module(module_entry=module_main, module_args=dict(snitches=self.desired(), owner_tag="ansible"))
+        assert result["plan"]["delete"] == 0
+        self.mock_client_instance.delete_snitch.assert_not_called()
+
+    def test_max_delete(self, mocker):
+        self.__prepare(mocker)
+        module_args = dict(snitches=self.desired(), prune=True, max_delete=1)
+        result = run_module(module_entry=module_main, module_args=module_args, expect_success=False)
+        assert "more than max_delete" in result["msg"]
+        assert result["plan"]["delete"] == 2
+        self.mock_client_instance.create_snitch.assert_not_called()
+        self.mock_client_instance.delete_snitch.assert_not_called()
+
+    def test_plan_only(self, mocker):
+        self.__prepare(mocker)
+        warn = mocker.patch("ansible.module_utils.basic.AnsibleModule.warn")
+        module_args = dict(snitches=self.desired(), prune=True, max_delete=1, plan_only=True)
+        result = run_module(module_entry=module_main, module_args=module_args)
+        assert result["changed"] is False
+        assert result["plan"] == dict(create=1, update=2, delete=2, unchanged=0, api_calls=5)
+        assert "more than max_delete" in warn.call_args[0][0]
+        self.mock_client_instance.create_snitch.assert_not_called()
+        self.mock_client_instance.update_snitch.assert_not_called()
+        self.mock_client_instance.delete_snitch.assert_not_called()
+
+    def test_check_mode(self, mocker):
+        self.__prepare(mocker)
+        module_args = dict(snitches=self.desired(), owner_tag="ansible", prune=True, _ansible_check_mode=True)
+        result = run_module(module_entry=module_main, module_args=module_args)
+        assert result["changed"] is True
+        self.mock_client_instance.update_snitch.assert_not_called()
+        self.mock_client_instance.delete_snitch.assert_not_called()
+
+    def test_duplicate_names(self, mocker):
+        self.__prepare(mocker)
+        module_args = dict(snitches=[dict(name="a", interval="daily"), dict(name="a", interval="hourly")])
+        result = run_module(module_entry=module_main, module_args=module_args, expect_success=False)
+        assert result["msg"] == "The snitch a is declared more than once"
+
+    def test_failed_change(self, mocker):
+        self.__prepare(mocker)
+        self.mock_client_instance.delete_snitch.side_effect = Exception("boom")
+        module_args = dict(snitches=self.desired(), owner_tag="ansible", prune=True)
+        result = run_module(module_entry=module_main, module_args=module_args, expect_success=False)
+        assert result["msg"] == "Failed to apply changes to 1 of 4 snitches"
+        assert result["results"][3]["msg"] == "boom"
+
+    def test_incremental(self, mocker, tmp_path):
+        self.__prepare(mocker)
+        live = [dict(s, updated_at="2025-01-01T00:00:00.000Z") for s in self.mock_client_instance.list_snitches.return_value]
+        self.mock_client_instance.list_snitches.return_value = live
+        self.mock_client_instance.update_snitch.return_value = dict(live[1], interval="daily",
+                                                                    updated_at="2025-01-01T01:00:00.000Z")
+        state_file = str(tmp_path / "state.json")
+        desired = [dict(name="keep", interval="daily"), dict(name="change", interval="daily")]
+
+        result = run_module(module_entry=module_main, module_args=dict(snitches=desired, state_file=state_file))
+        assert result["plan"]["skipped"] == 0
+        assert result["plan"]["update"] == 1
+        assert result["drift"] == []
+
+        # Nothing changed, so neither snitch is compared again
+        live[1] = self.mock_client_instance.update_snitch.return_value
+        result = run_module(module_entry=module_main, module_args=dict(snitches=desired, state_file=state_file))
+        assert result["plan"]["skipped"] == 2
+        assert result["changed"] is False
+
+        # A change made outside of Ansible is reported and reverted
+        live[0] = dict(live[0], interval="weekly", updated_at="2025-01-02T00:00:00.000Z")
+        self.mock_client_instance.update_snitch.reset_mock()
+        result = run_module(module_entry=module_main, module_args=dict(snitches=desired, state_file=state_file))
+        assert result["plan"]["skipped"] == 1
+        assert result["drift"] == [dict(
+            id="111", name="keep", change="modified", updated_at="2025-01-02T00:00:00.000Z",
+            fields=dict(interval=dict(before="daily", after="weekly")),
+        )]
+        self.mock_client_instance.update_snitch.assert_called_once_with(snitch_id="111", interval="daily")
+
+    def test_incremental_prune_forgets_deleted_snitches(self, mocker, tmp_path):
+        self.__prepare(mocker)
+        state_file = tmp_path / "state.json"
+        desired = [dict(name="keep", interval="daily"), dict(name="stale", interval="daily")]
+        run_module(module_entry=module_main, module_args=dict(snitches=desired, state_file=str(state_file)))
+        assert set(json.loads(state_file.read_text())["snitches"]) == {"111", "333"}
+
+        module_args = dict(snitches=desired[:1], state_file=str(state_file), owner_tag="ansible", prune=True)
+        run_module(module_entry=module_main, module_args=module_args)
+        self.mock_client_instance.delete_snitch.assert_any_call(snitch_id="333")
+        assert set(json.loads(state_file.read_text())["snitches"]) == {"111"}
+
+    def test_state_file_requires_api_key(self, mocker, tmp_path):
+        module = mocker.Mock(params=dict(api_key=None, state_file=str(tmp_path / "state.json")), _socket_path="/tmp/socket")
+        module.fail_json.side_effect = AnsibleFailJson
+        with pytest.raises(AnsibleFailJson):
+            SnitchSyncModule(module)
+        assert module.fail_json.call_args[1]["msg"].startswith("state_file requires api_key")
+
+    def test_incremental_check_mode_does_not_save(self, mocker, tmp_path):
+        self.__prepare(mocker)
+        state_file = tmp_path / "state.json"
+        module_args = dict(snitches=self.desired(), state_file=str(state_file), _ansible_check_mode=True)
+        run_module(module_entry=module_main, module_args=module_args)
+        assert not state_file.exists()
+
+    def test_paginated_account(self, mocker):
+        with FakeDmsServer(page_size=7) as server:
+            for index in range(17):
+                server.add_snitch(make_live_snitch(index, tags=["ansible"]))
+            mocker.patch(
+                "ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.module_base.Client",
+                side_effect=client_class_for(server),
+            )
+            declared = [dict(name=f"snitch-{index:05d}", interval="daily") for index in range(16)]
+            module_args = dict(snitches=declared, owner_tag="ansible", prune=True)
+            result = run_module(module_entry=module_main, module_args=module_args)
+
+            assert result["plan"] == dict(create=0, update=0, delete=1, unchanged=16, api_calls=1)
+            assert [s["name"] for s in server.snitches.values()] == [r["name"] for r in declared]
@@ -0,0 +1,98 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible_collections.mikemorency.deadmanssnitch.plugins.modules.tags import (
+    main as module_main
+)
+from ...common.utils import run_module, ModuleTestCase
+
+
+class TestTags(ModuleTestCase):
+
+    def __prepare(self, mocker):
+        self.mock_client_class = mocker.patch(
+            "ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.module_base.Client"
+        )
+        self.mock_client_instance = mocker.MagicMock()
+        self.mock_client_class.return_value = self.mock_client_instance
+        self.mock_client_instance.get_snitch.return_value = {
+            "token": "111", "name": "existing", "tags": ["a", "b", "c"]
+        }
+
+    def test_absent_uses_single_replace(self, mocker):
+        self.__prepare(mocker)
+        module_args = dict(id="111", tags=["a", "b"], state="absent")
+        result = run_module(module_entry=module_main, module_args=module_args)
+        assert result["changed"] is True
+        assert result["new"] == ["c"]
+        assert result["strategy"] == "replace"
+        assert result["api_calls"] == 1
+        self.mock_client_instance.replace_snitch_tags.assert_called_once_with(snitch_id="111", tags=["c"])
+        self.mock_client_instance.remove_snitch_tag.assert_not_called()
+
+    def test_absent_per_tag(self, mocker):
+        self.__prepare(mocker)
+        module_args = dict(id="111", tags=["a", "b"], state="absent", strategy="per_tag")
+        result = run_module(module_entry=module_main, module_args=module_args)
+        assert result["api_calls"] == 2
+        assert self.mock_client_instance.remove_snitch_tag.call_count == 2
+
+    def test_present_no_changes(self, mocker):
+        self.__prepare(mocker)
+        module_args = dict(id="111", tags=["c", "a"])
+        result = run_module(module_entry=module_main, module_args=module_args)
+        assert result["changed"] is False
+        assert result["api_calls"] == 0
+
+    def test_check_mode(self, mocker):
+        self.__prepare(mocker)
+        module_args = dict(id="111", tags=["x"], state="absolute", _ansible_check_mode=True)
+        result = run_module(module_entry=module_main, module_args=module_args)
+        assert result["changed"] is True
+        assert result["new"] == ["x"]
+        # The calls that would be made are reported, without sending them
+        assert result["api_calls"] == 1
+        self.mock_client_instance.replace_snitch_tags.assert_not_called()
+
+    def __prepare_account(self, mocker):
+        self.__prepare(mocker)
+        self.mock_client_instance.iter_snitches.return_value = iter([
+            {"token": "1", "name": "backup-db", "status": "failed", "tags": ["prod", "old"]},
+            {"token": "2", "name": "backup-files", "status": "healthy", "tags": ["prod"]},
+            {"token": "3", "name": "report", "status": "failed", "tags": ["old"]},
+        ])
+
+    def test_selector(self, mocker):
+        self.__prepare_account(mocker)
+        module_args = dict(match_tags=["prod"], tags=["old"], state="absent")
+        result = run_module(module_entry=module_main, module_args=module_args)
+        assert result["changed"] is True
+        assert result["api_calls"] == 1
+        assert [(r["id"], r["new"], r["changed"]) for r in result["snitches"]] == [
+            ("1", ["prod"], True),
+            ("2", ["prod"], False),
+        ]
+        self.mock_client_instance.iter_snitches.assert_called_once()
+        self.mock_client_instance.remove_snitch_tag.assert_called_once_with(snitch_id="1", tag="old")
+
+    def test_selector_reports_failures(self, mocker):
+        self.__prepare_account(mocker)
+        self.mock_client_instance.append_snitch_tags.side_effect = [None, Exception("boom")]
+        module_args = dict(name_regex="^backup-", tags=["new"], workers=1)
+        result = run_module(module_entry=module_main, module_args=module_args, expect_success=False)
+        assert result["msg"] == "Failed to change tags on 1 of 2 snitches"
+        assert [r["failed"] for r in result["snitches"]] == [False, True]
+        assert result["snitches"][1]["msg"] == "boom"
+
+    def test_selector_with_name(self, mocker):
+        self.__prepare(mocker)
+        module_args = dict(name="existing", status=["failed"], tags=["x"])
+        result = run_module(module_entry=module_main, module_args=module_args, expect_success=False)
+        assert "mutually exclusive" in result["msg"]
+
+    def test_invalid_regex(self, mocker):
+        self.__prepare(mocker)
+        module_args = dict(name_regex="(", tags=["x"])
+        result = run_module(module_entry=module_main, module_args=module_args, expect_success=False)
+        assert "not a valid regular expression" in result["msg"]
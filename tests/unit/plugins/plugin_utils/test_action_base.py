@@ -0,0 +1,87 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import pytest
+from unittest.mock import MagicMock
+
+from ansible_collections.mikemorency.deadmanssnitch.plugins.plugin_utils.action_base import (
+    ControllerModule,
+    ModuleExit,
+    get_shared_client,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.module_utils.retry import (
+    RetryPolicy,
+)
+from ansible_collections.mikemorency.deadmanssnitch.plugins.modules import snitch, snitch_info
+
+
+def build_module(module_args, **kwargs):
+    return ControllerModule(module_args, **snitch_info.module_spec(), **kwargs)
+
+
+class TestControllerModule:
+    def test_params_are_validated(self):
+        module = build_module({"api_key": "key", "name": "foo"})
+        assert module.params["name"] == "foo"
+        assert module.params["pool_size"] == 10
+
+        with pytest.raises(ModuleExit) as e:
+            build_module({"api_key": "key", "name": "foo", "id": "bar"})
+        assert e.value.result["failed"] is True
+        assert "mutually exclusive" in e.value.result["msg"]
+
+    def test_env_fallback_uses_task_environment(self):
+        module = build_module({}, environment={"DMS_API_KEY": "from-env"})
+        assert module.params["api_key"] == "from-env"
+
+    def test_no_log_values_are_removed(self):
+        module = build_module({"api_key": "secret-key"})
+        with pytest.raises(ModuleExit) as e:
+            module.exit_json(msg="the key is secret-key")
+        assert "secret-key" not in e.value.result["msg"]
+        assert e.value.result["changed"] is False
+
+    def test_check_mode_requires_support(self):
+        spec = snitch_info.module_spec()
+        spec["supports_check_mode"] = False
+        module = ControllerModule({"api_key": "key"}, check_mode=True, **spec)
+        assert module.check_mode is False
+
+    def test_run_module(self):
+        module = build_module({"api_key": "key", "name": "foo"})
+        client = MagicMock(retry_policy=RetryPolicy())
+        client.iter_snitches.return_value = [{"token": "1", "name": "foo"}]
+        with pytest.raises(ModuleExit) as e:
+            snitch_info.run_module(module, client=client)
+        assert e.value.result["snitches"] == [{"token": "1", "name": "foo"}]
+        assert e.value.result["api_retries"] == {"retries": 0, "wait_seconds": 0.0}
+
+    def test_fail_json_is_not_wrapped(self):
+        module = ControllerModule({"api_key": "key", "name": "new"}, **snitch.module_spec())
+        client = MagicMock(retry_policy=RetryPolicy())
+        client.iter_snitches.return_value = []
+        with pytest.raises(ModuleExit) as e:
+            snitch.run_module(module, client=client)
+        assert e.value.result["msg"] == "interval is required when creating a new snitch"
+
+    def test_fail_json_keeps_extra_keys(self):
+        module = ControllerModule({"api_key": "key", "name": "new"}, **snitch.module_spec())
+        client = MagicMock(retry_policy=RetryPolicy())
+        client.iter_snitches.side_effect = lambda: module.fail_json(msg="stopped", searched=dict(name="new"))
+        with pytest.raises(ModuleExit) as e:
+            snitch.run_module(module, client=client)
+        assert e.value.result["msg"] == "stopped"
+        assert e.value.result["searched"] == {"name": "new"}
+
+
+def test_get_shared_client():
+    module = build_module({"api_key": "shared-key"})
+    client = get_shared_client(module)
+    assert get_shared_client(build_module({"api_key": "shared-key"})) is client
+    assert get_shared_client(build_module({"api_key": "shared-key", "timeout": 5})) is not client
+
+
+def test_get_shared_client_skips_snapshots():
+    module = build_module({"api_key": "shared-key", "snapshot_path": "/tmp/snitches.jsonl.gz"})
+    assert get_shared_client(module) is None